@@ -0,0 +1,308 @@
+# activity_store.py - Log aktivitas JSONL dengan rotasi + kompresi, index SQLite & rollup harian
+import os
+import gzip
+import json
+import time
+import logging
+import sqlite3
+import argparse
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    name TEXT PRIMARY KEY, day TEXT NOT NULL, compressed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY, segment TEXT NOT NULL, offset INTEGER NOT NULL,
+    length INTEGER NOT NULL, day TEXT NOT NULL, tg_id INTEGER, msisdn TEXT, action TEXT
+);
+CREATE INDEX IF NOT EXISTS events_tg ON events (tg_id, day);
+CREATE INDEX IF NOT EXISTS events_msisdn ON events (msisdn, day);
+CREATE INDEX IF NOT EXISTS events_action ON events (action, day);
+CREATE INDEX IF NOT EXISTS events_day ON events (day);
+CREATE TABLE IF NOT EXISTS rollup (
+    day TEXT NOT NULL, action TEXT NOT NULL, count INTEGER NOT NULL, amount INTEGER NOT NULL,
+    PRIMARY KEY (day, action)
+);
+"""
+
+
+class ActivityStore:
+    """
+    Event aktivitas ditulis sebagai JSONL ke segmen
+    `activity-YYYYMMDD-NNN.jsonl` di `directory`. Segmen diganti saat hari
+    berganti atau ukurannya melewati `max_bytes`; segmen lama di-gzip.
+
+    Setiap baris dicatat di `index.db` (segmen, offset, panjang, hari,
+    tg_id, msisdn, action) sehingga query hanya membaca baris yang cocok.
+    Rollup harian (jumlah event & total `price` per action) diperbarui
+    bersamaan dengan penulisan event.
+
+    `append` hanya dipanggil dari satu thread (listener logging);
+    query boleh dari thread mana saja (koneksi baca terpisah).
+    """
+
+    def __init__(self, directory: str = "activity", max_bytes: int = 5 * 1024 * 1024,
+                 compress: bool = True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.index_path = os.path.join(directory, "index.db")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._fh = None
+        self._segment: Optional[str] = None
+        self._segment_day: Optional[str] = None
+        self._lock = threading.Lock()
+
+    # -------------------- storage --------------------
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.directory, exist_ok=True)
+            conn = sqlite3.connect(self.index_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._compress_leftovers()
+        return self._conn
+
+    def _read_db(self) -> sqlite3.Connection:
+        os.makedirs(self.directory, exist_ok=True)
+        conn = sqlite3.connect(self.index_path)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _path(self, segment: str) -> str:
+        return os.path.join(self.directory, segment)
+
+    def _compress_leftovers(self):
+        # segmen hari sebelumnya yang belum di-gzip (mis. proses mati sebelum rotasi)
+        today = datetime.now().strftime("%Y-%m-%d")
+        rows = self._conn.execute(
+            "SELECT name FROM segments WHERE compressed=0 AND day<?", (today,)).fetchall()
+        for (name,) in rows:
+            self._compress(name)
+
+    def _compress(self, segment: str):
+        if not self.compress:
+            return
+        src = self._path(segment)
+        try:
+            with open(src, "rb") as f_in, gzip.open(src + ".gz", "wb") as f_out:
+                while chunk := f_in.read(1024 * 1024):
+                    f_out.write(chunk)
+            os.remove(src)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Gagal mengompres segmen %s: %s", segment, e)
+            return
+        self._conn.execute("UPDATE segments SET compressed=1 WHERE name=?", (segment,))
+        self._conn.commit()
+
+    def _open_segment(self, day: str):
+        db = self._db()
+        row = db.execute(
+            "SELECT name FROM segments WHERE day=? AND compressed=0 ORDER BY name DESC LIMIT 1",
+            (day,)).fetchone()
+        if row and os.path.exists(self._path(row[0])) \
+                and os.path.getsize(self._path(row[0])) < self.max_bytes:
+            name = row[0]
+        else:
+            seq = db.execute("SELECT COUNT(*) FROM segments WHERE day=?", (day,)).fetchone()[0]
+            name = f"activity-{day.replace('-', '')}-{seq:03d}.jsonl"
+            db.execute("INSERT OR IGNORE INTO segments (name, day) VALUES (?, ?)", (name, day))
+            db.commit()
+        self._fh = open(self._path(name), "ab")
+        self._segment = name
+        self._segment_day = day
+
+    def _rotate_if_needed(self, day: str):
+        if self._fh is not None and self._segment_day == day \
+                and self._fh.tell() < self.max_bytes:
+            return
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+            self._compress(self._segment)
+        self._open_segment(day)
+
+    # -------------------- write --------------------
+    def append(self, event: Dict):
+        created = event.get("ts") or time.time()
+        day = datetime.fromtimestamp(created).strftime("%Y-%m-%d")
+        event = {**event, "ts": datetime.fromtimestamp(created).isoformat(timespec="seconds")}
+        line = json.dumps(event, ensure_ascii=False, separators=(",", ":"), default=str)
+        data = line.encode("utf-8") + b"\n"
+
+        with self._lock:
+            self._rotate_if_needed(day)
+            offset = self._fh.tell()
+            self._fh.write(data)
+            self._fh.flush()
+
+            db = self._db()
+            action = event.get("action", "")
+            db.execute(
+                "INSERT INTO events (segment, offset, length, day, tg_id, msisdn, action) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self._segment, offset, len(data), day, event.get("tg_id"),
+                 event.get("msisdn"), action))
+            price = event.get("price")
+            db.execute(
+                "INSERT INTO rollup (day, action, count, amount) VALUES (?, ?, 1, ?) "
+                "ON CONFLICT (day, action) DO UPDATE SET count=count+1, amount=amount+excluded.amount",
+                (day, action, price if isinstance(price, int) else 0))
+            db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # -------------------- query --------------------
+    def query(self, tg_id: Optional[int] = None, msisdn: Optional[str] = None,
+              action: Optional[str] = None, days: Optional[int] = None,
+              limit: int = 50) -> List[Dict]:
+        """Event terbaru dulu. `days` = N hari terakhir (termasuk hari ini)."""
+        where, args = [], []
+        if tg_id is not None:
+            where.append("tg_id=?")
+            args.append(tg_id)
+        if msisdn:
+            where.append("msisdn=?")
+            args.append(msisdn)
+        if action:
+            where.append("action=?")
+            args.append(action)
+        if days:
+            where.append("day>=?")
+            args.append(_since(days))
+        sql = "SELECT segment, offset, length FROM events"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id DESC LIMIT ?"
+        args.append(limit)
+
+        conn = self._read_db()
+        try:
+            rows = conn.execute(sql, args).fetchall()
+        finally:
+            conn.close()
+        return self._read_lines(rows)
+
+    def _read_lines(self, rows: Iterable[Tuple[str, int, int]]) -> List[Dict]:
+        by_segment: Dict[str, List[Tuple[int, int, int]]] = {}
+        for pos, (segment, offset, length) in enumerate(rows):
+            by_segment.setdefault(segment, []).append((offset, length, pos))
+
+        found: Dict[int, Dict] = {}
+        for segment, items in by_segment.items():
+            path = self._path(segment)
+            opener = open
+            if not os.path.exists(path):
+                path, opener = path + ".gz", gzip.open
+            try:
+                with opener(path, "rb") as f:
+                    # offset urut naik: gzip hanya perlu maju, tidak mundur
+                    for offset, length, pos in sorted(items):
+                        f.seek(offset)
+                        found[pos] = json.loads(f.read(length))
+            except (OSError, ValueError) as e:
+                logger.warning("Segmen %s tidak bisa dibaca: %s", segment, e)
+        return [found[pos] for pos in sorted(found)]
+
+    def rollup(self, days: int = 7, action_prefix: str = "purchase") -> List[Tuple[str, str, int, int]]:
+        """[(day, action, count, amount)] untuk N hari terakhir, terbaru dulu."""
+        conn = self._read_db()
+        try:
+            return conn.execute(
+                "SELECT day, action, count, amount FROM rollup WHERE day>=? AND action LIKE ? "
+                "ORDER BY day DESC, action", (_since(days), action_prefix + "%")).fetchall()
+        finally:
+            conn.close()
+
+
+def _since(days: int) -> str:
+    return (datetime.now() - timedelta(days=max(days, 1) - 1)).strftime("%Y-%m-%d")
+
+
+class ActivityHandler(logging.Handler):
+    """
+    Handler logging yang menulis ke ActivityStore. Field terstruktur diambil
+    dari `extra={"event": {...}}`; record biasa disimpan sebagai action "log".
+    Dipasang di belakang QueueHandler, jadi I/O terjadi di thread listener.
+    """
+
+    def __init__(self, store: ActivityStore):
+        super().__init__()
+        self.store = store
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            event = getattr(record, "event", None)
+            if event is None:
+                event = {"action": "log", "level": record.levelname,
+                         "text": record.getMessage()}
+            self.store.append({"ts": record.created, **event})
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self.store.close()
+        super().close()
+
+
+def parse_filters(args: Iterable[str]) -> Dict:
+    """`id=123 msisdn=628.. action=purchase_ok days=7 limit=20` -> kwargs query."""
+    kwargs: Dict = {}
+    for arg in args:
+        key, sep, value = arg.partition("=")
+        if not sep:
+            # argumen tanpa key: nomor (62...) atau nama action
+            key, value = ("msisdn", arg) if arg.isdigit() else ("action", arg)
+        key = {"id": "tg_id", "tg": "tg_id", "nomor": "msisdn"}.get(key.lower(), key.lower())
+        if key in ("tg_id", "days", "limit"):
+            kwargs[key] = int(value)
+        elif key in ("msisdn", "action"):
+            kwargs[key] = value
+        else:
+            raise ValueError(f"Filter tidak dikenal: {key}")
+    return kwargs
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Query log aktivitas bot")
+    parser.add_argument("--dir", default="activity")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    q = sub.add_parser("query", help="cari event (terbaru dulu)")
+    q.add_argument("--tg-id", type=int)
+    q.add_argument("--msisdn")
+    q.add_argument("--action")
+    q.add_argument("--days", type=int)
+    q.add_argument("--limit", type=int, default=50)
+
+    r = sub.add_parser("rollup", help="rekap pembelian harian")
+    r.add_argument("--days", type=int, default=7)
+
+    args = parser.parse_args(argv)
+    store = ActivityStore(args.dir)
+    if args.cmd == "query":
+        for event in store.query(args.tg_id, args.msisdn, args.action, args.days, args.limit):
+            print(json.dumps(event, ensure_ascii=False))
+    else:
+        for day, action, count, amount in store.rollup(args.days):
+            print(f"{day}  {action:<16} {count:>5}  Rp {amount:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# admission.py - Admission control di pintu masuk update: jalur cepat untuk perintah murah, tolak dini saat antrean upstream penuh
+import time
+import asyncio
+import inspect
+import logging
+import contextlib
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from telegram.ext import BaseUpdateProcessor
+
+logger = logging.getLogger(__name__)
+
+Classify = Callable[[Any], bool]
+Reject = Callable[[Any, float], Awaitable[None]]
+
+
+class AdmissionControl(BaseUpdateProcessor):
+    """
+    Update processor PTB (update diproses bersamaan). Setiap update digolongkan
+    `classify(update)`:
+
+    * jalur cepat (True): /help, /start, halaman dari cache, dll. langsung
+      dijalankan, tidak pernah menunggu slot upstream;
+    * jalur upstream (False): menunggu salah satu dari `slots` slot, berurutan
+      per user (alur login/beli tetap berurutan seperti sebelumnya).
+
+    Perkiraan waktu tunggu = (antrean di depan / slots) x rata-rata (EWMA)
+    durasi handler upstream. Bila melebihi `max_wait` detik, update ditolak
+    saat itu juga lewat `reject(update, perkiraan)` alih-alih menunggu lalu
+    timeout beberapa menit kemudian.
+    """
+
+    __slots__ = ("classify", "reject", "slots", "max_wait", "alpha", "avg_service",
+                 "in_flight", "fast_in_flight", "admitted", "fast", "rejected",
+                 "peak_wait", "_slot", "_user_locks", "_waiting")
+
+    def __init__(self, classify: Classify, reject: Reject, slots: int = 8,
+                 max_wait: float = 20, initial_service: float = 3.0,
+                 max_concurrent_updates: int = 256, alpha: float = 0.2):
+        super().__init__(max_concurrent_updates)
+        self.classify = classify
+        self.reject = reject
+        self.slots = slots
+        self.max_wait = max_wait
+        self.alpha = alpha
+        self.avg_service = initial_service
+        self.in_flight = 0
+        self.fast_in_flight = 0
+        self.admitted = 0
+        self.fast = 0
+        self.rejected = 0
+        self.peak_wait = 0.0
+        self._slot: Optional[asyncio.Semaphore] = None
+        # user_id -> [lock, jumlah update upstream user itu yang sedang antre/jalan]
+        self._user_locks: Dict[int, list] = {}
+        # update upstream yang sudah diterima tapi belum mulai diproses
+        self._waiting: Dict[int, Any] = {}
+
+    async def initialize(self):
+        self._slot = asyncio.Semaphore(self.slots)
+
+    async def shutdown(self):
+        pass
+
+    # -------------------- perkiraan antrean --------------------
+    @property
+    def waiting(self) -> int:
+        return len(self._waiting)
+
+    def estimated_wait(self) -> float:
+        """Perkiraan detik sampai update upstream berikutnya mendapat slot."""
+        ahead = self.waiting + self.in_flight - self.slots + 1
+        return max(0, ahead) * self.avg_service / self.slots
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"slots": self.slots, "in_flight": self.in_flight, "waiting": self.waiting,
+                "fast_in_flight": self.fast_in_flight,
+                "est_wait_s": round(self.estimated_wait(), 1),
+                "avg_service_s": round(self.avg_service, 2),
+                "admitted": self.admitted, "fast": self.fast, "rejected": self.rejected,
+                "peak_wait_s": round(self.peak_wait, 1)}
+
+    # -------------------- proses update --------------------
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]):
+        try:
+            fast = self.classify(update)
+        except Exception as e:
+            logger.debug("Klasifikasi update gagal: %s", e)
+            fast = False
+        if fast:
+            self.fast += 1
+            self.fast_in_flight += 1
+            try:
+                await coroutine
+            finally:
+                self.fast_in_flight -= 1
+            return
+
+        estimate = self.estimated_wait()
+        if estimate > self.max_wait:
+            self.rejected += 1
+            _discard(coroutine)
+            logger.warning("Update %s ditolak: perkiraan antre %.1fs > %ss (%d jalan, %d antre)",
+                           getattr(update, "update_id", None), estimate, self.max_wait,
+                           self.in_flight, self.waiting)
+            try:
+                await self.reject(update, estimate)
+            except Exception as e:
+                logger.debug("Balasan sibuk gagal: %s", e)
+            return
+        await self._run_upstream(update, coroutine)
+
+    async def _run_upstream(self, update: object, coroutine: Awaitable[Any]):
+        key = id(update)
+        self._waiting[key] = update
+        user = getattr(update, "effective_user", None)
+        user_id = user.id if user else 0
+        entry = self._acquire_entry(user_id)
+        lock = entry[0]
+        t0 = time.monotonic()
+        try:
+            async with lock, self._slot:
+                if self._waiting.pop(key, None) is None:
+                    # sudah diserahkan ke proses pengganti saat drain
+                    _discard(coroutine)
+                    return
+                self.peak_wait = max(self.peak_wait, time.monotonic() - t0)
+                self.admitted += 1
+                self.in_flight += 1
+                started = time.monotonic()
+                try:
+                    await coroutine
+                finally:
+                    self.in_flight -= 1
+                    elapsed = time.monotonic() - started
+                    self.avg_service += self.alpha * (elapsed - self.avg_service)
+        finally:
+            self._waiting.pop(key, None)
+            self._release_entry(user_id, entry)
+
+    # -------------------- lock per user --------------------
+    def _acquire_entry(self, user_id: int) -> list:
+        entry = self._user_locks.setdefault(user_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        return entry
+
+    def _release_entry(self, user_id: int, entry: list):
+        entry[1] -= 1
+        if not entry[1]:
+            del self._user_locks[user_id]
+
+    @contextlib.asynccontextmanager
+    async def user_lock(self, user_id: int):
+        """
+        Lock per user yang sama dengan jalur upstream, untuk kerja di luar
+        update (mis. poller alert) yang membaca/mengganti token sesi user.
+        Tidak memakai slot upstream.
+        """
+        entry = self._acquire_entry(user_id)
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            self._release_entry(user_id, entry)
+
+    def hand_off(self) -> List[Any]:
+        """Drain: ambil update yang belum mulai diproses; task-nya membuang update itu."""
+        updates = list(self._waiting.values())
+        self._waiting.clear()
+        return updates
+
+
+def _discard(coroutine: Awaitable[Any]):
+    # coroutine Application.process_update yang tidak jadi di-await
+    if inspect.iscoroutine(coroutine):
+        coroutine.close()
@@ -0,0 +1,227 @@
+# bench_crypto.py - Micro-benchmark fungsi murni crypto_helper + cek hasil identik dengan implementasi lama
+#
+#   python bench_crypto.py                 # cek kesetaraan + tabel waktu per panggilan
+#   python bench_crypto.py --save          # simpan hasil sebagai baseline
+#   python bench_crypto.py --compare       # bandingkan dengan baseline, exit 1 bila regresi
+#
+# Baseline disimpan per mesin di .bench/crypto_helper.json (tidak di-commit).
+import os
+import sys
+import gzip
+import json
+import hmac
+import zlib
+import base64
+import timeit
+import hashlib
+import argparse
+import platform
+import importlib.util
+from datetime import datetime, timezone, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import crypto_helper as ch
+
+BASELINE_FILE = os.path.join(".bench", "crypto_helper.json")
+
+ACCESS_TOKEN = "eyJhbGciOiJSUzI1NiJ9." + "a" * 600
+TOKEN_PAYMENT = "tp-" + "b" * 120
+SIG_TIME = 1717000000
+IV = "0123456789abcdef"
+NOW = datetime(2024, 5, 29, 21, 46, 40, 123456, tzinfo=ch.GMT7)
+
+HAVE_AES = importlib.util.find_spec("Crypto") is not None
+
+
+# -------------------- implementasi referensi (sebelum precompute) --------------------
+def _ref_xor(data: bytes, key: bytes) -> bytes:
+    return bytes([b ^ key[i % len(key)] for i, b in enumerate(data)])
+
+
+def _ref_build_encrypted_field(iv_hex16: str, urlsafe_b64: bool = False) -> str:
+    from Crypto.Cipher import AES
+    from Crypto.Util.Padding import pad
+    iv = iv_hex16.encode("ascii")
+    ct = AES.new(ch.AES_KEY_ASCII.encode("ascii"), AES.MODE_CBC, iv=iv).encrypt(pad(b"", AES.block_size))
+    return ch.b64(ct, urlsafe_b64) + iv_hex16
+
+
+def _ref_ax_api_signature(ts_for_sign: str, contact: str, code: str, contact_type: str) -> str:
+    preimage = f"{ts_for_sign}password{contact_type}{contact}{code}openid"
+    digest = hmac.new(ch.AX_API_SIG_KEY_ASCII, preimage.encode("utf-8"), hashlib.sha256).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def _ref_make_x_signature_payment(access_token: str, sig_time_sec: int, package_code: str,
+                                  token_payment: str) -> str:
+    template = _ref_xor(base64.b64decode(ch._PAYMENT_SIG_BLOB), ch._PAYMENT_SIG_XOR_KEY).decode("utf-8")
+    key_bytes = template.format(st=sig_time_sec).encode("utf-8")
+    msg = f"{access_token};{token_payment};{sig_time_sec};BUY_PACKAGE;BALANCE;{package_code};".encode("utf-8")
+    return hmac.new(key_bytes, msg, hashlib.sha512).hexdigest()
+
+
+def _ref_java_like_timestamp(now: datetime) -> str:
+    ms2 = f"{int(now.microsecond / 10000):02d}"
+    tz = now.strftime("%z")
+    tz_colon = tz[:-2] + ":" + tz[-2:] if tz else "+00:00"
+    return now.strftime(f"%Y-%m-%dT%H:%M:%S.{ms2}") + tz_colon
+
+
+def _ref_ts_gmt7_without_colon(dt: datetime) -> str:
+    tz = timezone(timedelta(hours=7))
+    dt = dt.replace(tzinfo=tz) if dt.tzinfo is None else dt.astimezone(tz)
+    millis = f"{int(dt.microsecond / 1000):03d}"
+    return dt.strftime(f"%Y-%m-%dT%H:%M:%S.{millis}") + dt.strftime("%z")
+
+
+class _FakeResponse:
+    def __init__(self, content: bytes, encoding: str):
+        self.content = content
+        self.headers = {"Content-Encoding": encoding}
+        self.text = content.decode("utf-8", "replace")
+
+
+# -------------------- kesetaraan --------------------
+def check_equivalence() -> List[str]:
+    """Daftar fungsi yang hasilnya berbeda dari implementasi referensi (kosong = identik)."""
+    failures = []
+
+    def same(name, got, want):
+        if got != want:
+            failures.append(f"{name}: {got!r} != {want!r}")
+
+    for data in (b"", b"x", os.urandom(19), os.urandom(257)):
+        same("_xor", ch._xor(data, b"MyXL#8.6.0#API#Sign"), _ref_xor(data, b"MyXL#8.6.0#API#Sign"))
+    for st in (0, 7, SIG_TIME, 99999999999):
+        same("make_x_signature_payment",
+             ch.make_x_signature_payment(ACCESS_TOKEN, st, "PKG_CODE", TOKEN_PAYMENT),
+             _ref_make_x_signature_payment(ACCESS_TOKEN, st, "PKG_CODE", TOKEN_PAYMENT))
+    for args in (("2024-05-29T21:46:40.12+07:00", "6281234567890", "123456", "SMS"),
+                 ("", "", "", ""), ("ts", "nomor ü", "0", "EMAIL")):
+        same("ax_api_signature", ch.ax_api_signature(*args), _ref_ax_api_signature(*args))
+    utc = NOW.astimezone(timezone.utc)
+    for dt in (NOW, utc, NOW.replace(tzinfo=None), NOW.replace(microsecond=0)):
+        same("java_like_timestamp", ch.java_like_timestamp(dt), _ref_java_like_timestamp(dt))
+        same("ts_gmt7_without_colon", ch.ts_gmt7_without_colon(dt), _ref_ts_gmt7_without_colon(dt))
+    if HAVE_AES:
+        for iv in (IV, ch.random_iv_hex16(), ch.random_iv_hex16()):
+            for urlsafe in (False, True):
+                same("build_encrypted_field", ch.build_encrypted_field(iv, urlsafe),
+                     _ref_build_encrypted_field(iv, urlsafe))
+    body = json.dumps({"status": "SUCCESS", "data": list(range(200))}).encode()
+    same("decode_response[gzip]", ch.decode_response(_FakeResponse(gzip.compress(body), "gzip")),
+         body.decode())
+    same("decode_response[deflate]",
+         ch.decode_response(_FakeResponse(zlib.compress(body), "deflate")), body.decode())
+    return failures
+
+
+# -------------------- benchmark --------------------
+def cases() -> Dict[str, Callable[[], object]]:
+    body = json.dumps({"status": "SUCCESS", "data": list(range(200))}).encode()
+    gz = _FakeResponse(gzip.compress(body), "gzip")
+    plain = _FakeResponse(body, "")
+    blob = os.urandom(64)
+    out = {
+        "random_iv_hex16": ch.random_iv_hex16,
+        "_xor[64B]": lambda: ch._xor(blob, b"MyXL#8.6.0#API#Sign"),
+        "b64[64B]": lambda: ch.b64(blob, True),
+        "java_like_timestamp": lambda: ch.java_like_timestamp(NOW),
+        "ts_gmt7_without_colon": lambda: ch.ts_gmt7_without_colon(NOW),
+        "ax_api_signature": lambda: ch.ax_api_signature(
+            "2024-05-29T21:46:40.12+07:00", "6281234567890", "123456", "SMS"),
+        "make_x_signature_payment": lambda: ch.make_x_signature_payment(
+            ACCESS_TOKEN, SIG_TIME, "PKG_CODE", TOKEN_PAYMENT),
+        "decode_response[gzip]": lambda: ch.decode_response(gz),
+        "decode_response[plain]": lambda: ch.decode_response(plain),
+    }
+    if HAVE_AES:
+        out["build_encrypted_field"] = lambda: ch.build_encrypted_field(IV, True)
+    return out
+
+
+def measure(fn: Callable[[], object], repeat: int = 5) -> float:
+    """Waktu terbaik per panggilan (ns) dari `repeat` putaran autorange (~0.2 detik/putaran)."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def run(selected: Optional[str] = None, repeat: int = 5) -> Dict[str, float]:
+    results = {}
+    for name, fn in cases().items():
+        if selected and selected not in name:
+            continue
+        results[name] = measure(fn, repeat)
+    return results
+
+
+def load_baseline(path: str = BASELINE_FILE) -> Dict:
+    try:
+        with open(path, "r", encoding="utf8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(results: Dict[str, float], path: str = BASELINE_FILE):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    data = {"python": platform.python_version(), "machine": platform.machine(),
+            "saved_at": datetime.now().isoformat(timespec="seconds"), "ns": results}
+    with open(path, "w", encoding="utf8") as f:
+        json.dump(data, f, indent=2)
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float],
+            tolerance: float) -> Tuple[List[str], List[str]]:
+    """(baris tabel, nama fungsi yang lebih lambat dari baseline * (1 + tolerance))."""
+    lines, regressions = [], []
+    for name, ns in results.items():
+        base = baseline.get(name)
+        if base is None:
+            lines.append(f"{name:<28} {ns:>12,.0f} ns")
+            continue
+        ratio = ns / base
+        mark = ""
+        if ratio > 1 + tolerance:
+            mark = "  << REGRESI"
+            regressions.append(name)
+        lines.append(f"{name:<28} {ns:>12,.0f} ns  (baseline {base:,.0f} ns, x{ratio:.2f}){mark}")
+    return lines, regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark crypto_helper")
+    parser.add_argument("-k", dest="select", help="hanya case yang namanya mengandung teks ini")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", action="store_true", help="simpan hasil sebagai baseline")
+    parser.add_argument("--compare", action="store_true", help="exit 1 bila ada regresi")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="batas regresi relatif terhadap baseline (default 0.25 = 25%%)")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    args = parser.parse_args(argv)
+
+    failures = check_equivalence()
+    if failures:
+        print("Hasil BERBEDA dari implementasi referensi:")
+        for line in failures:
+            print("  " + line)
+        return 1
+    print("Kesetaraan OK" + ("" if HAVE_AES else " (pycryptodome tidak ada: AES dilewati)"))
+
+    results = run(args.select, args.repeat)
+    baseline = load_baseline(args.baseline).get("ns", {})
+    lines, regressions = compare(results, baseline, args.tolerance)
+    print("\n".join(lines))
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"Baseline disimpan ke {args.baseline}")
+    if args.compare and regressions:
+        print(f"{len(regressions)} regresi: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,13 +14,108 @@ class BotConfig:
     API_KEY = os.getenv("MYXL_API_KEY", "")
     
     # Session settings
-    SESSION_TIMEOUT = 3600  # 1 hour
-    MAX_SESSIONS_PER_USER = 1
+    SESSION_TIMEOUT = 3600  # 1 hour (sesi yang belum/tidak login)
+    SESSION_IDLE_TTL = 30 * 86400  # sesi login yang tidak dipakai 30 hari dibuang
+    OTP_FLOW_TTL = 600  # alur input nomor/OTP yang ditinggalkan direset
+    MAX_USER_SESSIONS = 10000
+    MAX_SESSIONS_PER_USER = 5  # akun MyXL tertaut per user Telegram
+    DASHBOARD_DEADLINE = 20  # detik, batas bersama semua akun di /dashboard
     
     # Rate limiting
     MAX_REQUESTS_PER_MINUTE = 30
     MAX_OTP_REQUESTS_PER_HOUR = 5
+
+    # Purchase de-duplication: hasil beli yang sukses dipakai ulang untuk
+    # klik/callback duplikat selama N detik
+    PURCHASE_RESULT_TTL = 60
+
+    # Katalog paket: daftar family code (pisahkan dengan koma), kosong = XUT saja
+    CATALOG_FAMILY_CODES = [
+        c.strip() for c in os.getenv("CATALOG_FAMILY_CODES", "").split(",")
+        if c.strip()
+    ]
+    CATALOG_TTL = 900  # 15 menit
+    CATALOG_PRICE_BANDS = (10000, 25000, 50000, 100000)
+    # Snapshot katalog + detail paket untuk warm start (kosongkan untuk mematikan)
+    CATALOG_SNAPSHOT_PATH = os.getenv("CATALOG_SNAPSHOT_PATH", "catalog.db")
+    PACKAGE_DETAIL_TTL = 3600  # 1 jam
+
+    # Logging: log per-call API hanya 1 dari N yang ditulis (level INFO)
+    LOG_API_SAMPLE_RATE = int(os.getenv("LOG_API_SAMPLE_RATE", "20"))
+
+    # Start-up: verifikasi API key di-cache lokal selama N detik
+    API_KEY_VERIFY_TTL = 86400  # 1 hari
+    STARTUP_IMPORT_BUDGET_MS = int(os.getenv("STARTUP_IMPORT_BUDGET_MS", "800"))
+
+    # Watchdog event loop: log stack bila loop terblokir > N ms.
+    # LOOP_STRICT_MS (debug/test): handler yang memblokir > N ms dianggap gagal
+    LOOP_LAG_THRESHOLD_MS = int(os.getenv("LOOP_LAG_THRESHOLD_MS", "250"))
+    LOOP_STRICT_MS = int(os.getenv("LOOP_STRICT_MS")) if os.getenv("LOOP_STRICT_MS") else None
+
+    # Admin /profile: durasi sampling maksimum (detik)
+    PROFILE_MAX_SECONDS = 120
+
+    # Tracing per update: ukuran ring buffer & batas trace "lambat" (ms)
+    TRACE_BUFFER_SIZE = 200
+    TRACE_SLOW_MS = int(os.getenv("TRACE_SLOW_MS", "2000"))
     
+    # Log aktivitas (JSONL + index): folder, ukuran maks per segmen, gzip segmen lama
+    ACTIVITY_DIR = os.getenv("ACTIVITY_DIR", "activity")
+    ACTIVITY_MAX_BYTES = 5 * 1024 * 1024
+    ACTIVITY_COMPRESS = True
+
+    # Tampilan berhalaman (/kuota, /packages, /cari): item per halaman & umur cache halaman
+    QUOTA_PAGE_SIZE = 10
+    PACKAGE_PAGE_SIZE = 8
+    PAGE_TTL = 600  # 10 menit
+    # Cache tampilan kuota per (user, nomor) & pesan yang sedang menampilkan halaman tertentu
+    QUOTA_VIEW_MAX = 5000
+    SHOWN_PAGES_MAX = 20000
+
+    # Alert kuota menipis (/alert): batas default (% sisa), tick JobQueue,
+    # rentang interval cek per akun (detik) & maksimum cek bersamaan
+    QUOTA_ALERT_THRESHOLD = 20
+    QUOTA_ALERT_TICK = 30
+    QUOTA_ALERT_MIN_INTERVAL = 600  # 10 menit
+    QUOTA_ALERT_MAX_INTERVAL = 6 * 3600
+    QUOTA_ALERT_CONCURRENCY = 4
+
+    # State in-memory: batas mapping callback konfirmasi, interval sweep TTL,
+    # dan interval log metrik memori (detik)
+    PACKAGE_MAP_MAX = 5000
+    PACKAGE_MAP_TTL = 3600
+    STATE_SWEEP_INTERVAL = 60
+    MEMORY_REPORT_EVERY = 600
+
+    # Shutdown bertahap: batas tunggu handler yang berjalan saat SIGTERM (detik),
+    # file state serah terima, dan batas tunggu proses baru atas proses lama
+    DRAIN_TIMEOUT = int(os.getenv("DRAIN_TIMEOUT", "25"))
+    STATE_FILE = os.getenv("BOT_STATE_FILE", "bot_state.json")
+    HANDOFF_WAIT = 120
+
+    # Koneksi Bot API. Pesan keluar & getUpdates punya pool sendiri; keep-alive
+    # menjaga koneksi TLS tetap terbuka di antara burst. HTTP/2 ("2") butuh
+    # pip install "python-telegram-bot[http2]"
+    TG_POOL_SIZE = int(os.getenv("TG_POOL_SIZE", "32"))
+    TG_POOL_TIMEOUT = float(os.getenv("TG_POOL_TIMEOUT", "5"))
+    TG_CONNECT_TIMEOUT = float(os.getenv("TG_CONNECT_TIMEOUT", "5"))
+    TG_READ_TIMEOUT = float(os.getenv("TG_READ_TIMEOUT", "10"))
+    TG_WRITE_TIMEOUT = float(os.getenv("TG_WRITE_TIMEOUT", "10"))
+    TG_KEEPALIVE_EXPIRY = float(os.getenv("TG_KEEPALIVE_EXPIRY", "60"))
+    TG_HTTP_VERSION = os.getenv("TG_HTTP_VERSION", "1.1")
+    TG_POLL_TIMEOUT = int(os.getenv("TG_POLL_TIMEOUT", "30"))  # detik long-poll getUpdates
+
+    # Pesan progres operasi panjang (beli paket, daftar paket): maks. satu edit per N detik
+    PROGRESS_EDIT_INTERVAL = 1.5
+
+    # Admission control: handler ber-upstream yang boleh jalan bersamaan, batas perkiraan
+    # antre (detik) sebelum update baru langsung dibalas "sedang sibuk", perkiraan awal
+    # durasi handler upstream & maksimum update yang diproses bersamaan (semua jalur)
+    UPSTREAM_SLOTS = int(os.getenv("UPSTREAM_SLOTS", "8"))
+    ADMISSION_MAX_WAIT = float(os.getenv("ADMISSION_MAX_WAIT", "20"))
+    ADMISSION_INITIAL_SERVICE = 3.0
+    MAX_CONCURRENT_UPDATES = 256
+
     # Messages
     MESSAGES = {
         "welcome": """
@@ -0,0 +1,285 @@
+# cassette.py - Rekam/replay pertukaran HTTP (cassette JSON lines), dimuat transport hanya bila mode rekam/replay dipakai
+import os
+import gzip
+import json
+import time
+import atexit
+import base64
+import hashlib
+import logging
+import threading
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+REDACTED = "<redacted>"
+
+# key JSON / form / query / header (huruf kecil) yang tidak boleh tersimpan
+SECRET_KEYS = frozenset({
+    "id_token", "access_token", "refresh_token", "token_payment", "token_confirmation",
+    "password", "api_key", "key", "x-api-key", "authorization", "cookie", "set-cookie",
+})
+
+# header respons yang disimpan; body sudah didekompresi oleh requests, jadi
+# Content-Encoding sengaja tidak ikut
+KEPT_RESPONSE_HEADERS = ("content-type",)
+
+
+class CassetteMiss(requests.RequestException):
+    """Request saat replay tidak punya pasangan di cassette."""
+
+
+# -------------------- sanitasi --------------------
+def _redact(obj):
+    if isinstance(obj, dict):
+        return {k: REDACTED if str(k).lower() in SECRET_KEYS else _redact(v)
+                for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_redact(v) for v in obj]
+    return obj
+
+
+def _redact_pairs(pairs) -> List[Tuple[str, str]]:
+    return [(k, REDACTED if k.lower() in SECRET_KEYS else v) for k, v in pairs]
+
+
+def _sanitize_text(text: str) -> Tuple[str, bool]:
+    """(teks tanpa rahasia, apakah ada yang diganti) untuk body JSON / form."""
+    stripped = text.lstrip()
+    if stripped[:1] in ("{", "["):
+        try:
+            parsed = json.loads(text)
+        except ValueError:
+            return text, False
+        clean = _redact(parsed)
+        if clean == parsed:
+            return text, False
+        return json.dumps(clean, ensure_ascii=False, separators=(",", ":")), True
+    if "=" in text and " " not in text:
+        pairs = parse_qsl(text, keep_blank_values=True)
+        if pairs:
+            clean = _redact_pairs(pairs)
+            if clean != pairs:
+                return urlencode(clean), True
+    return text, False
+
+
+def _request_body(data) -> str:
+    if data is None:
+        return ""
+    if isinstance(data, dict):
+        return urlencode(_redact_pairs(sorted((str(k), str(v)) for k, v in data.items())))
+    if isinstance(data, (bytes, bytearray)):
+        data = bytes(data).decode("utf-8", "replace")
+    return _sanitize_text(str(data))[0]
+
+
+def _split_url(url: str, params) -> Tuple[str, str]:
+    """(url tanpa query, query yang sudah disanitasi & diurutkan)."""
+    parts = urlsplit(url)
+    pairs = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        items = params.items() if isinstance(params, dict) else params
+        pairs += [(str(k), str(v)) for k, v in items]
+    base = f"{parts.scheme}://{parts.netloc}{parts.path}"
+    return base, urlencode(sorted(_redact_pairs(pairs)))
+
+
+def _fingerprint(query: str, body: str) -> str:
+    return hashlib.sha1(f"{query}\n{body}".encode("utf-8")).hexdigest()[:16]
+
+
+class _Headers(dict):
+    """Header respons replay; akses tidak peka huruf besar/kecil."""
+
+    def __init__(self, headers: Dict[str, str]):
+        super().__init__((k.lower(), v) for k, v in headers.items())
+
+    def __getitem__(self, key):
+        return super().__getitem__(key.lower())
+
+    def get(self, key, default=None):
+        return super().get(key.lower(), default)
+
+    def __contains__(self, key):
+        return super().__contains__(str(key).lower())
+
+
+class ReplayResponse:
+    """Pengganti requests.Response dari satu entry cassette."""
+
+    def __init__(self, entry: Dict, url: str):
+        self.url = url
+        self.status_code = entry["status"]
+        self.headers = _Headers(entry.get("headers", {}))
+        if "body_b64" in entry:
+            self.content = base64.b64decode(entry["body_b64"])
+        else:
+            self.content = entry.get("body", "").encode("utf-8")
+        self.elapsed = timedelta(milliseconds=entry.get("elapsed_ms", 0))
+        self.encoding = "utf-8"
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", "replace")
+
+    def json(self, **kwargs):
+        return json.loads(self.content, **kwargs)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+    def close(self):
+        pass
+
+
+# -------------------- session --------------------
+class _SessionMethods:
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, data=None, **kwargs):
+        return self.request("POST", url, data=data, **kwargs)
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def close(self):
+        pass
+
+
+def _open_cassette(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class RecordingSession(_SessionMethods):
+    """
+    Meneruskan request ke session asli dan menulis setiap pertukaran
+    (sudah disanitasi) ke cassette. Error jaringan ikut direkam sehingga jalur
+    retry bisa diulang saat replay.
+    """
+
+    offline = False
+
+    def __init__(self, path: str, inner: Optional[requests.Session] = None):
+        self.path = path
+        self.inner = inner or requests.Session()
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._fh = _open_cassette(path, "w")
+        self.recorded = 0
+        atexit.register(self.close)
+
+    def request(self, method: str, url: str, params=None, data=None, **kwargs):
+        start = time.perf_counter()
+        try:
+            resp = self.inner.request(method, url, params=params, data=data, **kwargs)
+        except (requests.Timeout, requests.ConnectionError) as e:
+            kind = "Timeout" if isinstance(e, requests.Timeout) else "ConnectionError"
+            self._write(method, url, params, data, time.perf_counter() - start, error=kind)
+            raise
+        self._write(method, url, params, data, time.perf_counter() - start, resp=resp)
+        return resp
+
+    def _write(self, method: str, url: str, params, data, elapsed: float,
+               resp=None, error: Optional[str] = None):
+        base, query = _split_url(url, params)
+        body = _request_body(data)
+        entry = {"method": method.upper(), "url": base, "match": _fingerprint(query, body),
+                 "query": query, "request": body, "elapsed_ms": round(elapsed * 1000, 1)}
+        if error:
+            entry["error"] = error
+        else:
+            entry["status"] = resp.status_code
+            entry["headers"] = {k: resp.headers[k] for k in KEPT_RESPONSE_HEADERS
+                                if resp.headers.get(k) is not None}
+            content = resp.content or b""
+            try:
+                entry["body"] = _sanitize_text(content.decode("utf-8"))[0]
+            except UnicodeDecodeError:
+                entry["body_b64"] = base64.b64encode(content).decode("ascii")
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            if self._fh is None:
+                return
+            self._fh.write(line + "\n")
+            self._fh.flush()
+            self.recorded += 1
+
+    def close(self):
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+
+class ReplaySession(_SessionMethods):
+    """
+    Menjawab request dari cassette tanpa jaringan. Pasangan dicari per
+    (method, url): entry dengan sidik body+query yang sama didahulukan, kalau
+    tidak ada dipakai entry berikutnya sesuai urutan rekaman (body yang berisi
+    timestamp/signature tidak akan pernah sama persis). `strict=True`
+    menolak fallback itu.
+
+    Jeda tiap respons = latensi rekaman x `time_scale` (0 = langsung).
+    """
+
+    offline = True
+
+    def __init__(self, path: str, time_scale: float = 1.0, strict: bool = False):
+        self.path = path
+        self.time_scale = time_scale
+        self.strict = strict
+        self._lock = threading.Lock()
+        self._queues: Dict[Tuple[str, str], List[Dict]] = {}
+        self.served = 0
+        with _open_cassette(path, "r") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._queues.setdefault((entry["method"], entry["url"]), []).append(entry)
+
+    def remaining(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def _take(self, method: str, url: str, params, data) -> Dict:
+        base, query = _split_url(url, params)
+        match = _fingerprint(query, _request_body(data))
+        with self._lock:
+            queue = self._queues.get((method.upper(), base)) or []
+            for i, entry in enumerate(queue):
+                if entry["match"] == match:
+                    return queue.pop(i)
+            if queue and not self.strict:
+                logger.debug("Replay %s %s: body berbeda, pakai rekaman berikutnya", method, base)
+                return queue.pop(0)
+        raise CassetteMiss(f"Tidak ada rekaman untuk {method.upper()} {base}")
+
+    def request(self, method: str, url: str, params=None, data=None, timeout=None, **kwargs):
+        entry = self._take(method, url, params, data)
+        delay = entry.get("elapsed_ms", 0) / 1000 * self.time_scale
+        limit = timeout[-1] if isinstance(timeout, tuple) else timeout
+        if limit is not None and delay > limit:
+            time.sleep(limit)
+            raise requests.Timeout(f"Replay: {url} melebihi timeout {limit}s")
+        if delay > 0:
+            time.sleep(delay)
+        self.served += 1
+        if entry.get("error") == "Timeout":
+            raise requests.Timeout(f"Replay: timeout terekam untuk {url}")
+        if entry.get("error"):
+            raise requests.ConnectionError(f"Replay: koneksi gagal terekam untuk {url}")
+        return ReplayResponse(entry, url)
@@ -0,0 +1,358 @@
+import re
+import time
+import logging
+import threading
+import contextvars
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from api_request import get_family, get_package
+from catalog_snapshot import CatalogSnapshot, content_etag
+from models import PackageDetail, PackageFamily, PackageOption
+import progress
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+class CatalogEntry(PackageOption):
+    """PackageOption yang sudah di-index: ditambah eid (id pendek stabil) & price band."""
+
+    __slots__ = ("eid", "band")
+
+    def __init__(self, eid: int, option: PackageOption, name: str, band: int):
+        super().__init__(option.code, name, option.price, option.family_code,
+                         option.family_name, option.variant_name)
+        self.eid = eid
+        self.band = band
+
+    def __repr__(self):
+        return f"CatalogEntry({self.eid}, {self.name!r}, {self.price})"
+
+
+class _Index:
+    """Snapshot index yang immutable; diganti utuh setiap reload."""
+
+    __slots__ = ("entries", "by_eid", "by_code", "by_family", "by_variant",
+                 "by_band", "by_token")
+
+    def __init__(self, entries: List[CatalogEntry]):
+        self.entries = entries
+        self.by_eid: Dict[int, CatalogEntry] = {}
+        self.by_code: Dict[str, CatalogEntry] = {}
+        self.by_family: Dict[str, List[CatalogEntry]] = {}
+        self.by_variant: Dict[Tuple[str, str], List[CatalogEntry]] = {}
+        self.by_band: Dict[int, List[CatalogEntry]] = {}
+        self.by_token: Dict[str, Set[int]] = {}
+
+        for e in entries:
+            self.by_eid[e.eid] = e
+            self.by_code[e.code] = e
+            self.by_family.setdefault(e.family_code, []).append(e)
+            self.by_variant.setdefault((e.family_code, e.variant_name.lower()),
+                                       []).append(e)
+            self.by_band.setdefault(e.band, []).append(e)
+            words = tokenize(f"{e.family_name} {e.variant_name} {e.name}")
+            for word in words:
+                # prefix index supaya "unli" cocok dengan "unlimited"
+                for i in range(2, len(word) + 1):
+                    self.by_token.setdefault(word[:i], set()).add(e.eid)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class Catalog:
+    """
+    Katalog paket multi-family.
+
+    Family di-load paralel lewat `get_family`, option dinormalisasi menjadi
+    `CatalogEntry`, lalu di-index per family, variant, price band dan token
+    nama. Query search/filter hanya membaca index (tanpa request ke upstream).
+
+    Bila `snapshot` diisi, isi katalog dan detail paket dibaca dari snapshot
+    saat pertama dipakai (warm start) lalu direvalidasi di background.
+    """
+
+    def __init__(self,
+                 family_codes: Sequence[str],
+                 ttl: float = 900,
+                 price_bands: Sequence[int] = (10000, 25000, 50000, 100000),
+                 aliases: Optional[Dict[str, Dict[str, str]]] = None,
+                 max_workers: int = 4,
+                 snapshot: Optional[CatalogSnapshot] = None,
+                 detail_ttl: float = 3600):
+        self.family_codes = list(family_codes)
+        self.ttl = ttl
+        self.price_bands = list(price_bands)
+        # {family_code: {nama_option_lower: nama_tampilan}}
+        self.aliases = aliases or {}
+        self.max_workers = max_workers
+
+        self._index = _Index([])
+        self._loaded_at: Dict[str, float] = {}
+        self._eids: Dict[str, int] = {}  # code -> eid, stabil antar reload
+        self._next_eid = 1
+        self._raw: Dict[str, List[CatalogEntry]] = {}
+        self._etags: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        self.snapshot = snapshot
+        self.detail_ttl = detail_ttl
+        self._details: Dict[str, Tuple[float, str, PackageDetail]] = {}
+        self._snapshot_loaded = snapshot is None
+        self._refreshing = False
+
+    # -------------------- loading --------------------
+    def band_of(self, price: int) -> int:
+        return bisect_right(self.price_bands, price)
+
+    def _eid(self, code: str) -> int:
+        eid = self._eids.get(code)
+        if eid is None:
+            eid = self._eids[code] = self._next_eid
+            self._next_eid += 1
+        return eid
+
+    def _normalize(self, family: PackageFamily) -> List[CatalogEntry]:
+        aliases = self.aliases.get(family.code, {})
+        return [
+            CatalogEntry(self._eid(o.code), o, aliases.get(o.name.lower(), o.name),
+                         self.band_of(o.price)) for o in family.options
+        ]
+
+    def _fetch(self, api_key: str, tokens: dict,
+               family_code: str) -> Optional[PackageFamily]:
+        try:
+            return get_family(api_key, tokens, family_code)
+        except Exception as e:
+            logger.warning("Gagal load family %s: %s", family_code, e)
+            return None
+
+    def _rebuild(self):
+        entries = [e for c in self.family_codes for e in self._raw.get(c, [])]
+        self._index = _Index(entries)
+
+    def warm_start(self):
+        """
+        Isi index dari snapshot (sekali, tanpa request ke upstream). Blocking
+        (SQLite + decode JSON): bot memanggilnya sekali saat startup lewat
+        asyncio.to_thread; load/ensure_loaded juga memanggilnya untuk CLI.
+        """
+        if self._snapshot_loaded:
+            return
+        with self._lock:
+            if self._snapshot_loaded:
+                return
+            self._snapshot_loaded = True
+            families, eids = self.snapshot.load_families(self.family_codes)
+            self._eids.update(eids)
+            self._next_eid = max([self._next_eid - 1, *eids.values()]) + 1
+            now_wall, now = time.time(), time.monotonic()
+            for code, (etag, fetched_at, record) in families.items():
+                self._raw[code] = self._normalize(PackageFamily.from_record(record))
+                self._etags[code] = etag
+                # umur snapshot ikut dihitung: data lama langsung dianggap stale
+                self._loaded_at[code] = now - max(0.0, now_wall - fetched_at)
+            if families:
+                self._rebuild()
+                logger.info("Katalog warm start dari snapshot: %d family, %d paket",
+                            len(families), len(self._index.entries))
+
+    def load(self, api_key: str, tokens: dict,
+             family_codes: Optional[Iterable[str]] = None) -> int:
+        """Load (ulang) family secara paralel. Return jumlah family yang berhasil."""
+        self.warm_start()
+        codes = list(family_codes or self.family_codes)
+        if not codes:
+            return 0
+        progress.emit("catalog")
+        workers = max(1, min(self.max_workers, len(codes)))
+        # satu context per task supaya trace aktif ikut ke thread pool
+        contexts = [contextvars.copy_context() for _ in codes]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(
+                pool.map(lambda ctx, c: (c, ctx.run(self._fetch, api_key, tokens, c)),
+                         contexts, codes))
+
+        loaded = 0
+        changed = []
+        with self._lock:
+            now = time.monotonic()
+            for code, family in results:
+                if not family:
+                    # family gagal: pertahankan entry lama bila ada
+                    continue
+                loaded += 1
+                self._loaded_at[code] = now
+                record = family.to_record()
+                etag = content_etag(record)
+                if etag == self._etags.get(code):
+                    if self.snapshot:
+                        self.snapshot.touch_family(code)
+                    continue
+                self._raw[code] = self._normalize(family)
+                self._etags[code] = etag
+                changed.append((code, etag, record))
+            if changed:
+                self._rebuild()
+
+        if self.snapshot:
+            for code, etag, record in changed:
+                eids = {e.code: e.eid for e in self._raw.get(code, [])}
+                self.snapshot.save_family(code, etag, record, eids)
+        return loaded
+
+    def refresh_async(self, api_key: str, tokens: dict,
+                      family_codes: Optional[Iterable[str]] = None):
+        """Revalidasi di background; paling banyak satu refresh berjalan."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        codes = list(family_codes or self.family_codes)
+
+        def run():
+            try:
+                self.load(api_key, tokens, codes)
+            except Exception as e:
+                logger.warning("Revalidasi katalog gagal: %s", e)
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="catalog-refresh", daemon=True).start()
+
+    def stale_families(self) -> List[str]:
+        now = time.monotonic()
+        return [
+            c for c in self.family_codes
+            if now - self._loaded_at.get(c, -self.ttl - 1) > self.ttl
+        ]
+
+    def ensure_loaded(self, api_key: str, tokens: dict) -> bool:
+        """
+        Pastikan katalog terisi. Family yang belum pernah ada di-load langsung;
+        family yang sudah ada tapi kadaluarsa direvalidasi di background
+        (stale-while-revalidate). Return True bila katalog tidak kosong.
+        """
+        self.warm_start()
+        stale = self.stale_families()
+        if stale:
+            missing = [c for c in stale if c not in self._raw]
+            if missing:
+                self.load(api_key, tokens, missing)
+            present = [c for c in stale if c in self._raw and c not in missing]
+            if present:
+                self.refresh_async(api_key, tokens, present)
+        return bool(self._index.entries)
+
+    # -------------------- package details --------------------
+    def package_detail(self, api_key: str, tokens: dict, code: str,
+                       fresh: bool = False) -> Optional[PackageDetail]:
+        """
+        Detail paket untuk ditampilkan (nama, harga, dsb). Dibaca dari cache /
+        snapshot bila masih segar. Bukan untuk pembelian: `token_confirmation`
+        tidak pernah disimpan, `purchase_package` tetap mengambil detail baru.
+        `fresh=True` (layar konfirmasi beli): selalu ambil dari upstream dan
+        return None bila gagal, supaya harga yang disetujui = harga yang ditagih.
+        """
+        cached = self._details.get(code)
+        if cached is None and self.snapshot:
+            row = self.snapshot.load_detail(code)
+            if row:
+                etag, fetched_at, record = row
+                age = max(0.0, time.time() - fetched_at)
+                cached = self._details[code] = (time.monotonic() - age, etag,
+                                                PackageDetail.from_record(record))
+        if cached and not fresh and time.monotonic() - cached[0] <= self.detail_ttl:
+            return cached[2]
+
+        try:
+            data = get_package(api_key, tokens, code)
+        except Exception as e:
+            logger.warning("Gagal ambil detail paket %s: %s", code, e)
+            data = None
+        if not data:
+            # upstream gagal: pakai data lama bila ada (kecuali diminta yang segar)
+            return cached[2] if cached and not fresh else None
+
+        # token_confirmation tidak ikut disimpan (hanya field tampilan)
+        record = data.to_record()
+        data = PackageDetail.from_record(record)
+        etag = content_etag(record)
+        self._details[code] = (time.monotonic(), etag, data)
+        if self.snapshot and (cached is None or cached[1] != etag):
+            self.snapshot.save_detail(code, etag, record)
+        return data
+
+    # -------------------- queries --------------------
+    @property
+    def index(self) -> _Index:
+        # baca biasa: snapshot sudah dimuat warm_start() (tidak memblokir event loop)
+        return self._index
+
+    def __len__(self):
+        return len(self.index.entries)
+
+    def get(self, eid: int) -> Optional[CatalogEntry]:
+        return self.index.by_eid.get(eid)
+
+    def by_code(self, code: str) -> Optional[CatalogEntry]:
+        return self.index.by_code.get(code)
+
+    def filter(self,
+               family: Optional[str] = None,
+               variant: Optional[str] = None,
+               min_price: Optional[int] = None,
+               max_price: Optional[int] = None) -> List[CatalogEntry]:
+        idx = self.index
+        if family is not None and variant is not None:
+            result = idx.by_variant.get((family, variant.lower()), [])
+        elif family is not None:
+            result = idx.by_family.get(family, [])
+        elif variant is not None:
+            v = variant.lower()
+            result = [e for (_, name), es in idx.by_variant.items()
+                      if name == v for e in es]
+        elif min_price is not None or max_price is not None:
+            lo = self.band_of(min_price) if min_price is not None else 0
+            hi = self.band_of(max_price) if max_price is not None else len(self.price_bands)
+            result = [e for b in range(lo, hi + 1) for e in idx.by_band.get(b, [])]
+        else:
+            result = idx.entries
+
+        if min_price is not None:
+            result = [e for e in result if e.price >= min_price]
+        if max_price is not None:
+            result = [e for e in result if e.price <= max_price]
+        return list(result)
+
+    def search(self, query: str, limit: int = 20) -> List[CatalogEntry]:
+        """Cari entry yang mengandung semua kata (prefix) di query."""
+        words = tokenize(query)
+        if not words:
+            return []
+        idx = self.index
+        sets = [idx.by_token.get(w, set()) for w in words]
+        sets.sort(key=len)
+        hits = set(sets[0])
+        for s in sets[1:]:
+            hits &= s
+            if not hits:
+                return []
+        entries = sorted((idx.by_eid[i] for i in hits),
+                         key=lambda e: (e.price, e.name))
+        return entries[:limit]
+
+
+def keyboard_rows(entries: Iterable[CatalogEntry],
+                  prefix: str = "pkg") -> List[Tuple[str, str]]:
+    """(label, callback_data) per entry; callback memakai eid yang stabil."""
+    return [(f"📦 {e.name} - Rp {e.price:,}", f"{prefix}{e.eid}")
+            for e in entries]
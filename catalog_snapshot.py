@@ -0,0 +1,154 @@
+import json
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS families (
+    code TEXT PRIMARY KEY, etag TEXT NOT NULL, fetched_at REAL NOT NULL, data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS details (
+    code TEXT PRIMARY KEY, etag TEXT NOT NULL, fetched_at REAL NOT NULL, data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS eids (code TEXT PRIMARY KEY, eid INTEGER NOT NULL);
+"""
+
+
+def content_etag(data) -> str:
+    """Hash konten yang stabil (urutan key tidak berpengaruh)."""
+    raw = json.dumps(data, sort_keys=True, separators=(",", ":"),
+                     ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:20]
+
+
+class CatalogSnapshot:
+    """
+    Snapshot katalog di SQLite (satu file) untuk warm start.
+
+    Koneksi dibuka lazy saat pertama dipakai, dengan `mmap_size` supaya
+    pembacaan saat boot langsung dari page cache. Setiap family/detail
+    disimpan bersama etag (hash konten) sehingga revalidasi hanya menulis
+    baris yang benar-benar berubah.
+    """
+
+    def __init__(self, path: str = "catalog.db", mmap_size: int = 16 * 1024 * 1024):
+        self.path = path
+        self.mmap_size = mmap_size
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            row = conn.execute(
+                "SELECT value FROM meta WHERE key='schema'").fetchone()
+            if row is None or int(row[0]) != SCHEMA_VERSION:
+                # format lama/asing: buang isinya, snapshot hanya cache
+                conn.executescript(
+                    "DELETE FROM families; DELETE FROM details; DELETE FROM eids;")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema', ?)",
+                    (str(SCHEMA_VERSION),))
+                conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # -------------------- families --------------------
+    def load_families(
+        self, codes: Sequence[str]
+    ) -> Tuple[Dict[str, Tuple[str, float, dict]], Dict[str, int]]:
+        """Return ({code: (etag, fetched_at, data)}, {option_code: eid})."""
+        families: Dict[str, Tuple[str, float, dict]] = {}
+        try:
+            with self._lock:
+                db = self._db()
+                marks = ",".join("?" * len(codes))
+                rows = db.execute(
+                    f"SELECT code, etag, fetched_at, data FROM families WHERE code IN ({marks})",
+                    list(codes)).fetchall() if codes else []
+                eids = dict(db.execute("SELECT code, eid FROM eids").fetchall())
+        except sqlite3.Error as e:
+            logger.warning("Snapshot katalog tidak bisa dibaca: %s", e)
+            return {}, {}
+
+        for code, etag, fetched_at, data in rows:
+            try:
+                families[code] = (etag, fetched_at, json.loads(data))
+            except ValueError:
+                continue
+        return families, eids
+
+    def save_family(self, code: str, etag: str, data: dict,
+                    eids: Dict[str, int]):
+        blob = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+        try:
+            with self._lock:
+                db = self._db()
+                db.execute(
+                    "INSERT OR REPLACE INTO families (code, etag, fetched_at, data) VALUES (?, ?, ?, ?)",
+                    (code, etag, time.time(), blob))
+                db.executemany(
+                    "INSERT OR IGNORE INTO eids (code, eid) VALUES (?, ?)",
+                    eids.items())
+                db.commit()
+        except sqlite3.Error as e:
+            logger.warning("Gagal menulis snapshot family %s: %s", code, e)
+
+    def touch_family(self, code: str):
+        """Konten tidak berubah (etag sama): cukup perbarui waktu validasi."""
+        try:
+            with self._lock:
+                db = self._db()
+                db.execute("UPDATE families SET fetched_at=? WHERE code=?",
+                           (time.time(), code))
+                db.commit()
+        except sqlite3.Error as e:
+            logger.warning("Gagal update snapshot family %s: %s", code, e)
+
+    # -------------------- package details --------------------
+    def load_detail(self, code: str) -> Optional[Tuple[str, float, dict]]:
+        try:
+            with self._lock:
+                row = self._db().execute(
+                    "SELECT etag, fetched_at, data FROM details WHERE code=?",
+                    (code,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Snapshot detail tidak bisa dibaca: %s", e)
+            return None
+        if row is None:
+            return None
+        etag, fetched_at, data = row
+        try:
+            return etag, fetched_at, json.loads(data)
+        except ValueError:
+            return None
+
+    def save_detail(self, code: str, etag: str, data: dict):
+        blob = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+        try:
+            with self._lock:
+                db = self._db()
+                db.execute(
+                    "INSERT OR REPLACE INTO details (code, etag, fetched_at, data) VALUES (?, ?, ?, ?)",
+                    (code, etag, time.time(), blob))
+                db.commit()
+        except sqlite3.Error as e:
+            logger.warning("Gagal menulis snapshot detail %s: %s", code, e)
@@ -0,0 +1,161 @@
+# cli.py - Mode non-interaktif untuk skrip/monitoring: token dari cache, request paralel, output JSON
+#
+#   python cli.py status --json
+#   python cli.py quota --json
+#
+# Exit code: 0 sukses, 1 gagal (token/API key tidak ada, request gagal).
+import os
+import sys
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from api_request import MyXLClient, load_tokens, save_tokens
+from retry import RetryPolicy
+import transport
+
+TOKENS_FILE = "tokens.json"
+API_KEY_FILE = "api.key"
+
+
+def resolve_api_key(explicit: Optional[str] = None) -> str:
+    """--api-key, lalu env MYXL_API_KEY, lalu file api.key (tanpa verifikasi jaringan)."""
+    if explicit:
+        return explicit
+    if os.getenv("MYXL_API_KEY"):
+        return os.environ["MYXL_API_KEY"]
+    try:
+        with open(API_KEY_FILE, "r", encoding="utf8") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def _fetch(client: MyXLClient, names: Iterable[str]) -> Dict[str, object]:
+    calls = {
+        "profile": client.get_profile,
+        "balance": client.get_balance,
+        "quota": client.get_quota_details,
+    }
+    names = list(names)
+    with ThreadPoolExecutor(max_workers=len(names)) as pool:
+        futures = {name: pool.submit(calls[name]) for name in names}
+        return {name: f.result() for name, f in futures.items()}
+
+
+def fetch(client: MyXLClient, names: List[str], tokens_file: str = TOKENS_FILE) -> Dict[str, object]:
+    """
+    Semua data diambil paralel dengan id_token yang tersimpan. Token hanya
+    direfresh (lalu disimpan) bila ada request yang ditolak, dan hanya
+    request yang gagal yang diulang.
+    """
+    results = _fetch(client, names)
+    failed = [name for name, value in results.items() if value is None]
+    if failed and client.tokens.get("refresh_token"):
+        client.refresh_tokens()
+        # token hasil replay sudah disensor, jangan timpa tokens.json
+        if not transport.replaying():
+            save_tokens(client.tokens, tokens_file)
+        results.update(_fetch(client, failed))
+    return results
+
+
+def _iso(ts: int) -> Optional[str]:
+    return datetime.fromtimestamp(ts).isoformat() if ts else None
+
+
+def _quota_list(quotas) -> List[Dict]:
+    return [{"code": q.code, "group_code": q.group_code, "name": q.name,
+             "remaining": q.remaining, "total": q.total} for q in quotas or []]
+
+
+def build_status(results: Dict[str, object]) -> Dict:
+    profile, balance = results.get("profile"), results.get("balance")
+    out: Dict = {"ok": profile is not None and balance is not None}
+    if profile is not None:
+        out.update(msisdn=profile.msisdn, subscriber_id=profile.subscriber_id,
+                   subscription_type=profile.subscription_type)
+    if balance is not None:
+        out.update(balance=balance.remaining, expired_at=balance.expired_at,
+                   expired_at_iso=_iso(balance.expired_at))
+    if not out["ok"]:
+        out["error"] = "profile/balance tidak tersedia"
+    return out
+
+
+def build_quota(results: Dict[str, object]) -> Dict:
+    quotas = results.get("quota")
+    if quotas is None:
+        return {"ok": False, "error": "quota-details tidak tersedia"}
+    return {"ok": True, "quotas": _quota_list(quotas)}
+
+
+def _print_text(cmd: str, out: Dict):
+    if not out["ok"]:
+        print(f"Gagal: {out.get('error')}")
+        return
+    if cmd == "status":
+        print(f"Nomor: {out['msisdn']}")
+        print(f"Pulsa: Rp {out['balance']:,}")
+        print(f"Masa aktif: {out['expired_at_iso']}")
+    else:
+        if not out["quotas"]:
+            print("Tidak ada kuota aktif.")
+        for q in out["quotas"]:
+            print(f"{q['name']}: {q['remaining']} / {q['total']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="MyXL non-interaktif (untuk skrip)")
+    parser.add_argument("command", choices=("status", "quota"))
+    parser.add_argument("--json", action="store_true", help="output JSON satu baris")
+    parser.add_argument("--tokens", default=TOKENS_FILE, help="file token (default tokens.json)")
+    parser.add_argument("--api-key", help="default: env MYXL_API_KEY / api.key")
+    parser.add_argument("--timeout", type=float, default=20,
+                        help="batas waktu total per request, detik (default 20)")
+    parser.add_argument("--record", metavar="FILE", help="rekam pertukaran HTTP ke cassette")
+    parser.add_argument("--replay", metavar="FILE", help="jawab dari cassette, tanpa jaringan")
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="skala latensi saat replay (0 = tanpa jeda)")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        transport.record(args.record)
+    elif args.replay:
+        transport.replay(args.replay, args.time_scale)
+    else:
+        transport.install_from_env()
+
+    def emit(out: Dict) -> int:
+        if args.json:
+            print(json.dumps(out, ensure_ascii=False, separators=(",", ":")))
+        else:
+            _print_text(args.command, out)
+        return 0 if out["ok"] else 1
+
+    api_key = resolve_api_key(args.api_key)
+    if not api_key:
+        return emit({"ok": False, "error": "API key tidak ditemukan"})
+    try:
+        tokens = load_tokens(args.tokens)
+    except (OSError, ValueError) as e:
+        return emit({"ok": False, "error": f"token tidak valid: {e}"})
+    if not tokens:
+        return emit({"ok": False, "error": f"{args.tokens} tidak ditemukan, login dulu"})
+
+    client = MyXLClient(api_key, tokens, timeout=args.timeout,
+                        retry=RetryPolicy(deadline=args.timeout))
+    names = ["profile", "balance"] if args.command == "status" else ["quota"]
+    try:
+        results = fetch(client, names, args.tokens)
+    except Exception as e:
+        return emit({"ok": False, "error": str(e)})
+
+    out = build_status(results) if args.command == "status" else build_quota(results)
+    return emit(out)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,12 @@
-import os, hmac, hashlib, requests, brotli, zlib, base64
+import os, hmac, hashlib, base64
 from datetime import datetime, timezone, timedelta
-from Crypto.Cipher import AES
-from Crypto.Util.Padding import pad
+
+# Crypto (pycryptodome), brotli & zlib hanya dipakai saat pembelian / decode manual,
+# jadi di-import lazy di dalam fungsi supaya start-up tidak ikut membayar
+
+from json_codec import loads, dumps, is_envelope
+from tracing import span
+import transport
 
 API_KEY = "vT8tINqHaOxXbGE7eOWAhA=="
 AX_API_SIG_KEY_ASCII = b"18b4d589826af50241177961590e6693"
@@ -10,37 +15,74 @@ XDATA_DECRYPT_URL = "https://xdata.fuyuki.pw/api/decrypt"
 XDATA_ENCRYPT_SIGN_URL = "https://xdata.fuyuki.pw/api/encryptsign"
 
 AES_KEY_ASCII = "5dccbf08920a5527"
-BLOCK = AES.block_size
+
+class XDataError(Exception):
+    """Respons non-200 dari layanan xdata; `status_code` dipakai untuk klasifikasi retry."""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+BLOCK = 16  # AES.block_size
 
 def random_iv_hex16() -> str:
     return os.urandom(8).hex()
 
 def _xor(data: bytes, key: bytes) -> bytes:
-    return bytes([b ^ key[i % len(key)] for i, b in enumerate(data)])
+    # key diulang sepanjang data lalu di-XOR sekaligus sebagai integer
+    stream = (key * (len(data) // len(key) + 1))[:len(data)]
+    return (int.from_bytes(data, "big") ^ int.from_bytes(stream, "big")).to_bytes(len(data), "big")
 
 def b64(data: bytes, urlsafe: bool) -> str:
     enc = base64.urlsafe_b64encode if urlsafe else base64.b64encode
     return enc(data).decode("ascii")
 
 
+# plaintext selalu kosong -> satu blok padding PKCS#7 (0x10 * 16). CBC satu blok
+# = ECB(pad XOR iv), jadi cukup satu cipher ECB per proses, dibuat saat pertama dipakai
+_EMPTY_PAD_INT = int.from_bytes(bytes([BLOCK]) * BLOCK, "big")
+_field_cipher = None
+
+def _field_ecb():
+    global _field_cipher
+    if _field_cipher is None:
+        from Crypto.Cipher import AES
+        _field_cipher = AES.new(AES_KEY_ASCII.encode("ascii"), AES.MODE_ECB)
+    return _field_cipher
+
 def build_encrypted_field(iv_hex16: str | None = None, urlsafe_b64: bool = False) -> str:
-    key = AES_KEY_ASCII.encode("ascii")
     iv_hex = iv_hex16 or random_iv_hex16()
-    iv = iv_hex.encode("ascii") 
+    iv = iv_hex.encode("ascii")
+    if len(iv) != BLOCK:
+        raise ValueError("Incorrect IV length (it must be 16 bytes long)")
 
-    pt = pad(b"", AES.block_size)
-    ct = AES.new(key, AES.MODE_CBC, iv=iv).encrypt(pt)
+    block = (_EMPTY_PAD_INT ^ int.from_bytes(iv, "big")).to_bytes(BLOCK, "big")
+    ct = _field_ecb().encrypt(block)
 
     return b64(ct, urlsafe_b64) + iv_hex
 
+GMT7 = timezone(timedelta(hours=7))
+
+def _tz_suffix(dt: datetime, colon: bool) -> str:
+    offset = dt.utcoffset()
+    if offset is None:
+        return "+00:00" if colon else ""
+    minutes = int(offset.total_seconds()) // 60
+    sign = "-" if minutes < 0 else "+"
+    hh, mm = divmod(abs(minutes), 60)
+    return f"{sign}{hh:02d}:{mm:02d}" if colon else f"{sign}{hh:02d}{mm:02d}"
+
+# format manual (f-string) setara strftime, dipanggil di setiap request
 def java_like_timestamp(now: datetime) -> str:
-    ms2 = f"{int(now.microsecond/10000):02d}"
-    tz = now.strftime("%z"); tz_colon = tz[:-2] + ":" + tz[-2:] if tz else "+00:00"
-    return now.strftime(f"%Y-%m-%dT%H:%M:%S.{ms2}") + tz_colon
+    return (f"{now.year:04d}-{now.month:02d}-{now.day:02d}T"
+            f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}.{now.microsecond // 10000:02d}"
+            + _tz_suffix(now, True))
 
 def decode_response(response):
+    import zlib
     encoding = response.headers.get("Content-Encoding", "").lower()
     if encoding == "br":
+        import brotli
         return brotli.decompress(response.content).decode("utf-8")
     elif encoding == "gzip":
         return zlib.decompress(response.content, zlib.MAX_WBITS | 16).decode("utf-8")
@@ -50,26 +92,25 @@ def decode_response(response):
         return response.text
 
 def ts_gmt7_without_colon(dt: datetime) -> str:
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone(timedelta(hours=7)))
-    else:
-        dt = dt.astimezone(timezone(timedelta(hours=7)))
-    millis = f"{int(dt.microsecond / 1000):03d}"
-    tz = dt.strftime("%z")
-    return dt.strftime(f"%Y-%m-%dT%H:%M:%S.{millis}") + tz
+    dt = dt.replace(tzinfo=GMT7) if dt.tzinfo is None else dt.astimezone(GMT7)
+    return (f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}T"
+            f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}.{dt.microsecond // 1000:03d}+0700")
+
+# state HMAC dengan key sudah terpasang; per panggilan cukup .copy()
+_AX_SIG_HMAC = hmac.new(AX_API_SIG_KEY_ASCII, digestmod=hashlib.sha256)
 
 def ax_api_signature(ts_for_sign: str, contact: str, code: str, contact_type: str) -> str:
-    preimage = f"{ts_for_sign}password{contact_type}{contact}{code}openid"
-    digest = hmac.new(AX_API_SIG_KEY_ASCII, preimage.encode("utf-8"), hashlib.sha256).digest()
-    b64res = base64.b64encode(digest).decode("ascii")
-    return b64res
+    mac = _AX_SIG_HMAC.copy()
+    mac.update(f"{ts_for_sign}password{contact_type}{contact}{code}openid".encode("utf-8"))
+    return base64.b64encode(mac.digest()).decode("ascii")
     
 def encryptsign_xdata(
         api_key: str,
         method: str,
         path: str,
         id_token: str,
-        payload: dict
+        payload: dict,
+        timeout: float = 30,
     ) -> str:
     headers = {
         "Content-Type": "application/json",
@@ -83,18 +124,25 @@ def encryptsign_xdata(
         "body": payload
     }
 
-    response = requests.request("POST", XDATA_ENCRYPT_SIGN_URL, json=request_body, headers=headers, timeout=30)
+    with span("xdata.encryptsign", path=path):
+        response = transport.current().request("POST", XDATA_ENCRYPT_SIGN_URL, data=dumps(request_body), headers=headers, timeout=timeout)
     
     if response.status_code == 200:
-        return response.json()
+        return loads(response.content)
     else:
-        raise Exception(f"Encryption failed: {response.text}")
+        raise XDataError(f"Encryption failed: {response.text}", response.status_code)
     
 def decrypt_xdata(
     api_key: str,
-    encrypted_payload: dict
+    encrypted_payload: dict | bytes,
+    timeout: float = 30,
     ) -> dict:
-    if not isinstance(encrypted_payload, dict) or "xdata" not in encrypted_payload or "xtime" not in encrypted_payload:
+    # bytes = body mentah amplop dari MyXL (sudah divalidasi pemanggil), dikirim apa adanya
+    if isinstance(encrypted_payload, (bytes, bytearray)):
+        body = bytes(encrypted_payload)
+    elif is_envelope(encrypted_payload):
+        body = dumps(encrypted_payload)
+    else:
         raise ValueError("Invalid encrypted data format. Expected a dictionary with 'xdata' and 'xtime' keys.")
     
     headers = {
@@ -102,23 +150,27 @@ def decrypt_xdata(
         "x-api-key": api_key,
     }
     
-    response = requests.request("POST", XDATA_DECRYPT_URL, json=encrypted_payload, headers=headers, timeout=30)
+    with span("xdata.decrypt", bytes=len(body)):
+        response = transport.current().request("POST", XDATA_DECRYPT_URL, data=body, headers=headers, timeout=timeout)
     
     if response.status_code == 200:
-        return response.json().get("plaintext")
+        return loads(response.content).get("plaintext")
     else:
-        raise Exception(f"Decryption failed: {response.text}")
+        raise XDataError(f"Decryption failed: {response.text}", response.status_code)
 
-def make_x_signature_payment(access_token: str, sig_time_sec: int, package_code: str, token_payment:str) -> str:
-    k = b"KRw1fXkLSwZLCU52GiEaNRsXFnURAhUUAH9MFmZZK2gPRDAIBjkMEBYdQkoWYmh2YhQCBEIKLDRbGR0zAk1OV2dXCEUzAz9THSsGGDwgbzVvYR9fQERbcgIxcB1aEh4rEB85dXRjdVsJQgM5DxAUOh4mdS9helFqd1VDRmA2AyMYKBoTE24YPWFLXUdpF2RGJGYhRnggDF0KGDE/FgUVZmFjd3ogKFo+DAkaPlY5PEoXWA4BQ0Y1JCVGPgwJGmAbOSBCVk1TFUtQNS0="
+_PAYMENT_SIG_BLOB = b"KRw1fXkLSwZLCU52GiEaNRsXFnURAhUUAH9MFmZZK2gPRDAIBjkMEBYdQkoWYmh2YhQCBEIKLDRbGR0zAk1OV2dXCEUzAz9THSsGGDwgbzVvYR9fQERbcgIxcB1aEh4rEB85dXRjdVsJQgM5DxAUOh4mdS9helFqd1VDRmA2AyMYKBoTE24YPWFLXUdpF2RGJGYhRnggDF0KGDE/FgUVZmFjd3ogKFo+DAkaPlY5PEoXWA4BQ0Y1JCVGPgwJGmAbOSBCVk1TFUtQNS0="
+_PAYMENT_SIG_XOR_KEY = b"MyXL#8.6.0#API#Sign"
 
-    xor_key = b"MyXL#8.6.0#API#Sign"
+def _payment_key_parts() -> tuple:
+    # template "...{st}...{st}" didekode sekali per proses lalu dipecah di "{st}",
+    # sehingga key per panggilan cukup di-join (setara template.format(st=...))
+    template = _xor(base64.b64decode(_PAYMENT_SIG_BLOB), _PAYMENT_SIG_XOR_KEY).decode("utf-8")
+    return tuple(part.encode("utf-8") for part in template.split("{st}"))
 
-    cipher_bytes = base64.b64decode(k)
-    template = _xor(cipher_bytes, xor_key).decode("utf-8")
+_PAYMENT_KEY_PARTS = _payment_key_parts()
 
-    key_str = template.format(st=sig_time_sec)
-    key_bytes = key_str.encode("utf-8")
+def make_x_signature_payment(access_token: str, sig_time_sec: int, package_code: str, token_payment:str) -> str:
+    key_bytes = str(sig_time_sec).encode("ascii").join(_PAYMENT_KEY_PARTS)
 
     msg = f"{access_token};{token_payment};{sig_time_sec};BUY_PACKAGE;BALANCE;{package_code};".encode("utf-8")
 
@@ -0,0 +1,166 @@
+# drain.py - Shutdown bertahap & serah terima ke proses pengganti (tanpa update hilang / dobel)
+import os
+import json
+import time
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class GracefulDrain:
+    """
+    Alur saat SIGTERM/SIGINT:
+
+    1. intake berhenti (`updater.stop()`): tidak ada update baru yang diambil,
+       offset update yang sudah diambil dikonfirmasi ke Telegram;
+    2. handler yang sedang berjalan (mis. pembelian yang sedang settlement)
+       dan update yang sudah antre diberi waktu `timeout` detik untuk selesai;
+    3. state (sesi, langganan alert, watermark update, update antre yang belum
+       sempat diproses) ditulis ke `path`, lalu lock dilepas;
+    4. aplikasi berhenti seperti biasa.
+
+    Proses pengganti boleh dijalankan sebelum proses lama berhenti: ia
+    menunggu lock (`acquire`) sebelum mulai polling, lalu memuat state
+    dan memproses update titipan lebih dulu. Update dengan id <= watermark
+    proses lama dibuang supaya tidak diproses dua kali.
+    """
+
+    def __init__(self, path: str, timeout: float = 25, lock_wait: float = 120):
+        self.path = path
+        self.timeout = timeout
+        self.lock_wait = lock_wait
+        self.draining = False
+        self.drained = False
+        self.active = 0
+        # update terakhir yang sudah mulai diproses di proses ini
+        self.last_update_id = 0
+        # watermark dari proses sebelumnya: update <= ini sudah ditangani di sana
+        self.resume_after = 0
+        # update titipan proses sebelumnya: tetap diproses walau id-nya <= watermark
+        # (update diproses bersamaan, jadi yang antre bisa lebih tua dari yang selesai)
+        self._handed_over: set = set()
+        self._lock_fh = None
+
+    # -------------------- lock serah terima --------------------
+    def acquire(self) -> bool:
+        """Tunggu proses lama melepas lock (maks `lock_wait` detik). False bila waktu habis."""
+        try:
+            import fcntl  # tidak ada di Windows: tanpa lock, state tetap dimuat
+        except ImportError:
+            return True
+        fh = open(self.path + ".lock", "a")
+        deadline = time.monotonic() + self.lock_wait
+        waited = False
+        while True:
+            try:
+                fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                self._lock_fh = fh
+                if waited:
+                    logger.info("Lock state diambil alih dari proses sebelumnya")
+                return True
+            except OSError:
+                if time.monotonic() >= deadline:
+                    fh.close()
+                    logger.warning("Proses lama belum melepas %s.lock setelah %ss, lanjut tanpa lock",
+                                   self.path, self.lock_wait)
+                    return False
+                if not waited:
+                    logger.info("Menunggu proses lama selesai drain...")
+                    waited = True
+                time.sleep(0.2)
+
+    def release(self):
+        if self._lock_fh is not None:
+            self._lock_fh.close()  # menutup fd melepas flock
+            self._lock_fh = None
+
+    # -------------------- state --------------------
+    def load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("State %s tidak bisa dibaca: %s", self.path, e)
+            return {}
+        self.resume_after = int(state.get("last_update_id") or 0)
+        self.last_update_id = self.resume_after
+        self._handed_over = {u.get("update_id") for u in state.get("updates") or []}
+        return state
+
+    def save(self, state: Dict[str, Any]):
+        """Tulis atomik (file sementara + rename), hanya bisa dibaca pemilik: berisi token."""
+        state = {**state, "last_update_id": self.last_update_id, "saved_at": time.time()}
+        tmp = f"{self.path}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf8") as f:
+            json.dump(state, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    # -------------------- pelacakan update --------------------
+    def seen(self, update_id: Optional[int]) -> bool:
+        """True bila update sudah ditangani proses sebelumnya; selain itu catat watermark."""
+        if update_id is None:
+            return False
+        if update_id in self._handed_over:
+            self._handed_over.discard(update_id)
+            return False
+        if update_id <= self.resume_after:
+            return True
+        if update_id > self.last_update_id:
+            self.last_update_id = update_id
+        return False
+
+    def enter(self):
+        self.active += 1
+
+    def exit(self):
+        self.active -= 1
+
+    # -------------------- drain --------------------
+    async def drain(self, application, snapshot: Callable[[], Dict[str, Any]], admission=None):
+        """`admission`: AdmissionControl; update yang masih antre slot upstream ikut dititipkan."""
+        if self.draining:
+            return
+        self.draining = True
+        t0 = time.monotonic()
+        waiting = (lambda: admission.waiting) if admission is not None else (lambda: 0)
+        if application.updater is not None and application.updater.running:
+            await application.updater.stop()
+        logger.info("Drain: intake dihentikan, %d handler berjalan, %d update antre",
+                    self.active, application.update_queue.qsize() + waiting())
+
+        deadline = t0 + self.timeout
+        queue = application.update_queue
+        while (self.active or waiting() or not queue.empty()) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+        # update yang belum sempat dimulai dititipkan ke proses berikutnya
+        leftover = []
+        if admission is not None:
+            leftover.extend(u.to_dict() for u in admission.hand_off() if hasattr(u, "to_dict"))
+        while not queue.empty():
+            item = queue.get_nowait()
+            if hasattr(item, "update_id") and hasattr(item, "to_dict"):
+                leftover.append(item.to_dict())
+        if self.active:
+            logger.warning("Drain: %d handler belum selesai setelah %ss", self.active, self.timeout)
+        self.finish(snapshot, leftover)
+        logger.info("Drain selesai dalam %.1fs (%d update dititipkan)",
+                    time.monotonic() - t0, len(leftover))
+        application.stop_running()
+
+    def finish(self, snapshot: Callable[[], Dict[str, Any]], updates=()):
+        """Simpan state terakhir & lepas lock (sekali saja)."""
+        if self.drained:
+            return
+        self.drained = True
+        try:
+            self.save({**snapshot(), "updates": list(updates)})
+        except Exception as e:
+            logger.error("Gagal menyimpan state %s: %s", self.path, e)
+        finally:
+            self.release()
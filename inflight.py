@@ -0,0 +1,77 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class SingleFlight:
+    """
+    De-duplikasi pekerjaan async per key.
+
+    Pemanggil kedua dengan key yang sama selama pekerjaan masih berjalan akan
+    menunggu hasil pekerjaan pertama (tidak menjalankan ulang). Hasil yang lolos
+    `cache_if` disimpan selama `result_ttl` detik untuk menjawab duplikat yang
+    datang terlambat.
+    """
+
+    def __init__(self, result_ttl: float = 60.0):
+        self.result_ttl = result_ttl
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def __len__(self):
+        return len(self._inflight) + len(self._results)
+
+    def _cached(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._results.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._results[key]
+            return False, None
+        return True, value
+
+    def _sweep(self):
+        now = time.monotonic()
+        for key in [k for k, (exp, _) in self._results.items() if exp < now]:
+            del self._results[key]
+
+    async def do(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        cache_if: Optional[Callable[[Any], bool]] = None,
+    ) -> Tuple[Any, bool]:
+        """
+        Jalankan `factory()` sekali untuk `key`.
+        Return (hasil, shared) — shared=True bila hasil berasal dari
+        pekerjaan lain yang sedang/baru saja berjalan.
+        """
+        hit, value = self._cached(key)
+        if hit:
+            return value, True
+
+        running = self._inflight.get(key)
+        if running is not None:
+            return await asyncio.shield(running), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # hindari warning "exception was never retrieved" bila tidak ada duplikat
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if cache_if is None or cache_if(value):
+                self._sweep()
+                self._results[key] = (time.monotonic() + self.result_ttl, value)
+            return value, False
+        finally:
+            self._inflight.pop(key, None)
@@ -0,0 +1,28 @@
+# json_codec.py - encode/decode JSON sekali jalan, pakai orjson bila terpasang
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson opsional
+    orjson = None
+
+BACKEND = "orjson" if orjson else "json"
+
+
+def loads(data: bytes | str):
+    """Parse langsung dari bytes (tanpa decode ke str dulu)."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> bytes:
+    """Serialisasi ringkas (tanpa spasi) ke bytes, siap dikirim sebagai body."""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def is_envelope(obj) -> bool:
+    """True bila obj adalah amplop terenkripsi MyXL ({"xdata": ..., "xtime": ...})."""
+    return isinstance(obj, dict) and "xdata" in obj and "xtime" in obj
@@ -0,0 +1,148 @@
+# log_setup.py - Logging bertingkat, lazy & non-blocking (QueueHandler + QueueListener)
+import os
+import copy
+import json
+import queue
+import atexit
+import logging
+import logging.handlers
+from typing import Dict, Iterable, Optional
+
+# atribut bawaan LogRecord, dipakai untuk memisahkan field tambahan
+_STD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Loloskan 1 dari N record untuk event bervolume tinggi.
+    N diambil dari `extra={"sample": N}` atau dari `rates[<template pesan>]`.
+    Dijalankan di thread pemanggil sebelum masuk queue, jadi record yang
+    dibuang tidak pernah diformat.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, int]] = None):
+        super().__init__()
+        self.rates = dict(rates or {})
+        self._counts: Dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        n = getattr(record, "sample", None) or self.rates.get(record.msg)
+        if not n or n <= 1 or record.levelno >= logging.WARNING:
+            return True
+        key = record.msg if isinstance(record.msg, str) else repr(record.msg)
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        return count % n == 0
+
+
+class StructuredFormatter(logging.Formatter):
+    """Teks biasa + `key=value` untuk field di `extra`, atau satu objek JSON per baris."""
+
+    def __init__(self, fmt: Optional[str] = None, as_json: bool = False):
+        super().__init__(fmt or "%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        self.as_json = as_json
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = {k: v for k, v in record.__dict__.items()
+                  if k not in _STD_ATTRS and k != "sample"}
+        if self.as_json:
+            doc = {
+                "ts": self.formatTime(record),
+                "level": record.levelname,
+                "logger": record.name,
+                "msg": record.getMessage(),
+                **fields,
+            }
+            if record.exc_info:
+                doc["exc"] = self.formatException(record.exc_info)
+            return json.dumps(doc, ensure_ascii=False, default=str)
+
+        line = super().format(record)
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return line
+
+
+# argumen yang tidak bisa berubah setelah log dipanggil: aman diformat belakangan
+_IMMUTABLE_ARGS = (str, int, float, bool, bytes, type(None))
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler bawaan memformat pesan di thread pemanggil; di sini format
+    ditunda ke listener selama argumennya immutable. Argumen lain (dict, sesi,
+    token, ...) bisa sudah diubah pemanggil saat listener memformat, jadi
+    pesannya dibekukan dulu di thread pemanggil.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if not args:
+            return record
+        # args dict = satu argumen mapping (LogRecord membukanya), selalu mutable
+        if isinstance(args, tuple) and all(isinstance(v, _IMMUTABLE_ARGS) for v in args):
+            return record
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_listeners = []
+
+
+def queue_handlers(logger: logging.Logger, *handlers: logging.Handler,
+                   sampler: Optional[SamplingFilter] = None,
+                   filters: Iterable[logging.Filter] = ()) -> logging.handlers.QueueListener:
+    """
+    Pasang `handlers` di belakang QueueHandler: pemanggil hanya memasukkan
+    record ke queue, I/O (stdout/file) dikerjakan thread listener.
+    """
+    q: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    qh = _LazyQueueHandler(q)
+    if sampler:
+        qh.addFilter(sampler)
+    # filter tambahan (mis. trace id) jalan di thread pemanggil, sebelum masuk queue
+    for f in filters:
+        qh.addFilter(f)
+    logger.addHandler(qh)
+    listener = logging.handlers.QueueListener(q, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    return listener
+
+
+def stop_listeners():
+    """Flush & hentikan semua listener (dipanggil otomatis saat exit)."""
+    while _listeners:
+        _listeners.pop().stop()
+
+
+atexit.register(stop_listeners)
+
+
+def setup_logging(level: Optional[str] = None,
+                  as_json: Optional[bool] = None,
+                  sample_rates: Optional[Dict[str, int]] = None,
+                  filters: Iterable[logging.Filter] = ()) -> SamplingFilter:
+    """
+    Konfigurasi root logger. Level dari env LOG_LEVEL (default INFO),
+    format JSON bila LOG_JSON=1.
+    """
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    if as_json is None:
+        as_json = os.getenv("LOG_JSON", "") in ("1", "true", "yes")
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    for h in list(root.handlers):
+        root.removeHandler(h)
+
+    stream = logging.StreamHandler()
+    stream.setFormatter(StructuredFormatter(as_json=as_json))
+    sampler = SamplingFilter(sample_rates)
+    queue_handlers(root, stream, sampler=sampler, filters=filters)
+
+    # httpx (dipakai python-telegram-bot) log setiap getUpdates di level INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    return sampler
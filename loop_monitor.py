@@ -0,0 +1,168 @@
+# loop_monitor.py - Watchdog lag event loop: ukur terus, tangkap stack saat loop terblokir
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class BlockingHandlerError(RuntimeError):
+    """Dilempar `assert_no_blocking()` (test) bila ada handler yang memblokir event loop."""
+
+
+class LoopWatchdog:
+    """
+    Dua bagian:
+    - ticker di event loop: tidur `interval` detik lalu mencatat selisih
+      waktu bangun (lag) ke metrik;
+    - thread pengawas: bila heartbeat ticker tidak maju lebih dari
+      `threshold_ms`, ambil stack thread event loop saat itu juga
+      (sys._current_frames) sehingga baris yang memblokir terlihat,
+      beserta nama handler bot yang ada di stack tersebut.
+
+    Strict mode (`strict_ms`): setiap blokir > strict_ms dicatat sebagai
+    pelanggaran. `exit()` hanya mencatat/log (tidak pernah mengganggu hasil
+    handler di produksi); test memanggil `assert_no_blocking()` saat teardown
+    (fixture `loop_watchdog` di tests/conftest.py) yang melempar
+    BlockingHandlerError.
+    """
+
+    BUCKETS_MS = (5, 20, 50, 100, 250, 500, 1000, 5000)
+
+    def __init__(self, interval: float = 0.1, threshold_ms: float = 250,
+                 strict_ms: Optional[float] = None, report_every: float = 60):
+        self.interval = interval
+        # strict mode butuh stack untuk setiap blokir > strict_ms
+        self.threshold_ms = threshold_ms if strict_ms is None else min(threshold_ms, strict_ms)
+        self.strict_ms = strict_ms
+        self.report_every = report_every
+
+        self.handler_names: Set[str] = set()
+        self.violations: List[Dict] = []
+
+        self._samples = 0
+        self._lag_sum_ms = 0.0
+        self._lag_max_ms = 0.0
+        self._last_lag_ms = 0.0
+        self._stalls = 0
+        self._hist = [0] * (len(self.BUCKETS_MS) + 1)
+
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stall_reported = False
+
+    # -------------------- lifecycle --------------------
+    def start(self):
+        """Panggil dari dalam event loop (mis. post_init Application)."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._ticker(), name="loop-watchdog")
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # -------------------- measuring --------------------
+    async def _ticker(self):
+        last_report = time.monotonic()
+        while True:
+            t0 = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            self._record((now - t0 - self.interval) * 1000)
+            if now - last_report >= self.report_every:
+                last_report = now
+                logger.info("loop lag", extra=self.metrics())
+
+    def _record(self, lag_ms: float):
+        lag_ms = max(0.0, lag_ms)
+        self._samples += 1
+        self._lag_sum_ms += lag_ms
+        self._last_lag_ms = lag_ms
+        if lag_ms > self._lag_max_ms:
+            self._lag_max_ms = lag_ms
+        i = 0
+        while i < len(self.BUCKETS_MS) and lag_ms > self.BUCKETS_MS[i]:
+            i += 1
+        self._hist[i] += 1
+
+    def _watch(self):
+        check = self.interval / 2
+        while not self._stop.wait(check):
+            stalled_ms = (time.monotonic() - self._heartbeat - self.interval) * 1000
+            if stalled_ms < self.threshold_ms:
+                self._stall_reported = False
+                continue
+            if self._stall_reported:
+                continue
+            self._stall_reported = True
+            self._stalls += 1
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            handlers = [fs.name for fs in stack if fs.name in self.handler_names]
+            handler = handlers[-1] if handlers else None
+            logger.warning(
+                "Event loop terblokir %.0f ms di handler %s\n%s", stalled_ms,
+                handler or "?", "".join(traceback.format_list(stack[-8:])))
+            if self.strict_ms is not None and stalled_ms >= self.strict_ms:
+                self.violations.append({
+                    "handler": handler,
+                    "handlers": handlers,
+                    "lag_ms": round(stalled_ms),  # batas bawah, loop masih terblokir
+                    "at": "".join(traceback.format_list(stack[-3:])),
+                })
+
+    # -------------------- handler hooks --------------------
+    def register(self, name: str):
+        self.handler_names.add(name)
+
+    def enter(self) -> int:
+        return len(self.violations)
+
+    def exit(self, marker: int, name: str) -> List[Dict]:
+        """Strict mode: log & return pelanggaran baru yang terjadi di handler `name`."""
+        if self.strict_ms is None:
+            return []
+        found = [v for v in self.violations[marker:] if name in v["handlers"]]
+        for v in found:
+            logger.error("Handler %s memblokir event loop > %.0f ms di:\n%s",
+                         name, self.strict_ms, v["at"])
+        return found
+
+    def assert_no_blocking(self):
+        if self.violations:
+            v = self.violations[0]
+            raise BlockingHandlerError(
+                f"{len(self.violations)} blokir event loop, pertama di handler {v['handler']}:\n{v['at']}")
+
+    # -------------------- metrics --------------------
+    def metrics(self) -> Dict:
+        n = self._samples or 1
+        return {
+            "lag_last_ms": round(self._last_lag_ms, 1),
+            "lag_avg_ms": round(self._lag_sum_ms / n, 1),
+            "lag_max_ms": round(self._lag_max_ms, 1),
+            "stalls": self._stalls,
+            "lag_hist": dict(zip([f"le_{b}" for b in self.BUCKETS_MS] + ["gt"], self._hist)),
+        }
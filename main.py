@@ -1,7 +1,17 @@
+import time
+
+# waktu import modul (dipantau terhadap BotConfig.STARTUP_IMPORT_BUDGET_MS)
+_IMPORT_T0 = time.perf_counter()
+
 import os
+import sys
+import json
+import signal
+import asyncio
 import logging
+import functools
 from datetime import datetime
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, Optional
 
 from telegram import (
     Update,
@@ -10,27 +20,51 @@ from telegram import (
 )
 from telegram.ext import (
     Application,
+    ApplicationHandlerStop,
     CommandHandler,
     MessageHandler,
     CallbackQueryHandler,
     ContextTypes,
+    TypeHandler,
     filters,
 )
 
 # Import dari modul lokal
-# get_profile, get_balance, get_new_token, get_otp, submit_otp, get_package, purchase_package, send_api_request, validate_contact
-from api_request import *
-from paket_xut import get_package_xut
-from util import verify_api_key
+from api_request import (
+    MyXLClient,
+    get_otp,
+    submit_otp,
+    validate_contact,
+)
+from paket_xut import catalog, get_xut_entries
+from catalog import keyboard_rows
+from quota_alerts import QuotaAlertPoller
+from state import UserSession, BoundedStore, memory_report
+from bot_config import BotConfig
+from inflight import SingleFlight
+from util import verify_api_key_cached
+from log_setup import setup_logging, queue_handlers, stop_listeners
+from activity_store import ActivityStore, ActivityHandler, parse_filters
+from loop_monitor import LoopWatchdog
+from drain import GracefulDrain
+from progress import ProgressStream
+from admission import AdmissionControl
+import tracing
+import transport
 from dotenv import load_dotenv
 
+# modul yang jarang dipakai / baru dibutuhkan saat bot dibangun diimpor saat pertama
+# dipakai (pager, quota_view, tg_request, sampler, cassette), bukan saat `import main`
+if TYPE_CHECKING:
+    from pager import PageSet
+
 # ------------------------------------------------------------
 # Logging Utama (error/debugging)
 # ------------------------------------------------------------
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO,
-)
+# stdout lewat queue (non-blocking); event per-call API di-sampling
+setup_logging(sample_rates={"api %s -> %s": BotConfig.LOG_API_SAMPLE_RATE},
+              filters=[tracing.TraceIdFilter()])
+tracing.configure(size=BotConfig.TRACE_BUFFER_SIZE, slow_ms=BotConfig.TRACE_SLOW_MS)
 logger = logging.getLogger(__name__)
 
 # ------------------------------------------------------------
@@ -39,27 +73,41 @@ logger = logging.getLogger(__name__)
 activity_logger = logging.getLogger("activity")
 activity_logger.setLevel(logging.INFO)
 
-fh = logging.FileHandler("activity.log", encoding="utf-8")
-formatter = logging.Formatter("%(asctime)s - %(message)s")
-fh.setFormatter(formatter)
-activity_logger.addHandler(fh)
+# JSONL terstruktur + index (lihat activity_store.py), ditulis di thread listener
+activity_store = ActivityStore(BotConfig.ACTIVITY_DIR,
+                               max_bytes=BotConfig.ACTIVITY_MAX_BYTES,
+                               compress=BotConfig.ACTIVITY_COMPRESS)
+queue_handlers(activity_logger, ActivityHandler(activity_store))
+
+# ------------------------------------------------------------
+# Watchdog event loop (lag + stack handler yang memblokir)
+# ------------------------------------------------------------
+loop_watchdog = LoopWatchdog(threshold_ms=BotConfig.LOOP_LAG_THRESHOLD_MS,
+                             strict_ms=BotConfig.LOOP_STRICT_MS)
 
 ADMIN_ID = os.getenv("ADMIN_TELEGRAM_ID")  # isi di .env
 bot_notifier = None  # akan diisi setelah bot jalan
 
 
-async def log_activity(user, action: str):
-    """Log aktivitas ke file + kirim ke admin telegram"""
+async def log_activity(user, action: str, event: str = "info", **fields):
+    """
+    Log aktivitas ke JSONL terindeks + kirim ke admin telegram.
+    `event` = jenis aktivitas (login_ok, purchase_ok, ...), `fields` = data
+    yang bisa dicari (msisdn, price, ...).
+    """
     tg_user = f"{user.full_name} (id={user.id}, username=@{user.username})"
     msg = f"[{action}] {tg_user}"
 
-    # tulis ke file
-    activity_logger.info(msg)
+    # tulis ke log aktivitas
+    activity_logger.info(msg, extra={"event": {
+        "action": event, "tg_id": user.id, "username": user.username,
+        "name": user.full_name, "text": action, **fields}})
 
     # kirim ke admin telegram (jika bot sudah siap)
     if bot_notifier and ADMIN_ID:
         try:
-            await bot_notifier.send_message(chat_id=ADMIN_ID, text=msg)
+            with tracing.span("telegram.notify_admin"):
+                await bot_notifier.send_message(chat_id=ADMIN_ID, text=msg)
         except Exception as e:
             activity_logger.error(f"Gagal kirim log ke admin: {e}")
 
@@ -67,7 +115,35 @@ async def log_activity(user, action: str):
 # ------------------------------------------------------------
 # Global session (untuk demo; production sebaiknya pakai DB)
 # ------------------------------------------------------------
-user_sessions: Dict[int, Dict[str, Any]] = {}
+def _session_expired(session: UserSession, idle: float) -> bool:
+    """Aturan sweep sesi: reset alur login yang ditinggal, buang sesi yang lama tidak dipakai."""
+    if session.waiting_for and idle > BotConfig.OTP_FLOW_TTL:
+        session.waiting_for = None
+        session.pending_phone = None
+        session.state = "idle"
+    if session.is_logged_in or session.accounts:
+        return idle > BotConfig.SESSION_IDLE_TTL
+    return idle > BotConfig.SESSION_TIMEOUT
+
+
+user_sessions = BoundedStore("user_sessions", BotConfig.MAX_USER_SESSIONS,
+                             expire=_session_expired)
+
+# label tahap progress.emit() di rantai upstream
+PROGRESS_LABELS = {
+    "token": "Memperbarui token",
+    "catalog": "Mengambil katalog paket",
+    "detail": "Mengambil detail paket",
+    "payment": "Memulai pembayaran",
+    "settlement": "Menunggu settlement",
+}
+
+# jalur cepat admission control: tidak menyentuh MyXL, tidak pernah antre slot upstream.
+# Hanya yang tidak mengubah sesi: jalur cepat melewati lock per user, jadi tombol seperti
+# relogin/add_account/cancel tetap lewat jalur upstream supaya tidak balapan dengan
+# handler OTP/beli/refresh token user yang sama.
+FAST_COMMANDS = {"start", "help", "mem", "pool", "traces", "profile", "activity"}
+FAST_CALLBACKS = {"noop", "menu_help"}
 
 
 # ------------------------------------------------------------
@@ -76,19 +152,79 @@ user_sessions: Dict[int, Dict[str, Any]] = {}
 class MyXLTelegramBot:
 
     def __init__(self, bot_token: str, api_key: str):
+        from pager import Pager
+        from quota_view import QuotaViews
+        from tg_request import TunedRequest
+
         self.bot_token = bot_token
         self.api_key = api_key
-        self.application = Application.builder().token(bot_token).build()
+        # pool terpisah: long-poll getUpdates tidak pernah mengantrekan pesan keluar
+        self.send_request = TunedRequest(
+            "send", BotConfig.TG_POOL_SIZE, keepalive_expiry=BotConfig.TG_KEEPALIVE_EXPIRY,
+            connect_timeout=BotConfig.TG_CONNECT_TIMEOUT, read_timeout=BotConfig.TG_READ_TIMEOUT,
+            write_timeout=BotConfig.TG_WRITE_TIMEOUT, pool_timeout=BotConfig.TG_POOL_TIMEOUT,
+            http_version=BotConfig.TG_HTTP_VERSION)
+        self.updates_request = TunedRequest(
+            "updates", 1, keepalive_expiry=BotConfig.TG_KEEPALIVE_EXPIRY,
+            connect_timeout=BotConfig.TG_CONNECT_TIMEOUT, read_timeout=BotConfig.TG_READ_TIMEOUT,
+            pool_timeout=BotConfig.TG_POOL_TIMEOUT, http_version=BotConfig.TG_HTTP_VERSION)
+        # update diproses bersamaan: perintah murah tidak antre di belakang request MyXL
+        self.admission = AdmissionControl(
+            self._is_fast_update, self._reply_busy, slots=BotConfig.UPSTREAM_SLOTS,
+            max_wait=BotConfig.ADMISSION_MAX_WAIT,
+            initial_service=BotConfig.ADMISSION_INITIAL_SERVICE,
+            max_concurrent_updates=BotConfig.MAX_CONCURRENT_UPDATES)
+        self.application = (Application.builder().token(bot_token)
+                            .request(self.send_request)
+                            .get_updates_request(self.updates_request)
+                            .concurrent_updates(self.admission)
+                            .post_init(self._post_init)
+                            .post_shutdown(self._post_shutdown).build())
 
         # isi bot_notifier global agar bisa dipakai log_activity()
         global bot_notifier
         bot_notifier = self.application.bot
 
-        # mapping callback_data pendek -> package_option_code (UUID)
-        self.package_map: Dict[str, str] = {}
+        # mapping callback_data pendek -> package_option_code (UUID), dibatasi + TTL
+        self.package_map = BoundedStore("package_map", BotConfig.PACKAGE_MAP_MAX,
+                                        ttl=BotConfig.PACKAGE_MAP_TTL)
+
+        # halaman kuota/paket yang sudah dirender, per user (next/prev tanpa fetch ulang)
+        self.pager = Pager(ttl=BotConfig.PAGE_TTL)
+
+        # tampilan kuota per (user, nomor) ber-hash isi; (chat, message) -> (kind, gen, index)
+        # halaman yang sedang tampil, supaya edit dengan isi sama tidak dikirim
+        self.quota_views = QuotaViews(BotConfig.QUOTA_VIEW_MAX, ttl=BotConfig.PAGE_TTL)
+        self.shown_pages = BoundedStore("shown_pages", BotConfig.SHOWN_PAGES_MAX,
+                                        ttl=BotConfig.PAGE_TTL)
+
+        # alert kuota menipis (opt-in lewat /alert), dicek JobQueue di latar belakang
+        self.alert_poller = QuotaAlertPoller(
+            self._fetch_alert_quotas, self._notify_alert,
+            min_interval=BotConfig.QUOTA_ALERT_MIN_INTERVAL,
+            max_interval=BotConfig.QUOTA_ALERT_MAX_INTERVAL,
+            max_concurrency=BotConfig.QUOTA_ALERT_CONCURRENCY)
+
+        # sesi yang dibuang sweep/LRU tidak boleh meninggalkan langganan alert
+        user_sessions.on_evict = lambda uid, _: self.alert_poller.unsubscribe(uid)
+        self._last_memory_report = 0.0
+
+        # profiler on-demand untuk admin (/profile), dibuat saat pertama dipakai
+        self._profiler = None
+
+        # de-duplikasi konfirmasi beli per (user, package_option_code)
+        self.purchase_flight = SingleFlight(
+            result_ttl=BotConfig.PURCHASE_RESULT_TTL)
+
+        # shutdown bertahap + serah terima state ke proses pengganti
+        self.drain = GracefulDrain(BotConfig.STATE_FILE, timeout=BotConfig.DRAIN_TIMEOUT,
+                                   lock_wait=BotConfig.HANDOFF_WAIT)
         self.setup_handlers()
 
     # -------------------- helper --------------------
+    def _is_admin(self, update: Update) -> bool:
+        return bool(ADMIN_ID) and str(update.effective_user.id) == str(ADMIN_ID)
+
     def _prefer_edit(self, update: Update) -> bool:
         """True bila datang dari tombol (CallbackQuery) dan ada message yang bisa diedit."""
         return bool(update.callback_query and update.callback_query.message)
@@ -105,35 +241,41 @@ class MyXLTelegramBot:
         """
         Kirim respons aman: edit pesan jika dari callback, atau reply bila dari command.
         Fallback ke bot.send_message bila objek message tidak tersedia.
+        Return pesan yang dikirim/diedit (None bila gagal).
         """
         if prefer_edit is None:
             prefer_edit = self._prefer_edit(update)
 
+        with tracing.span("telegram.send", edit=bool(prefer_edit)):
+            return await self._send_inner(update, context, text, parse_mode,
+                                          reply_markup, prefer_edit)
+
+    async def _send_inner(self, update: Update,
+                          context: ContextTypes.DEFAULT_TYPE, text: str,
+                          parse_mode: str, reply_markup, prefer_edit: bool):
         try:
             if prefer_edit and update.callback_query and update.callback_query.message:
-                await update.callback_query.message.edit_text(
+                self.shown_pages.pop(self._message_key(update.callback_query.message))
+                return await update.callback_query.message.edit_text(
                     text=text,
                     parse_mode=parse_mode,
                     reply_markup=reply_markup)
-                return
 
             if update.message:
-                await update.message.reply_text(text,
-                                                parse_mode=parse_mode,
-                                                reply_markup=reply_markup)
-                return
+                return await update.message.reply_text(text,
+                                                       parse_mode=parse_mode,
+                                                       reply_markup=reply_markup)
 
             if update.callback_query and update.callback_query.message:
-                await update.callback_query.message.reply_text(
+                return await update.callback_query.message.reply_text(
                     text, parse_mode=parse_mode, reply_markup=reply_markup)
-                return
 
             # Fallback terakhir
             chat_id = update.effective_chat.id if update.effective_chat else update.effective_user.id
-            await context.bot.send_message(chat_id=chat_id,
-                                           text=text,
-                                           parse_mode=parse_mode,
-                                           reply_markup=reply_markup)
+            return await context.bot.send_message(chat_id=chat_id,
+                                                  text=text,
+                                                  parse_mode=parse_mode,
+                                                  reply_markup=reply_markup)
 
         except Exception as e:
             logger.error(f"_send failed: {e}")
@@ -147,24 +289,311 @@ class MyXLTelegramBot:
             except Exception as e2:
                 logger.error(f"_send fallback failed: {e2}")
 
+    @staticmethod
+    def _message_key(message):
+        return (message.chat_id, message.message_id)
+
+    # -------------------- lifecycle --------------------
+    async def _show_page(self, update: Update,
+                         context: ContextTypes.DEFAULT_TYPE,
+                         pageset: "PageSet", index: int, prefer_edit: bool | None = True):
+        """
+        Tampilkan satu halaman dari cache + navigasi ◀️ n/N ▶️ + kembali ke menu.
+        Bila pesan yang akan diedit sudah menampilkan halaman yang sama
+        (kind, gen & index sama = teks & keyboard sama), edit tidak dikirim.
+        """
+        index = max(0, min(index, len(pageset) - 1))
+        shown = (pageset.kind, pageset.gen, index)
+        target = update.callback_query.message if (
+            prefer_edit and update.callback_query) else None
+        if target is not None and self.shown_pages.get(self._message_key(target)) == shown:
+            return target
+
+        page = pageset.pages[index]
+        markup = pageset.keyboards.get(index)
+        if markup is None:
+            keyboard = [[InlineKeyboardButton(label, callback_data=cb)]
+                        for label, cb in page.rows]
+            nav = self.pager.nav_row(pageset, index)
+            if nav:
+                keyboard.append([InlineKeyboardButton(label, callback_data=cb)
+                                 for label, cb in nav])
+            keyboard.append([
+                InlineKeyboardButton("⬅️ Kembali ke Menu", callback_data="menu_back")
+            ])
+            markup = pageset.keyboards[index] = InlineKeyboardMarkup(keyboard)
+        message = await self._send(update,
+                                   context,
+                                   page.text,
+                                   reply_markup=markup,
+                                   prefer_edit=prefer_edit)
+        if hasattr(message, "message_id"):
+            self.shown_pages[self._message_key(message)] = shown
+        return message
+
+    # -------------------- progres operasi panjang --------------------
+    async def _progress(self, update: Update, context: ContextTypes.DEFAULT_TYPE,
+                        header: str) -> ProgressStream:
+        """
+        Kirim pesan progres awal lalu kembalikan stream yang mengeditnya saat
+        rantai upstream memanggil progress.emit() (maks. satu edit per interval).
+        """
+        message = await self._send(update, context, header, prefer_edit=True)
+
+        async def render(text: str):
+            # edit_text bisa mengembalikan True (pesan inline): tidak ada yang diedit
+            if hasattr(message, "edit_text"):
+                with tracing.span("telegram.progress"):
+                    await message.edit_text(text)
+
+        def fmt(stages, counts) -> str:
+            lines = [header, ""]
+            for i, stage in enumerate(stages):
+                label = PROGRESS_LABELS.get(stage, stage)
+                if counts[stage] > 1:
+                    label += f" (x{counts[stage]})"
+                lines.append(f"✅ {label}" if i < len(stages) - 1 else f"⏳ {label}...")
+            return "\n".join(lines)
+
+        return ProgressStream(render, fmt, interval=BotConfig.PROGRESS_EDIT_INTERVAL)
+
+    async def _post_init(self, application: Application):
+        # dijalankan sebelum polling: tunggu proses lama selesai drain, ambil state-nya
+        await asyncio.to_thread(self.drain.acquire)
+        # snapshot katalog dibaca sekali di thread, bukan saat callback pertama
+        await asyncio.to_thread(catalog.warm_start)
+        await self._restore_state(application)
+        self._install_stop_signals()
+        loop_watchdog.start()
+        if application.job_queue is None:
+            logger.warning("JobQueue tidak tersedia (pip install \"python-telegram-bot[job-queue]\"); alert kuota nonaktif")
+        else:
+            application.job_queue.run_repeating(
+                self.alert_poller.tick, interval=BotConfig.QUOTA_ALERT_TICK,
+                first=BotConfig.QUOTA_ALERT_TICK, name="quota-alerts")
+            application.job_queue.run_repeating(
+                self._housekeeping, interval=BotConfig.STATE_SWEEP_INTERVAL,
+                first=BotConfig.STATE_SWEEP_INTERVAL, name="state-sweep")
+
+    async def _post_shutdown(self, application: Application):
+        await loop_watchdog.stop()
+        # berhenti tanpa drain (mis. Ctrl+C di Windows): state tetap disimpan
+        self.drain.finish(self._snapshot_state)
+        stop_listeners()
+        activity_store.close()
+
+    # -------------------- shutdown & serah terima --------------------
+    def _install_stop_signals(self):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._on_stop_signal)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows: Ctrl+C tetap menghentikan bot, tanpa menunggu handler
+
+    def _on_stop_signal(self):
+        if self.drain.draining:
+            # sinyal kedua: berhenti sekarang tanpa menunggu
+            logger.warning("Sinyal stop kedua, berhenti tanpa menunggu handler")
+            self.application.stop_running()
+            return
+        self.application.create_task(
+            self.drain.drain(self.application, self._snapshot_state, self.admission))
+
+    def _snapshot_state(self) -> Dict[str, Any]:
+        # alur OTP yang belum selesai tidak ikut: user cukup /login ulang
+        sessions = {str(uid): s.to_dict() for uid, s in user_sessions.items()
+                    if s.is_logged_in or s.accounts}
+        for data in sessions.values():
+            data.update(state="idle", waiting_for=None, pending_phone=None)
+        alerts = [[s.user_id, s.chat_id, s.threshold]
+                  for s in self.alert_poller.subscriptions.values()]
+        return {"sessions": sessions, "alerts": alerts}
+
+    async def _restore_state(self, application: Application):
+        state = self.drain.load()
+        if not state:
+            return
+        for uid, data in (state.get("sessions") or {}).items():
+            user_sessions[int(uid)] = UserSession.from_dict(data)
+        alerts = 0
+        for user_id, chat_id, threshold in state.get("alerts") or []:
+            if user_id in user_sessions:
+                self.alert_poller.subscribe(user_id, chat_id, threshold)
+                alerts += 1
+        # update yang diambil proses lama tapi belum sempat diproses
+        updates = state.get("updates") or []
+        for data in updates:
+            await application.update_queue.put(Update.de_json(data, application.bot))
+        if updates:
+            # titipan hanya diambil sekali: crash sesudah ini tidak memproses ulang
+            await asyncio.to_thread(self.drain.save, {**state, "updates": []})
+        logger.info("State dipulihkan: %d sesi, %d alert, %d update titipan (watermark %s)",
+                    len(state.get("sessions") or {}), alerts,
+                    len(updates), self.drain.resume_after)
+
+    # -------------------- admission control --------------------
+    def _is_fast_update(self, update: object) -> bool:
+        """Jalur cepat: perintah/tombol yang dijawab tanpa request ke MyXL."""
+        if not isinstance(update, Update):
+            return True
+        query = update.callback_query
+        if query is not None:
+            data = query.data or ""
+            if data in FAST_CALLBACKS:
+                return True
+            if data.startswith(self.pager.PREFIX):
+                cursor = self.pager.parse(data)
+                return bool(cursor and self.pager.get(query.from_user.id, cursor[0], cursor[1]))
+            return False
+        message = update.message
+        if message is None:
+            return True
+        text = message.text or ""
+        if not text.startswith("/"):
+            return False
+        command = text.split(maxsplit=1)[0][1:].split("@", 1)[0].lower()
+        return command in FAST_COMMANDS
+
+    async def _reply_busy(self, update: object, estimate: float):
+        text = (f"⏳ Bot sedang sibuk (perkiraan antre ±{estimate:.0f} detik), "
+                "coba lagi sebentar lagi.")
+        if not isinstance(update, Update):
+            return
+        if update.callback_query is not None:
+            await update.callback_query.answer(text, show_alert=True)
+        elif update.message is not None:
+            await update.message.reply_text(text)
+
+    async def _skip_handled(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Grup -1: buang update yang sudah ditangani proses sebelumnya."""
+        if self.drain.seen(update.update_id):
+            raise ApplicationHandlerStop
+
+    # -------------------- state & memori --------------------
+    def _memory_structures(self) -> Dict[str, Any]:
+        return {
+            "user_sessions": user_sessions,
+            "package_map": self.package_map,
+            "pages": self.pager,
+            "quota_views": self.quota_views.store,
+            "shown_pages": self.shown_pages,
+            "purchase_flight": self.purchase_flight,
+            "alert_subscriptions": self.alert_poller.subscriptions,
+            "catalog_index": catalog.index,
+            "traces": tracing.buffer.recent,
+            # trace lambat juga ada di `recent` selama belum tergeser: ukurannya bisa tumpang tindih
+            "slow_traces": tracing.buffer.slow,
+        }
+
+    async def _housekeeping(self, context=None):
+        """JobQueue: sweep TTL semua state; log metrik memori tiap MEMORY_REPORT_EVERY detik."""
+        removed = {
+            "user_sessions": user_sessions.sweep(),
+            "package_map": self.package_map.sweep(),
+            "quota_views": self.quota_views.sweep(),
+            "shown_pages": self.shown_pages.sweep(),
+        }
+        self.pager.sweep()
+        if any(removed.values()):
+            logger.debug("state sweep", extra={"removed": removed})
+
+        # checkpoint state (sesi + watermark) untuk restart yang tidak sempat drain
+        if not self.drain.draining:
+            await asyncio.to_thread(self.drain.save, self._snapshot_state())
+
+        now = time.monotonic()
+        if now - self._last_memory_report >= BotConfig.MEMORY_REPORT_EVERY:
+            self._last_memory_report = now
+            logger.info("memory", extra=memory_report(self._memory_structures()))
+            for request in (self.send_request, self.updates_request):
+                logger.info("telegram pool %s", request.stats.name, extra=request.stats.snapshot())
+            logger.info("admission", extra=self.admission.snapshot())
+
+    # -------------------- alert kuota --------------------
+    async def _fetch_alert_quotas(self, user_id: int):
+        """
+        Quota-details untuk poller; token baru hanya diminta bila token lama
+        ditolak. Berjalan di bawah lock per user admission, sehingga refresh
+        token tidak balapan dengan handler user yang sama.
+        """
+        async with self.admission.user_lock(user_id):
+            return await self._alert_quotas_locked(user_id)
+
+    async def _alert_quotas_locked(self, user_id: int):
+        session = user_sessions.get(user_id)
+        if not session or not session.get("is_logged_in") or not session.get("tokens"):
+            return None
+        with tracing.start_trace("quota_alert", user=user_id):
+            client = self._client(session)
+            quotas = await asyncio.to_thread(client.get_quota_details)
+            if quotas is None:
+                client = await self._refresh(session)
+                quotas = await asyncio.to_thread(client.get_quota_details)
+        return quotas
+
+    async def _notify_alert(self, chat_id: int, text: str):
+        with tracing.span("telegram.alert"):
+            await self.application.bot.send_message(chat_id=chat_id, text=text)
+
     # -------------------- handlers setup --------------------
+    def _wrap(self, handler):
+        """
+        Bungkus handler: satu trace per update (trace id ikut ke semua hop
+        encrypt → MyXL → decrypt → Telegram), dan daftarkan ke watchdog
+        (di strict mode gagal bila handler memblokir loop).
+        """
+        name = handler.__name__
+        loop_watchdog.register(name)
+
+        @functools.wraps(handler)
+        async def wrapped(update: Update, context: ContextTypes.DEFAULT_TYPE):
+            marker = loop_watchdog.enter()
+            self.drain.enter()
+            user = update.effective_user
+            with tracing.start_trace(name, user=user.id if user else None,
+                                     update_id=update.update_id):
+                try:
+                    return await handler(update, context)
+                finally:
+                    self.drain.exit()
+                    loop_watchdog.exit(marker, name)
+
+        return wrapped
+
     def setup_handlers(self):
+        # handler yang juga dipanggil dari handler lain (button_callback, handle_message)
+        for fn in (self.handle_package_purchase, self.process_package_purchase,
+                   self.handle_phone_number, self.handle_otp):
+            loop_watchdog.register(fn.__name__)
+
+        self.application.add_handler(TypeHandler(Update, self._skip_handled), group=-1)
+        self.application.add_handler(
+            CommandHandler("start", self._wrap(self.start_command)))
+        self.application.add_handler(CommandHandler("help", self._wrap(self.help_command)))
         self.application.add_handler(
-            CommandHandler("start", self.start_command))
-        self.application.add_handler(CommandHandler("help", self.help_command))
+            CommandHandler("login", self._wrap(self.login_command)))
         self.application.add_handler(
-            CommandHandler("login", self.login_command))
+            CommandHandler("kuota", self._wrap(self.kuota_command)))
         self.application.add_handler(
-            CommandHandler("kuota", self.kuota_command))
+            CommandHandler("packages", self._wrap(self.packages_command)))
+        self.application.add_handler(CommandHandler("menu", self._wrap(self.menu_command)))
+        self.application.add_handler(CommandHandler("cari", self._wrap(self.search_command)))
+        self.application.add_handler(CommandHandler("alert", self._wrap(self.alert_command)))
+        self.application.add_handler(CommandHandler("akun", self._wrap(self.accounts_command)))
         self.application.add_handler(
-            CommandHandler("packages", self.packages_command))
-        self.application.add_handler(CommandHandler("menu", self.menu_command))
+            CommandHandler("dashboard", self._wrap(self.dashboard_command)))
+        self.application.add_handler(CommandHandler("profile", self._wrap(self.profile_command)))
+        self.application.add_handler(CommandHandler("traces", self._wrap(self.traces_command)))
+        self.application.add_handler(CommandHandler("activity", self._wrap(self.activity_command)))
+        self.application.add_handler(CommandHandler("mem", self._wrap(self.mem_command)))
+        self.application.add_handler(CommandHandler("pool", self._wrap(self.pool_command)))
 
         self.application.add_handler(CallbackQueryHandler(
-            self.button_callback))
+            self._wrap(self.button_callback)))
         self.application.add_handler(
             MessageHandler(filters.TEXT & ~filters.COMMAND,
-                           self.handle_message))
+                           self._wrap(self.handle_message)))
 
         # Error handler global
         self.application.add_error_handler(self.error_handler)
@@ -179,13 +608,14 @@ class MyXLTelegramBot:
                             context: ContextTypes.DEFAULT_TYPE):
         user_id = update.effective_user.id
         if user_id not in user_sessions:
-            user_sessions[user_id] = {
-                "state": "idle",
-                "is_logged_in": False,
-                "phone_number": None,
-                "tokens": None,
-                "waiting_for": None,
-            }
+            user_sessions[user_id] = UserSession(
+                state="idle",
+                is_logged_in=False,
+                phone_number=None,
+                tokens=None,
+                waiting_for=None,
+                accounts={},
+            )
 
         welcome_text = ("🤖 **Selamat datang di DoyStore DorXL Bot!**\n\n"
                         "Fitur:\n"
@@ -204,7 +634,10 @@ class MyXLTelegramBot:
         help_text = ("🔧 **Bantuan Bot**\n\n"
                      "1) /login kemudian masukkan nomor XL\n"
                      "2) Masukkan OTP dari SMS\n"
-                     "3) Setelah login, gunakan /menu untuk akses fitur\n\n"
+                     "3) Setelah login, gunakan /menu untuk akses fitur\n"
+                     "4) /cari <kata kunci> untuk mencari paket\n"
+                     "5) /alert on [persen] untuk notifikasi kuota menipis\n"
+                     "6) /akun untuk tambah/ganti nomor, /dashboard untuk semua nomor\n\n"
                      "👉 Gunakan tombol untuk navigasi.")
         keyboard = [[
             InlineKeyboardButton("⬅️ Kembali ke Menu",
@@ -219,16 +652,21 @@ class MyXLTelegramBot:
                             context: ContextTypes.DEFAULT_TYPE):
         user_id = update.effective_user.id
         if user_id not in user_sessions:
-            user_sessions[user_id] = {
-                "state": "idle",
-                "is_logged_in": False,
-                "phone_number": None,
-                "tokens": None,
-                "waiting_for": None,
-            }
+            user_sessions[user_id] = UserSession(
+                state="idle",
+                is_logged_in=False,
+                phone_number=None,
+                tokens=None,
+                waiting_for=None,
+                accounts={},
+            )
 
         if user_sessions[user_id]["is_logged_in"]:
             keyboard = [
+                [
+                    InlineKeyboardButton("➕ Tambah Akun",
+                                         callback_data="add_account")
+                ],
                 [
                     InlineKeyboardButton("🔄 Login Ulang",
                                          callback_data="relogin")
@@ -261,17 +699,18 @@ class MyXLTelegramBot:
             return
 
         session = user_sessions[user_id]
-        tokens = session.get("tokens")
         try:
-            profile = get_profile(self.api_key, tokens["access_token"],
-                                  tokens["id_token"])
-            balance = get_balance(self.api_key, tokens["id_token"])
+            client = self._client(session)
+            profile, balance = await asyncio.gather(
+                asyncio.to_thread(client.get_profile),
+                asyncio.to_thread(client.get_balance),
+            )
 
             if profile and balance:
-                phone_number = profile["profile"]["msisdn"]
-                balance_remaining = balance["remaining"]
+                phone_number = profile.msisdn
+                balance_remaining = balance.remaining
                 balance_expired = datetime.fromtimestamp(
-                    balance["expired_at"]).strftime("%Y-%m-%d %H:%M:%S")
+                    balance.expired_at).strftime("%Y-%m-%d %H:%M:%S")
 
                 account_text = ("🏠 **Menu Utama**\n\n"
                                 "💰 **Informasi Akun**\n"
@@ -289,6 +728,10 @@ class MyXLTelegramBot:
                         InlineKeyboardButton("📦 Lihat Paket",
                                              callback_data="menu_packages")
                     ],
+                    [
+                        InlineKeyboardButton("👥 Akun & Dashboard",
+                                             callback_data="menu_accounts")
+                    ],
                     [
                         InlineKeyboardButton("ℹ️ Bantuan",
                                              callback_data="menu_help")
@@ -321,63 +764,63 @@ class MyXLTelegramBot:
                              "❌ Anda belum login!\nSilakan /login")
             return
 
-        # progress
-        await self._send(update,
-                         context,
-                         "⏳ Mengambil data kuota...",
-                         prefer_edit=True)
+        # tombol 🔄 di tampilan kuota: data lama tetap tampil selama fetch
+        query = update.callback_query
+        shown = self.shown_pages.get(self._message_key(query.message)) if (
+            query and query.message) else None
+        if not shown or shown[0] != "q":
+            await self._send(update,
+                             context,
+                             "⏳ Mengambil data kuota...",
+                             prefer_edit=True)
 
         try:
             session = user_sessions[user_id]
-            tokens = get_new_token(session["tokens"]["refresh_token"]
-                                   ) if session.get("tokens") else None
-            if tokens:
-                session["tokens"] = tokens
-            else:
+            client = await self._refresh(session) if session.get("tokens") else None
+            if not client:
                 await self._send(update,
                                  context,
                                  "❌ Sesi kadaluarsa. Silakan /login ulang.",
                                  prefer_edit=True)
                 return
 
-            path = "api/v8/packages/quota-details"
-            payload = {
-                "is_enterprise": False,
-                "lang": "en",
-                "family_member_id": ""
-            }
-            res = send_api_request(self.api_key, path, payload,
-                                   tokens["id_token"], "POST")
-
-            if res.get("status") != "SUCCESS":
+            quotas = await asyncio.to_thread(client.get_quota_details)
+            if quotas is None:
                 await self._send(update,
                                  context,
                                  "❌ Gagal mengambil kuota.",
                                  prefer_edit=True)
                 return
 
-            quotas = res["data"]["quotas"]
             if not quotas:
-                text = "ℹ️ Tidak ada kuota aktif."
-            else:
-                text_lines = ["📊 **Kuota Aktif:**\n"]
-                for idx, quota in enumerate(quotas, start=1):
-                    name = quota.get("name", "N/A")
-                    remaining = quota.get("remaining", "-")
-                    total = quota.get("total", "-")
-                    text_lines.append(
-                        f"{idx}. {name}\n   ➡️ {remaining} / {total}")
-                text = "\n".join(text_lines)
+                keyboard = [[
+                    InlineKeyboardButton("⬅️ Kembali ke Menu",
+                                         callback_data="menu_back")
+                ]]
+                await self._send(update,
+                                 context,
+                                 "ℹ️ Tidak ada kuota aktif.",
+                                 reply_markup=InlineKeyboardMarkup(keyboard),
+                                 prefer_edit=True)
+                return
 
-            keyboard = [[
-                InlineKeyboardButton("⬅️ Kembali ke Menu",
-                                     callback_data="menu_back")
-            ]]
-            await self._send(update,
-                             context,
-                             text,
-                             reply_markup=InlineKeyboardMarkup(keyboard),
-                             prefer_edit=True)
+            # isi sama dengan fetch sebelumnya untuk nomor ini -> PageSet lama
+            # (teks & keyboard sudah jadi); pesan yang sudah menampilkannya tidak diedit
+            from quota_view import digest, normalize, render_pages
+            records = normalize(quotas)
+            content = digest(records)
+            msisdn = session.get("phone_number", "")
+            pageset = self.quota_views.lookup(user_id, msisdn, content)
+            if pageset is not None:
+                self.pager.keep(user_id, pageset)
+            else:
+                # render semua halaman sekali; ◀️/▶️ dilayani dari cache
+                pageset = self.pager.put(
+                    user_id, "q",
+                    render_pages(records, BotConfig.QUOTA_PAGE_SIZE))
+                self.quota_views.remember(user_id, msisdn, content, pageset)
+            index = shown[2] if shown and shown[:2] == ("q", pageset.gen) else 0
+            await self._show_page(update, context, pageset, index)
 
         except Exception as e:
             logger.error(f"Error getting quota: {e}")
@@ -395,26 +838,23 @@ class MyXLTelegramBot:
                              "❌ Anda belum login!\nSilakan /login")
             return
 
-        # progress
-        await self._send(update,
-                         context,
-                         "⏳ Mengambil data paket...",
-                         prefer_edit=True)
+        # progress (token → katalog) ditampilkan live lewat edit berkala
+        stream = await self._progress(update, context, "⏳ Mengambil data paket...")
 
         try:
             session = user_sessions[user_id]
-            new_tokens = get_new_token(session["tokens"]["refresh_token"]
-                                       ) if session.get("tokens") else None
-            if new_tokens:
-                session["tokens"] = new_tokens
-            else:
+            async with stream:
+                client = await self._refresh(session) if session.get("tokens") else None
+                if client:
+                    packages = await asyncio.to_thread(get_xut_entries, self.api_key,
+                                                       client.tokens)
+            if not client:
                 await self._send(update,
                                  context,
                                  "❌ Sesi kadaluarsa. Silakan /login ulang.",
                                  prefer_edit=True)
                 return
 
-            packages = get_package_xut(self.api_key, session["tokens"])
             if not packages:
                 await self._send(update,
                                  context,
@@ -422,28 +862,13 @@ class MyXLTelegramBot:
                                  prefer_edit=True)
                 return
 
-            # reset mapping setiap buka menu packages
-            self.package_map.clear()
-
-            keyboard = []
-            for idx, pkg in enumerate(packages, start=1):
-                short_code = f"pkg{idx}"
-                self.package_map[short_code] = pkg['code']  # simpan UUID asli
-                label = f"📦 {pkg['name']} - Rp {pkg['price']:,}"
-                keyboard.append(
-                    [InlineKeyboardButton(label, callback_data=short_code)])
-
-            keyboard.append([
-                InlineKeyboardButton("⬅️ Kembali ke Menu",
-                                     callback_data="menu_back")
-            ])
-            await self._send(
-                update,
-                context,
-                "📦 **Paket Tersedia:**\n\nPilih paket:",
-                reply_markup=InlineKeyboardMarkup(keyboard),
-                prefer_edit=True,
-            )
+            # keyboard langsung dari index katalog (callback pkg<eid>), per halaman
+            from pager import paginate_rows
+            pageset = self.pager.put(
+                user_id, "p",
+                paginate_rows("📦 **Paket Tersedia:**\n\nPilih paket:",
+                              keyboard_rows(packages), BotConfig.PACKAGE_PAGE_SIZE))
+            await self._show_page(update, context, pageset, 0)
         except Exception as e:
             logger.error(f"Error getting packages: {e}")
             await self._send(update,
@@ -451,6 +876,387 @@ class MyXLTelegramBot:
                              "❌ Terjadi kesalahan saat mengambil data paket",
                              prefer_edit=True)
 
+    async def search_command(self, update: Update,
+                             context: ContextTypes.DEFAULT_TYPE):
+        """/cari <kata kunci> — cari paket di katalog (semua family yang dikonfigurasi)."""
+        user_id = update.effective_user.id
+        if user_id not in user_sessions or not user_sessions[user_id][
+                "is_logged_in"]:
+            await self._send(update, context,
+                             "❌ Anda belum login!\nSilakan /login")
+            return
+
+        query = " ".join(context.args or []).strip()
+        if not query:
+            await self._send(update, context,
+                             "🔎 Format: /cari <kata kunci>\nContoh: /cari unli turbo")
+            return
+
+        try:
+            session = user_sessions[user_id]
+            await asyncio.to_thread(catalog.ensure_loaded, self.api_key,
+                                    session["tokens"])
+            results = catalog.search(query)
+            if not results:
+                await self._send(update, context,
+                                 f"❌ Tidak ada paket yang cocok dengan \"{query}\"")
+                return
+
+            from pager import paginate_rows
+            pageset = self.pager.put(
+                user_id, "s",
+                paginate_rows(f"🔎 **Hasil pencarian:** {query}\n\nPilih paket:",
+                              keyboard_rows(results), BotConfig.PACKAGE_PAGE_SIZE))
+            await self._show_page(update, context, pageset, 0, prefer_edit=None)
+        except Exception as e:
+            logger.error(f"Error searching packages: {e}")
+            await self._send(update, context,
+                             "❌ Terjadi kesalahan saat mencari paket")
+
+    async def alert_command(self, update: Update,
+                            context: ContextTypes.DEFAULT_TYPE):
+        """/alert on [persen] | off — notifikasi saat sisa kuota turun di bawah batas."""
+        user_id = update.effective_user.id
+        if user_id not in user_sessions or not user_sessions[user_id][
+                "is_logged_in"]:
+            await self._send(update, context,
+                             "❌ Anda belum login!\nSilakan /login")
+            return
+
+        args = [a.lower() for a in (context.args or [])]
+        if args and args[0] == "off":
+            self.alert_poller.unsubscribe(user_id)
+            await self._send(update, context, "🔕 Alert kuota dimatikan.")
+            return
+
+        if args and args[0] == "on":
+            threshold = BotConfig.QUOTA_ALERT_THRESHOLD
+            if len(args) > 1:
+                try:
+                    threshold = float(args[1].rstrip("%"))
+                except ValueError:
+                    threshold = -1
+                if not 0 < threshold < 100:
+                    await self._send(update, context,
+                                     "❌ Persen harus antara 1 dan 99.\nContoh: /alert on 20")
+                    return
+            self.alert_poller.subscribe(user_id, update.effective_chat.id, threshold)
+            await self._send(update, context,
+                             f"🔔 Alert kuota aktif: notifikasi saat sisa kuota ≤ {threshold:g}%.")
+            return
+
+        sub = self.alert_poller.get(user_id)
+        status = (f"aktif (≤ {sub.threshold:g}%)" if sub else "nonaktif")
+        await self._send(update, context,
+                         f"🔔 Alert kuota: {status}\n\n"
+                         "/alert on [persen] — aktifkan\n/alert off — matikan")
+
+    # -------------------- multi akun --------------------
+    def _client(self, session: UserSession, msisdn: Optional[str] = None) -> MyXLClient:
+        """
+        MyXLClient milik satu nomor tertaut (default: nomor aktif), dipakai ulang
+        antar handler. Dibuat ulang bila token nomor itu diganti di luar client
+        (login ulang, ganti akun, restart).
+        """
+        msisdn = msisdn or session.get("phone_number")
+        if msisdn == session.get("phone_number"):
+            tokens = session["tokens"]
+        else:
+            tokens = session["accounts"][msisdn]["tokens"]
+        client = session.clients.get(msisdn)
+        if client is None or client.tokens is not tokens:
+            client = session.clients[msisdn] = MyXLClient(self.api_key, tokens)
+        return client
+
+    @staticmethod
+    def _store_tokens(session: UserSession, msisdn: str, tokens: dict):
+        # token hasil refresh hanya disimpan di session (ikut snapshot state)
+        if msisdn == session.get("phone_number"):
+            session["tokens"] = tokens
+        account = session.get("accounts", {}).get(msisdn)
+        if account is not None:
+            account["tokens"] = tokens
+
+    def _refresh_blocking(self, session: UserSession,
+                          msisdn: Optional[str] = None) -> MyXLClient:
+        """Refresh token nomor itu lewat client-nya (blocking, untuk thread worker)."""
+        msisdn = msisdn or session.get("phone_number")
+        client = self._client(session, msisdn)
+        self._store_tokens(session, msisdn, client.refresh_tokens())
+        return client
+
+    async def _refresh(self, session: UserSession,
+                       msisdn: Optional[str] = None) -> MyXLClient:
+        msisdn = msisdn or session.get("phone_number")
+        client = self._client(session, msisdn)
+        tokens = await asyncio.to_thread(client.refresh_tokens)
+        self._store_tokens(session, msisdn, tokens)
+        return client
+
+    @staticmethod
+    def _switch_account(session: Dict[str, Any], msisdn: str):
+        """Jadikan `msisdn` nomor aktif; token nomor lama disimpan kembali ke `accounts`."""
+        accounts = session.setdefault("accounts", {})
+        current = session.get("phone_number")
+        if current in accounts and session.get("tokens"):
+            accounts[current]["tokens"] = session["tokens"]
+        session["phone_number"] = msisdn
+        session["tokens"] = accounts[msisdn]["tokens"]
+        session["is_logged_in"] = True
+
+    async def accounts_command(self, update: Update,
+                               context: ContextTypes.DEFAULT_TYPE):
+        """/akun — daftar nomor tertaut: ganti nomor aktif, tambah nomor, dashboard."""
+        user_id = update.effective_user.id
+        session = user_sessions.get(user_id)
+        if not session or not session.get("accounts"):
+            await self._send(update, context,
+                             "❌ Anda belum login!\nSilakan /login")
+            return
+
+        active = session.get("phone_number")
+        keyboard = [[InlineKeyboardButton(
+            f"{'✅' if msisdn == active else '📱'} {msisdn}",
+            callback_data=f"acct:{msisdn}")] for msisdn in session["accounts"]]
+        if len(session["accounts"]) < BotConfig.MAX_SESSIONS_PER_USER:
+            keyboard.append([InlineKeyboardButton("➕ Tambah Akun",
+                                                  callback_data="add_account")])
+        keyboard.append([InlineKeyboardButton("📊 Dashboard Semua Akun",
+                                              callback_data="menu_dashboard")])
+        keyboard.append([InlineKeyboardButton("⬅️ Kembali ke Menu",
+                                              callback_data="menu_back")])
+        await self._send(update,
+                         context,
+                         f"👥 **Akun Tertaut** ({len(session['accounts'])}/{BotConfig.MAX_SESSIONS_PER_USER})\n\n"
+                         f"Nomor aktif: `{active}`\nPilih nomor untuk dijadikan aktif:",
+                         reply_markup=InlineKeyboardMarkup(keyboard))
+
+    async def _account_overview(self, session: UserSession, msisdn: str):
+        """Saldo + kuota satu akun (dua request paralel); token direfresh sekali bila ditolak."""
+        client = self._client(session, msisdn)
+        for attempt in range(2):
+            balance, quotas = await asyncio.gather(
+                asyncio.to_thread(client.get_balance),
+                asyncio.to_thread(client.get_quota_details),
+            )
+            if (balance is not None and quotas is not None) or attempt:
+                return balance, quotas
+            client = await self._refresh(session, msisdn)
+
+    async def dashboard_command(self, update: Update,
+                                context: ContextTypes.DEFAULT_TYPE):
+        """/dashboard — saldo & kuota semua nomor tertaut, diambil bersamaan dengan satu deadline."""
+        user_id = update.effective_user.id
+        session = user_sessions.get(user_id)
+        if not session or not session.get("accounts"):
+            await self._send(update, context,
+                             "❌ Anda belum login!\nSilakan /login")
+            return
+
+        await self._send(update, context, "⏳ Mengambil data semua akun...",
+                         prefer_edit=True)
+
+        # akun aktif memakai token di session (paling baru), sisanya dari `accounts`
+        active = session.get("phone_number")
+        tasks = {msisdn: asyncio.ensure_future(self._account_overview(session, msisdn))
+                 for msisdn in session["accounts"]}
+        done, pending = await asyncio.wait(tasks.values(),
+                                           timeout=BotConfig.DASHBOARD_DEADLINE)
+        for task in pending:
+            task.cancel()
+
+        from quota_view import normalize
+        blocks = []
+        for msisdn, task in tasks.items():
+            title = f"📱 `{msisdn}`{' (aktif)' if msisdn == active else ''}"
+            if task in pending:
+                blocks.append(f"{title}\n   ⌛ Tidak sempat dimuat")
+                continue
+            if task.exception() is not None:
+                logger.error(f"Dashboard {msisdn}: {task.exception()}")
+                blocks.append(f"{title}\n   ❌ Gagal mengambil data")
+                continue
+            balance, quotas = task.result()
+            lines = [title]
+            if balance:
+                expired = datetime.fromtimestamp(balance.expired_at).strftime("%Y-%m-%d")
+                lines.append(f"   💵 Rp {balance.remaining:,} | ⏰ {expired}")
+            else:
+                lines.append("   💵 Saldo tidak tersedia")
+            if quotas:
+                lines.extend(f"   📊 {r.name}: {r.amount}" for r in normalize(quotas))
+            elif quotas is not None:
+                lines.append("   📊 Tidak ada kuota aktif")
+            blocks.append("\n".join(lines))
+
+        from pager import paginate_lines
+        pageset = self.pager.put(
+            user_id, "d",
+            paginate_lines("📊 **Dashboard Semua Akun**\n\n",
+                           [b + "\n" for b in blocks], BotConfig.QUOTA_PAGE_SIZE))
+        await self._show_page(update, context, pageset, 0)
+
+    # -------------------- admin --------------------
+    @property
+    def profiler(self):
+        if self._profiler is None:
+            from sampler import SamplingProfiler
+            self._profiler = SamplingProfiler()
+        return self._profiler
+
+    async def profile_command(self, update: Update,
+                              context: ContextTypes.DEFAULT_TYPE):
+        """
+        /profile [detik] [mem] — khusus admin. Sampling stack semua thread selama
+        N detik lalu kirim file collapsed-stack (+ top alokasi tracemalloc bila `mem`).
+        """
+        if not self._is_admin(update):
+            return
+
+        args = [a.lower() for a in (context.args or [])]
+        seconds = next((int(a) for a in args if a.isdigit()), 10)
+        seconds = max(1, min(seconds, BotConfig.PROFILE_MAX_SECONDS))
+        with_memory = "mem" in args
+
+        if self.profiler.running:
+            await self._send(update, context, "⏳ Profiler masih berjalan.")
+            return
+
+        await self._send(update, context,
+                         f"⏱️ Profiling {seconds} detik{' + tracemalloc' if with_memory else ''}...")
+        try:
+            collapsed, memory, samples = await asyncio.to_thread(
+                self.profiler.run, seconds, with_memory)
+        except Exception as e:
+            logger.error(f"Profiler gagal: {e}")
+            await self._send(update, context, f"❌ Profiler gagal: {e}")
+            return
+
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        chat_id = update.effective_chat.id
+        await context.bot.send_document(
+            chat_id=chat_id,
+            document=collapsed.encode("utf-8"),
+            filename=f"profile-{stamp}.folded",
+            caption=f"🔥 {samples} sampel / {seconds} detik (collapsed stack, buka di speedscope.app)")
+        if memory:
+            await context.bot.send_document(
+                chat_id=chat_id,
+                document=memory.encode("utf-8"),
+                filename=f"tracemalloc-{stamp}.txt",
+                caption="🧠 Top alokasi memori")
+
+    async def traces_command(self, update: Update,
+                             context: ContextTypes.DEFAULT_TYPE):
+        """
+        /traces [all] — khusus admin. Kirim trace lambat (>= TRACE_SLOW_MS), atau
+        semua trace terakhir dengan `all`, sebagai file Chrome/Perfetto trace JSON.
+        """
+        if not self._is_admin(update):
+            return
+
+        show_all = "all" in [a.lower() for a in (context.args or [])]
+        traces = list(tracing.buffer.recent if show_all else tracing.buffer.slow)
+        if not traces:
+            await self._send(update, context, "ℹ️ Belum ada trace yang tercatat.")
+            return
+
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        slowest = max(traces, key=lambda t: t.dur_us)
+        await context.bot.send_document(
+            chat_id=update.effective_chat.id,
+            document=json.dumps(tracing.export_chrome(traces)).encode("utf-8"),
+            filename=f"traces-{stamp}.json",
+            caption=(f"🧵 {len(traces)} trace — terlambat: {slowest.name} "
+                     f"{slowest.dur_ms:.0f} ms (buka di ui.perfetto.dev)"))
+
+    async def mem_command(self, update: Update,
+                          context: ContextTypes.DEFAULT_TYPE):
+        """/mem — khusus admin. Jumlah entry & perkiraan ukuran tiap struktur state + RSS."""
+        if not self._is_admin(update):
+            return
+
+        report = memory_report(self._memory_structures())
+        lines = [f"🧠 RSS: {report.pop('rss_kb'):,} KiB", ""]
+        for name, info in report.items():
+            entries = "-" if info["entries"] is None else f"{info['entries']:,}"
+            lines.append(f"{name}: {entries} entry, ~{info['kb']:,} KiB")
+        lines.append("")
+        lines.append(f"dibuang (sweep/LRU): sesi {user_sessions.evicted}, "
+                     f"package_map {self.package_map.evicted}")
+        await self._send(update, context, "\n".join(lines), parse_mode=None)
+
+    async def pool_command(self, update: Update,
+                           context: ContextTypes.DEFAULT_TYPE):
+        """/pool — khusus admin. Pool koneksi Bot API, waktu antre koneksi & admission control."""
+        if not self._is_admin(update):
+            return
+
+        lines = ["🔌 Pool koneksi Bot API", ""]
+        for request in (self.send_request, self.updates_request):
+            s = request.stats.snapshot()
+            lines.append(f"{request.stats.name}: {s['in_flight']}/{s['pool']} aktif "
+                         f"(puncak {s['peak']}), {s['requests']:,} request, "
+                         f"{s['pool_timeouts']} pool timeout")
+            lines.append(f"  antre p50 {s['wait_p50_ms']} ms, p95 {s['wait_p95_ms']} ms, "
+                         f"p99 {s['wait_p99_ms']} ms, maks {s['wait_max_ms']} ms")
+        lines.append(f"HTTP/{BotConfig.TG_HTTP_VERSION}, keep-alive {BotConfig.TG_KEEPALIVE_EXPIRY}s")
+        a = self.admission.snapshot()
+        lines += ["", f"🚦 Admission: {a['in_flight']}/{a['slots']} slot upstream, "
+                      f"{a['waiting']} antre, {a['fast_in_flight']} jalur cepat",
+                  f"  perkiraan antre {a['est_wait_s']}s (batas {BotConfig.ADMISSION_MAX_WAIT}s), "
+                  f"rata-rata handler {a['avg_service_s']}s, antre maks {a['peak_wait_s']}s",
+                  f"  {a['admitted']:,} upstream, {a['fast']:,} cepat, {a['rejected']:,} ditolak"]
+        await self._send(update, context, "\n".join(lines), parse_mode=None)
+
+    async def activity_command(self, update: Update,
+                               context: ContextTypes.DEFAULT_TYPE):
+        """
+        /activity [id=.. msisdn=.. action=.. days=N limit=N] — khusus admin, cari
+        log aktivitas lewat index. /activity rollup [hari] — rekap pembelian harian.
+        """
+        if not self._is_admin(update):
+            return
+
+        args = list(context.args or [])
+        if args and args[0].lower() == "rollup":
+            days = int(args[1]) if len(args) > 1 and args[1].isdigit() else 7
+            rows = await asyncio.to_thread(activity_store.rollup, days)
+            if not rows:
+                await self._send(update, context, "ℹ️ Belum ada pembelian tercatat.")
+                return
+            lines = [f"{day} {action}: {count}x, Rp {amount:,}"
+                     for day, action, count, amount in rows]
+            await self._send(update, context,
+                             f"📊 Rekap pembelian {days} hari\n\n" + "\n".join(lines),
+                             parse_mode=None)
+            return
+
+        try:
+            filters_ = parse_filters(args)
+        except ValueError as e:
+            await self._send(update, context, f"❌ {e}")
+            return
+        filters_.setdefault("limit", 20)
+        events = await asyncio.to_thread(activity_store.query, **filters_)
+        if not events:
+            await self._send(update, context, "ℹ️ Tidak ada aktivitas yang cocok.")
+            return
+
+        if len(events) <= 20:
+            lines = [f"{e['ts']} [{e.get('action')}] {e.get('text', '')} (id={e.get('tg_id')})"
+                     for e in events]
+            # teks polos: action/username bisa berisi "_" yang merusak Markdown
+            await self._send(update, context, "\n".join(lines), parse_mode=None)
+            return
+
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        await context.bot.send_document(
+            chat_id=update.effective_chat.id,
+            document="\n".join(json.dumps(e, ensure_ascii=False) for e in events).encode("utf-8"),
+            filename=f"activity-{stamp}.jsonl",
+            caption=f"🗂 {len(events)} aktivitas")
+
     # -------------------- callbacks --------------------
     async def button_callback(self, update: Update,
                               context: ContextTypes.DEFAULT_TYPE):
@@ -468,13 +1274,14 @@ class MyXLTelegramBot:
             return
 
         if data == "relogin":
-            user_sessions[user_id] = {
-                "state": "waiting_phone",
-                "is_logged_in": False,
-                "phone_number": None,
-                "tokens": None,
-                "waiting_for": "phone_number",
-            }
+            user_sessions[user_id] = UserSession(
+                state="waiting_phone",
+                is_logged_in=False,
+                phone_number=None,
+                tokens=None,
+                waiting_for="phone_number",
+                accounts=user_sessions.get(user_id, {}).get("accounts", {}),
+            )
             await self._send(
                 update,
                 context,
@@ -483,6 +1290,28 @@ class MyXLTelegramBot:
             )
             return
 
+        if data == "noop":
+            return
+
+        # Halaman berikut/sebelumnya dari cache (tanpa request ke MyXL)
+        if data.startswith(self.pager.PREFIX):
+            cursor = self.pager.parse(data)
+            pageset = self.pager.get(user_id, cursor[0], cursor[1]) if cursor else None
+            if pageset:
+                await self._show_page(update, context, pageset, cursor[2])
+            elif cursor and cursor[0] == "q":
+                await self.kuota_command(update, context)
+            elif cursor and cursor[0] == "p":
+                await self.packages_command(update, context)
+            elif cursor and cursor[0] == "d":
+                await self.dashboard_command(update, context)
+            else:
+                await self._send(update,
+                                 context,
+                                 "⌛ Halaman sudah kedaluwarsa, silakan ulangi perintahnya.",
+                                 prefer_edit=True)
+            return
+
         # Navigasi menu
         if data == "menu_kuota":
             await self.kuota_command(update, context)
@@ -497,22 +1326,67 @@ class MyXLTelegramBot:
             await self.menu_command(update, context)
             return
         if data == "menu_logout":
-            user_sessions[user_id] = {
-                "state": "idle",
-                "is_logged_in": False,
-                "phone_number": None,
-                "tokens": None,
-                "waiting_for": None,
-            }
+            self.alert_poller.unsubscribe(user_id)
+            # logout hanya nomor aktif; pindah ke nomor tertaut lain bila ada
+            session = user_sessions.get(user_id, {})
+            accounts = session.get("accounts", {})
+            accounts.pop(session.get("phone_number"), None)
+            session.get("clients", {}).pop(session.get("phone_number"), None)
+            if accounts:
+                self._switch_account(session, next(iter(accounts)))
+                await self._send(update,
+                                 context,
+                                 f"✅ Logout. Nomor aktif sekarang `{session['phone_number']}`.",
+                                 prefer_edit=True)
+                return
+            user_sessions[user_id] = UserSession(
+                state="idle",
+                is_logged_in=False,
+                phone_number=None,
+                tokens=None,
+                waiting_for=None,
+                accounts={},
+            )
             await self._send(update,
                              context,
                              "✅ Anda telah logout.",
                              prefer_edit=True)
             return
+        if data == "menu_accounts":
+            await self.accounts_command(update, context)
+            return
+        if data == "menu_dashboard":
+            await self.dashboard_command(update, context)
+            return
+        if data == "add_account":
+            session = user_sessions.get(user_id)
+            if not session:
+                await self.login_command(update, context)
+                return
+            session["state"] = "waiting_phone"
+            session["waiting_for"] = "phone_number"
+            await self._send(
+                update,
+                context,
+                "➕ **Tambah Akun**\n\nMasukkan nomor XL prabayar lain (format: 6281234567890)\n\nKetik /cancel untuk batal",
+                prefer_edit=True,
+            )
+            return
+        if data.startswith("acct:"):
+            session = user_sessions.get(user_id, {})
+            msisdn = data[5:]
+            if msisdn in session.get("accounts", {}):
+                self._switch_account(session, msisdn)
+                await self.menu_command(update, context)
+            else:
+                await self._send(update, context, "❌ Akun tidak ditemukan",
+                                 prefer_edit=True)
+            return
 
         # Alur pilih paket → detail → konfirmasi → proses beli
         if data.startswith("pkg"):
-            package_code = self.package_map.get(data)
+            entry = catalog.get(int(data[3:])) if data[3:].isdigit() else None
+            package_code = entry.code if entry else self.package_map.get(data)
             if package_code:
                 await self.handle_package_purchase(update, context, user_id,
                                                    package_code)
@@ -545,8 +1419,10 @@ class MyXLTelegramBot:
         """
         try:
             session = user_sessions[user_id]
-            package_details = get_package(self.api_key, session["tokens"],
-                                          package_code)
+            # harga di layar konfirmasi harus harga upstream saat ini, bukan cache
+            package_details = await asyncio.to_thread(
+                catalog.package_detail, self.api_key, session["tokens"],
+                package_code, fresh=True)
             if not package_details:
                 await self._send(update,
                                  context,
@@ -554,12 +1430,8 @@ class MyXLTelegramBot:
                                  prefer_edit=True)
                 return
 
-            name1 = package_details.get("package_family", {}).get("name", "")
-            name2 = package_details.get("package_detail_variant",
-                                        {}).get("name", "")
-            name3 = package_details.get("package_option", {}).get("name", "")
-            price = package_details["package_option"]["price"]
-            title = f"{name1} {name2} {name3}".strip()
+            price = package_details.price
+            title = package_details.title
 
             detail_text = ("📦 **Detail Paket**\n\n"
                            f"📋 Nama: {title}\n"
@@ -592,72 +1464,107 @@ class MyXLTelegramBot:
                              "❌ Terjadi kesalahan saat memproses paket",
                              prefer_edit=True)
 
+    def _run_purchase(self, session: Dict[str, Any], package_code: str) -> Dict[str, Any]:
+        """
+        Rantai beli (blocking): refresh token → beli → ambil nama/harga paket.
+        `settled`: request settlement sudah dikirim (sukses, gagal, atau tidak
+        pasti), sehingga pembelian tidak boleh diulang otomatis.
+        """
+        # Refresh token sebelum beli (lebih andal)
+        try:
+            if session.get("tokens"):
+                self._refresh_blocking(session)
+        except Exception as e:
+            logger.warning(
+                f"Token refresh sebelum beli gagal (lanjut pakai token lama): {e}"
+            )
+
+        # Call purchase. None / exception = gagal sebelum settlement (refresh token,
+        # detail, payment-methods); error settlement selalu kembali sebagai dict
+        settled = False
+        try:
+            result = self._client(session).purchase_package(package_code)
+            settled = result is not None
+        except Exception as e:
+            logger.error(f"purchase_package raised: {e}")
+            result = None
+        if result is None:
+            result = {"status": "FAILED", "message": "Terjadi kesalahan"}
+
+        ok = isinstance(result, dict) and result.get("status") == "SUCCESS"
+        pkg_name, pkg_price = "Unknown", 0
+        if ok:
+            # Ambil detail paket (cache katalog, biasanya tanpa request baru)
+            try:
+                pkg = catalog.package_detail(self.api_key, session["tokens"],
+                                             package_code)
+                pkg_name = pkg.option_name or "Unknown"
+                pkg_price = pkg.price
+            except Exception:
+                pass
+
+        return {"ok": ok, "settled": settled, "result": result, "pkg_name": pkg_name,
+                "pkg_price": pkg_price}
+
     async def process_package_purchase(self, update: Update,
                                        context: ContextTypes.DEFAULT_TYPE,
                                        user_id: int, package_code: str):
-        """Proses beli paket. Aman untuk callback. Token direfresh dulu untuk menghindari gagal."""
-        # progress
-        await self._send(update,
-                         context,
-                         "⏳ Memproses pembelian paket...",
-                         prefer_edit=True)
+        """
+        Proses beli paket. Aman untuk callback. Token direfresh dulu untuk menghindari gagal.
+        Klik ganda / callback ulang untuk (user, paket) yang sama diproses setelah
+        pembelian pertama selesai (berurutan per user) dan dijawab dari hasil yang
+        di-cache bila settlement sudah dikirim, tidak memicu pembelian kedua.
+        """
+        # progress: token → detail → pembayaran → settlement, diedit live
+        stream = await self._progress(update, context, "⏳ Memproses pembelian paket...")
 
+        session = user_sessions.get(user_id, {})
         try:
-            session = user_sessions[user_id]
-
-            # Refresh token sebelum beli (lebih andal)
-            try:
-                new_tokens = get_new_token(session["tokens"]["refresh_token"]
-                                           ) if session.get("tokens") else None
-                if new_tokens:
-                    session["tokens"] = new_tokens
-            except Exception as e:
-                logger.warning(
-                    f"Token refresh sebelum beli gagal (lanjut pakai token lama): {e}"
+            async with stream:
+                outcome, shared = await self.purchase_flight.do(
+                    (user_id, package_code),
+                    lambda: asyncio.to_thread(self._run_purchase, session,
+                                              package_code),
+                    # sukses maupun gagal/tidak pasti setelah settlement dikirim ikut
+                    # di-cache: MyXL bisa saja sudah memotong pulsa
+                    cache_if=lambda o: o["settled"],
                 )
-
-            # Call purchase
-            try:
-                result = purchase_package(self.api_key, session["tokens"],
-                                          package_code)
-            except Exception as e:
-                logger.error(f"purchase_package raised: {e}")
-                result = {"status": "FAILED", "message": "Terjadi kesalahan"}
+            result = outcome["result"]
+            pkg_name, pkg_price = outcome["pkg_name"], outcome["pkg_price"]
 
             # Hasil
-            if result and result.get("status") == "SUCCESS":
-                # Ambil detail paket
-                try:
-                    pkg = get_package(self.api_key, session["tokens"],
-                                      package_code)
-                    pkg_name = pkg.get("package_option",
-                                       {}).get("name", "Unknown")
-                    pkg_price = pkg.get("package_option", {}).get("price", 0)
-                except Exception:
-                    pkg_name, pkg_price = "Unknown", 0
-
+            if outcome["ok"]:
                 msg = f"✅ **Paket berhasil dibeli!**\n\n📦 {pkg_name}\n💰 Rp {pkg_price:,}\n\nSilakan cek aplikasi MyXL."
 
-                # 🔥 Log aktivitas
-                await log_activity(
-                    update.effective_user,
-                    f"Pembelian paket sukses | Nomor: {session.get('phone_number')} | Paket: {pkg_name} | Harga: Rp {pkg_price:,}"
-                )
+                # 🔥 Log aktivitas (sekali saja, bukan untuk duplikat)
+                if not shared:
+                    await log_activity(
+                        update.effective_user,
+                        f"Pembelian paket sukses | Nomor: {session.get('phone_number')} | Paket: {pkg_name} | Harga: Rp {pkg_price:,}",
+                        "purchase_ok", msisdn=session.get("phone_number"),
+                        code=package_code, package=pkg_name, price=pkg_price,
+                    )
 
             else:
                 error_code = result.get("message") if result else None
                 if error_code == "BALANCE_INSUFFICIENT":
                     human_msg = "Pulsa tidak cukup untuk membeli paket ini."
+                elif result.get("code") == "SETTLEMENT_UNKNOWN":
+                    human_msg = ("Status pembelian belum pasti. Cek aplikasi MyXL "
+                                 "sebelum mencoba membeli lagi.")
                 else:
                     human_msg = error_code or "Pembelian gagal"
 
                 msg = f"❌ **Pembelian gagal!**\n\n{human_msg}"
 
                 # 🔥 Log aktivitas gagal
-                await log_activity(
-                    update.effective_user,
-                    f"Pembelian paket GAGAL | Nomor: {session.get('phone_number')} | PaketCode: {package_code} | Alasan: {human_msg}"
-                )
+                if not shared:
+                    await log_activity(
+                        update.effective_user,
+                        f"Pembelian paket GAGAL | Nomor: {session.get('phone_number')} | PaketCode: {package_code} | Alasan: {human_msg}",
+                        "purchase_failed", msisdn=session.get("phone_number"),
+                        code=package_code, reason=human_msg,
+                    )
 
             # Tombol kembali ke menu
             keyboard = [[
@@ -680,7 +1587,9 @@ class MyXLTelegramBot:
             # 🔥 Log error umum
             await log_activity(
                 update.effective_user,
-                f"ERROR saat pembelian | Nomor: {session.get('phone_number')} | PackageCode: {package_code} | Error: {e}"
+                f"ERROR saat pembelian | Nomor: {session.get('phone_number')} | PackageCode: {package_code} | Error: {e}",
+                "purchase_error", msisdn=session.get("phone_number"),
+                code=package_code, error=str(e),
             )
 
     # -------------------- text messages --------------------
@@ -719,9 +1628,18 @@ class MyXLTelegramBot:
                              "❌ Nomor tidak valid! Format: 6281234567890")
             return
 
+        accounts = user_sessions[user_id].setdefault("accounts", {})
+        if phone_number not in accounts and len(accounts) >= BotConfig.MAX_SESSIONS_PER_USER:
+            await self._send(update, context,
+                             f"❌ Maksimal {BotConfig.MAX_SESSIONS_PER_USER} nomor per akun Telegram.\n"
+                             "Logout salah satu nomor lewat /menu terlebih dahulu.")
+            user_sessions[user_id]["state"] = "idle"
+            user_sessions[user_id]["waiting_for"] = None
+            return
+
         await self._send(update, context, "⏳ Mengirim OTP...")
         try:
-            subscriber_id = get_otp(phone_number)
+            subscriber_id = await asyncio.to_thread(get_otp, phone_number)
             if not subscriber_id:
                 await self._send(update, context,
                                  "❌ Gagal mengirim OTP.\nCoba /login lagi")
@@ -729,7 +1647,8 @@ class MyXLTelegramBot:
                 user_sessions[user_id]["waiting_for"] = None
                 return
 
-            user_sessions[user_id]["phone_number"] = phone_number
+            # nomor aktif baru diganti setelah OTP berhasil
+            user_sessions[user_id]["pending_phone"] = phone_number
             user_sessions[user_id]["waiting_for"] = "otp"
             await self._send(update, context,
                              "✅ OTP dikirim!\n\nMasukkan kode OTP 6 digit:")
@@ -750,8 +1669,8 @@ class MyXLTelegramBot:
         await self._send(update, context, "⏳ Memverifikasi OTP...")
         try:
             session = user_sessions[user_id]
-            phone_number = session.get("phone_number")
-            tokens = submit_otp(phone_number, otp_code)
+            phone_number = session.get("pending_phone")
+            tokens = await asyncio.to_thread(submit_otp, phone_number, otp_code)
             if not tokens:
                 await self._send(update, context,
                                  "❌ OTP salah/expired. /login ulang")
@@ -759,8 +1678,15 @@ class MyXLTelegramBot:
                 user_sessions[user_id]["waiting_for"] = None
                 return
 
+            # simpan token nomor yang sedang aktif sebelum pindah ke nomor baru
+            accounts = session.setdefault("accounts", {})
+            if session.get("phone_number") in accounts and session.get("tokens"):
+                accounts[session["phone_number"]]["tokens"] = session["tokens"]
+            accounts[phone_number] = {"tokens": tokens}
+            session.pop("pending_phone", None)
             user_sessions[user_id].update({
                 "is_logged_in": True,
+                "phone_number": phone_number,
                 "tokens": tokens,
                 "state": "idle",
                 "waiting_for": None,
@@ -768,7 +1694,8 @@ class MyXLTelegramBot:
 
             # 🔥 Log login sukses
             await log_activity(update.effective_user,
-                               f"Login berhasil | Nomor: {phone_number}")
+                               f"Login berhasil | Nomor: {phone_number}",
+                               "login_ok", msisdn=phone_number)
 
             # ✅ Setelah login sukses → langsung ke menu utama
             await self.menu_command(update, context)
@@ -781,19 +1708,37 @@ class MyXLTelegramBot:
             # 🔥 Log error login
             await log_activity(
                 update.effective_user,
-                f"Login ERROR | Nomor: {session.get('phone_number')} | Error: {e}"
+                f"Login ERROR | Nomor: {session.get('pending_phone')} | Error: {e}",
+                "login_error", msisdn=session.get("pending_phone"), error=str(e),
             )
 
     # -------------------- run --------------------
     def run(self):
         logger.info("Starting Doy Telegram Bot...")
-        self.application.run_polling(allowed_updates=Update.ALL_TYPES)
+        # SIGINT/SIGTERM ditangani sendiri (_install_stop_signals) supaya bisa drain dulu
+        self.application.run_polling(allowed_updates=Update.ALL_TYPES, stop_signals=None,
+                                     timeout=BotConfig.TG_POLL_TIMEOUT)
+
+
+IMPORT_TIME_MS = (time.perf_counter() - _IMPORT_T0) * 1000
 
 
 # -------------------- entrypoint --------------------
+def check_startup_budget() -> bool:
+    """Bandingkan waktu import modul dengan budget; dipakai `python main.py --check-startup`."""
+    budget = BotConfig.STARTUP_IMPORT_BUDGET_MS
+    ok = IMPORT_TIME_MS <= budget
+    print(f"{'✅' if ok else '❌'} Import time {IMPORT_TIME_MS:.0f} ms (budget {budget} ms)")
+    return ok
+
+
 def main():
-    load_dotenv()
+    if "--check-startup" in sys.argv:
+        sys.exit(0 if check_startup_budget() else 1)
 
+    load_dotenv()
+    # MYXL_TRANSPORT=record:<file> / replay:<file>[@skala] untuk benchmark tanpa jaringan
+    transport.install_from_env()
 
     bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
     api_key = os.getenv("MYXL_API_KEY")
@@ -805,10 +1750,15 @@ def main():
         print("❌ MYXL_API_KEY tidak ditemukan di environment variables")
         return
 
-    if not verify_api_key(api_key):
+    # hasil verifikasi di-cache lokal (TTL) & direvalidasi di background
+    if not verify_api_key_cached(api_key, ttl=BotConfig.API_KEY_VERIFY_TTL):
         print("❌ API key tidak valid")
         return
 
+    if IMPORT_TIME_MS > BotConfig.STARTUP_IMPORT_BUDGET_MS:
+        logger.warning("Import modul %.0f ms melebihi budget %d ms", IMPORT_TIME_MS,
+                       BotConfig.STARTUP_IMPORT_BUDGET_MS)
+
     bot = MyXLTelegramBot(bot_token, api_key)
     bot.run()
 
@@ -0,0 +1,210 @@
+# models.py - Model respons MyXL yang ringkas (__slots__), hanya field yang dipakai
+from typing import List, Optional, Tuple
+
+
+class ApiError(dict):
+    """
+    Respons gagal yang terstruktur (pengganti `resp.text` mentah).
+    Subclass dict supaya pemanggil lama (`res.get("status")`) tetap jalan.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, message: str, http_status: Optional[int] = None,
+                 code: str = "UPSTREAM_ERROR", body=None):
+        super().__init__(status="ERROR", code=code, message=message,
+                         http_status=http_status)
+        if body is not None:
+            self["body"] = body
+
+    @property
+    def message(self) -> str:
+        return self["message"]
+
+    @property
+    def http_status(self) -> Optional[int]:
+        return self["http_status"]
+
+    def __repr__(self):
+        return f"ApiError({self['code']}, {self.message!r}, http_status={self.http_status})"
+
+
+def _int(value, default: int = 0) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class Profile:
+    __slots__ = ("msisdn", "subscriber_id", "subscription_type")
+
+    def __init__(self, msisdn: str, subscriber_id: str = "", subscription_type: str = ""):
+        self.msisdn = msisdn
+        self.subscriber_id = subscriber_id
+        self.subscription_type = subscription_type
+
+    @classmethod
+    def from_api(cls, data: dict) -> Optional["Profile"]:
+        profile = (data or {}).get("profile") or {}
+        if not profile.get("msisdn"):
+            return None
+        return cls(profile["msisdn"], profile.get("subscriber_id", ""),
+                   profile.get("subscription_type", ""))
+
+    def __repr__(self):
+        return f"Profile({self.msisdn!r})"
+
+
+class Balance:
+    __slots__ = ("remaining", "expired_at")
+
+    def __init__(self, remaining: int, expired_at: int):
+        self.remaining = remaining
+        self.expired_at = expired_at
+
+    @classmethod
+    def from_api(cls, data: dict) -> Optional["Balance"]:
+        if not data:
+            return None
+        return cls(_int(data.get("remaining")), _int(data.get("expired_at")))
+
+    def __repr__(self):
+        return f"Balance({self.remaining}, expired_at={self.expired_at})"
+
+
+class Quota:
+    __slots__ = ("code", "group_code", "name", "remaining", "total", "kind")
+
+    def __init__(self, code: str, group_code: str, name: str, remaining, total,
+                 kind: str = ""):
+        self.code = code
+        self.group_code = group_code
+        self.name = name
+        self.remaining = remaining
+        self.total = total
+        # DATA / VOICE / TEXT (dari benefit pertama); kosong bila tidak dikirim upstream
+        self.kind = kind
+
+    @classmethod
+    def from_api(cls, data: dict) -> "Quota":
+        benefits = data.get("benefits") or [{}]
+        return cls(data.get("quota_code", ""), data.get("group_code", ""),
+                   data.get("name", "N/A"), data.get("remaining", "-"),
+                   data.get("total", "-"), (benefits[0] or {}).get("data_type", ""))
+
+    @classmethod
+    def list_from_api(cls, data: dict) -> List["Quota"]:
+        return [cls.from_api(q) for q in (data or {}).get("quotas") or []]
+
+    def __repr__(self):
+        return f"Quota({self.name!r}, {self.remaining}/{self.total})"
+
+
+class PackageOption:
+    __slots__ = ("code", "name", "price", "family_code", "family_name",
+                 "variant_name")
+
+    def __init__(self, code: str, name: str, price: int, family_code: str = "",
+                 family_name: str = "", variant_name: str = ""):
+        self.code = code
+        self.name = name
+        self.price = price
+        self.family_code = family_code
+        self.family_name = family_name
+        self.variant_name = variant_name
+
+    def __repr__(self):
+        return f"PackageOption({self.name!r}, {self.price})"
+
+
+class PackageFamily:
+    """Hasil `get_family`: nama family + semua option di semua variant."""
+
+    __slots__ = ("code", "name", "options")
+
+    def __init__(self, code: str, name: str, options: Tuple[PackageOption, ...]):
+        self.code = code
+        self.name = name
+        self.options = options
+
+    @classmethod
+    def from_api(cls, code: str, data: dict) -> "PackageFamily":
+        name = ((data or {}).get("package_family") or {}).get("name", "")
+        options = []
+        for variant in (data or {}).get("package_variants") or []:
+            variant_name = variant.get("name", "")
+            for option in variant.get("package_options") or []:
+                if not option.get("package_option_code"):
+                    continue
+                options.append(
+                    PackageOption(option["package_option_code"],
+                                  option.get("name", ""),
+                                  _int(option.get("price")), code, name,
+                                  variant_name))
+        return cls(code, name, tuple(options))
+
+    def to_record(self) -> dict:
+        return {
+            "code": self.code,
+            "name": self.name,
+            "options": [[o.code, o.name, o.price, o.variant_name]
+                        for o in self.options],
+        }
+
+    @classmethod
+    def from_record(cls, rec: dict) -> "PackageFamily":
+        code, name = rec["code"], rec["name"]
+        return cls(code, name, tuple(
+            PackageOption(c, n, p, code, name, v) for c, n, p, v in rec["options"]))
+
+    def __repr__(self):
+        return f"PackageFamily({self.name!r}, {len(self.options)} options)"
+
+
+class PackageDetail:
+    """Hasil `get_package`. `token_confirmation` hanya untuk pembelian, tidak ikut di record."""
+
+    __slots__ = ("option_code", "option_name", "price", "tnc", "family_code",
+                 "family_name", "variant_name", "token_confirmation")
+
+    def __init__(self, option_code: str, option_name: str, price: int, tnc: str = "",
+                 family_code: str = "", family_name: str = "",
+                 variant_name: str = "", token_confirmation: str = ""):
+        self.option_code = option_code
+        self.option_name = option_name
+        self.price = price
+        self.tnc = tnc
+        self.family_code = family_code
+        self.family_name = family_name
+        self.variant_name = variant_name
+        self.token_confirmation = token_confirmation
+
+    @property
+    def title(self) -> str:
+        return " ".join(n for n in (self.family_name, self.variant_name, self.option_name) if n)
+
+    @classmethod
+    def from_api(cls, data: dict) -> Optional["PackageDetail"]:
+        option = (data or {}).get("package_option") or {}
+        if not option.get("package_option_code"):
+            return None
+        family = data.get("package_family") or {}
+        variant = data.get("package_detail_variant") or {}
+        return cls(option["package_option_code"], option.get("name", ""),
+                   _int(option.get("price")), option.get("tnc", ""),
+                   family.get("package_family_code", ""), family.get("name", ""),
+                   variant.get("name", ""), data.get("token_confirmation", ""))
+
+    _RECORD_FIELDS = ("option_code", "option_name", "price", "tnc", "family_code",
+                      "family_name", "variant_name")
+
+    def to_record(self) -> dict:
+        return {f: getattr(self, f) for f in self._RECORD_FIELDS}
+
+    @classmethod
+    def from_record(cls, rec: dict) -> "PackageDetail":
+        return cls(**{f: rec.get(f, "") for f in cls._RECORD_FIELDS})
+
+    def __repr__(self):
+        return f"PackageDetail({self.title!r}, {self.price})"
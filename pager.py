@@ -0,0 +1,132 @@
+# pager.py - Tampilan berhalaman: dirender sekali dari hasil yang di-cache, dipaging per user tanpa fetch ulang
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# batas panjang pesan Telegram
+TEXT_LIMIT = 4096
+
+Row = Tuple[str, str]  # (label, callback_data)
+
+
+class Page:
+    __slots__ = ("text", "rows")
+
+    def __init__(self, text: str, rows: Sequence[Row] = ()):
+        self.text = text
+        self.rows = tuple(rows)
+
+
+class PageSet:
+    __slots__ = ("kind", "gen", "pages", "expires_at", "keyboards")
+
+    def __init__(self, kind: str, gen: int, pages: List[Page], expires_at: float):
+        self.kind = kind
+        self.gen = gen
+        self.pages = pages
+        self.expires_at = expires_at
+        # keyboard per index halaman, diisi saat halaman pertama kali ditampilkan
+        self.keyboards: Dict[int, Any] = {}
+
+    def __len__(self):
+        return len(self.pages)
+
+
+class Pager:
+    """
+    Menyimpan halaman yang sudah jadi per (user, jenis tampilan). Cursor di
+    callback_data ringkas: `pg:<kind>:<gen>:<index>`; `gen` naik setiap hasil
+    baru disimpan, jadi tombol dari pesan lama tidak menampilkan data yang
+    sudah diganti.
+    """
+
+    PREFIX = "pg:"
+
+    def __init__(self, ttl: float = 600):
+        self.ttl = ttl
+        self._store: Dict[int, Dict[str, PageSet]] = {}
+        self._gen = 0
+
+    def put(self, user_id: int, kind: str, pages: List[Page]) -> PageSet:
+        self.sweep()
+        self._gen += 1
+        pageset = PageSet(kind, self._gen, pages or [Page("")],
+                          time.monotonic() + self.ttl)
+        self._store.setdefault(user_id, {})[kind] = pageset
+        return pageset
+
+    def keep(self, user_id: int, pageset: PageSet) -> PageSet:
+        """Pasang lagi PageSet lama (gen sama, tombol lama tetap berlaku) dengan TTL baru."""
+        self.sweep()
+        pageset.expires_at = time.monotonic() + self.ttl
+        self._store.setdefault(user_id, {})[pageset.kind] = pageset
+        return pageset
+
+    def get(self, user_id: int, kind: str, gen: int) -> Optional[PageSet]:
+        pageset = self._store.get(user_id, {}).get(kind)
+        if pageset is None or pageset.gen != gen or pageset.expires_at < time.monotonic():
+            return None
+        return pageset
+
+    def __len__(self):
+        return sum(len(views) for views in self._store.values())
+
+    def sweep(self):
+        now = time.monotonic()
+        for user_id in list(self._store):
+            views = self._store[user_id]
+            for kind in [k for k, p in views.items() if p.expires_at < now]:
+                del views[kind]
+            if not views:
+                del self._store[user_id]
+
+    # -------------------- cursor --------------------
+    @classmethod
+    def cursor(cls, pageset: PageSet, index: int) -> str:
+        return f"{cls.PREFIX}{pageset.kind}:{pageset.gen}:{index}"
+
+    @classmethod
+    def parse(cls, data: str) -> Optional[Tuple[str, int, int]]:
+        """`pg:q:12:3` -> ("q", 12, 3); None bila format salah."""
+        try:
+            kind, gen, index = data[len(cls.PREFIX):].split(":")
+            return kind, int(gen), int(index)
+        except ValueError:
+            return None
+
+    @classmethod
+    def nav_row(cls, pageset: PageSet, index: int) -> List[Row]:
+        """Tombol ◀️ n/N ▶️; kosong bila hanya satu halaman."""
+        total = len(pageset)
+        if total <= 1:
+            return []
+        row: List[Row] = []
+        if index > 0:
+            row.append(("◀️", cls.cursor(pageset, index - 1)))
+        row.append((f"{index + 1}/{total}", "noop"))
+        if index < total - 1:
+            row.append(("▶️", cls.cursor(pageset, index + 1)))
+        return row
+
+
+def paginate_lines(header: str, lines: Sequence[str], per_page: int,
+                   limit: int = TEXT_LIMIT) -> List[Page]:
+    """Bagi baris teks per `per_page` item, dan pecah lagi bila melebihi `limit` karakter."""
+    pages: List[Page] = []
+    chunk: List[str] = []
+    size = len(header)
+    for line in lines:
+        line = line[:limit - len(header) - 1]
+        if chunk and (len(chunk) >= per_page or size + len(line) + 1 > limit):
+            pages.append(Page(header + "\n".join(chunk)))
+            chunk, size = [], len(header)
+        chunk.append(line)
+        size += len(line) + 1
+    if chunk or not pages:
+        pages.append(Page(header + "\n".join(chunk)))
+    return pages
+
+
+def paginate_rows(text: str, rows: Sequence[Row], per_page: int) -> List[Page]:
+    """Keyboard panjang dipecah per `per_page` tombol, teks sama di setiap halaman."""
+    return [Page(text, rows[i:i + per_page])
+            for i in range(0, len(rows), per_page)] or [Page(text)]
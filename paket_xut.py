@@ -1,34 +1,35 @@
-
-import json
-from api_request import send_api_request, get_family
+from bot_config import BotConfig
+from catalog import Catalog
+from catalog_snapshot import CatalogSnapshot
 
 PACKAGE_FAMILY_CODE = "08a3b1e6-8e78-4e45-a540-b40f06871cfe"
+PACKAGE_VARIANT_NAME = "For Xtra Combo"
+
+# Nama option XUT -> nama yang ditampilkan
+XUT_FRIENDLY_NAMES = {
+    "basic": "Xtra Combo Unli Turbo Basic",
+    "vidio": "Unli Turbo Vidio 30 Hari",
+    "iflix": "Unli Turbo Iflix 30 Hari",
+}
+
+# Katalog bersama untuk bot & CLI
+catalog = Catalog(
+    family_codes=BotConfig.CATALOG_FAMILY_CODES or [PACKAGE_FAMILY_CODE],
+    ttl=BotConfig.CATALOG_TTL,
+    price_bands=BotConfig.CATALOG_PRICE_BANDS,
+    aliases={PACKAGE_FAMILY_CODE: XUT_FRIENDLY_NAMES},
+    snapshot=CatalogSnapshot(BotConfig.CATALOG_SNAPSHOT_PATH) if BotConfig.CATALOG_SNAPSHOT_PATH else None,
+    detail_ttl=BotConfig.PACKAGE_DETAIL_TTL,
+)
+
+def get_xut_entries(api_key: str, tokens: dict):
+    catalog.ensure_loaded(api_key, tokens)
+    return catalog.filter(family=PACKAGE_FAMILY_CODE, variant=PACKAGE_VARIANT_NAME)
 
 def get_package_xut(api_key: str, tokens: dict):
-    packages = []
-    
-    data = get_family(api_key, tokens, PACKAGE_FAMILY_CODE)
-    package_variants = data["package_variants"]
-    start_number = 1
-    for variant in package_variants:
-        if variant["name"] == "For Xtra Combo":
-            for option in variant["package_options"]:
-                if True:
-                    friendly_name = option["name"]
-                    
-                    if friendly_name.lower() == "basic":
-                        friendly_name = "Xtra Combo Unli Turbo Basic"
-                    if friendly_name.lower() == "vidio":
-                        friendly_name = "Unli Turbo Vidio 30 Hari"
-                    if friendly_name.lower() == "iflix":
-                        friendly_name = "Unli Turbo Iflix 30 Hari"
-                        
-                    packages.append({
-                        "number": start_number,
-                        "name": friendly_name,
-                        "price": option["price"],
-                        "code": option["package_option_code"]
-                    })
-                    
-                    start_number += 1
-    return packages
+    return [{
+        "number": number,
+        "name": entry.name,
+        "price": entry.price,
+        "code": entry.code
+    } for number, entry in enumerate(get_xut_entries(api_key, tokens), start=1)]
@@ -0,0 +1,106 @@
+# progress.py - Progres operasi multi-hop: event dari rantai upstream, di-coalesce jadi edit pesan berkala
+import time
+import asyncio
+import logging
+import contextvars
+from typing import Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_current: contextvars.ContextVar[Optional["ProgressStream"]] = contextvars.ContextVar(
+    "progress", default=None)
+
+
+def emit(stage: str):
+    """
+    Laporkan tahap yang baru dimulai (tahap sebelumnya dianggap selesai). Aman dipanggil dari thread mana
+    saja (asyncio.to_thread & ThreadPoolExecutor dengan copy_context ikut
+    membawa stream aktif); no-op bila tidak ada stream.
+    """
+    stream = _current.get()
+    if stream is not None:
+        stream.report(stage)
+
+
+class ProgressStream:
+    """
+    Kanal progres untuk satu pesan. `report()` memasukkan tahap ke
+    asyncio.Queue (thread-safe lewat call_soon_threadsafe); satu task
+    pemompa menggabungkan tahap yang datang beruntun dan memanggil
+    `render(teks)` paling sering sekali per `interval` detik, hanya bila teks
+    berubah. Saat keluar dari `async with`, tahap yang belum tampil dibuang:
+    pesan hasil akhir langsung menimpa pesan progres.
+
+        async with ProgressStream(render, fmt, interval=1.5):
+            await asyncio.to_thread(rantai_blocking)   # memanggil progress.emit(...)
+    """
+
+    def __init__(self, render: Callable[[str], Awaitable[None]],
+                 fmt: Callable[[List[str], Dict[str, int]], str], interval: float = 1.5):
+        self.render = render
+        self.fmt = fmt
+        self.interval = interval
+        self.stages: List[str] = []
+        self.counts: Dict[str, int] = {}
+        self.edits = 0
+        self._queue: "asyncio.Queue" = asyncio.Queue()
+        self._loop = asyncio.get_running_loop()
+        self._task: Optional[asyncio.Task] = None
+        self._token = None
+        self._shown: Optional[str] = None
+        self._closed = False
+
+    async def __aenter__(self) -> "ProgressStream":
+        self._token = _current.set(self)
+        self._task = asyncio.create_task(self._pump())
+        return self
+
+    async def __aexit__(self, *exc):
+        _current.reset(self._token)
+        self._closed = True
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        return False
+
+    def report(self, stage: str):
+        if self._closed:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, stage)
+        except RuntimeError:
+            pass  # loop sudah ditutup
+
+    def _apply(self, stage: str):
+        if stage not in self.counts:
+            self.stages.append(stage)
+            self.counts[stage] = 0
+        self.counts[stage] += 1
+
+    def _drain_queue(self):
+        while not self._queue.empty():
+            self._apply(self._queue.get_nowait())
+
+    async def _pump(self):
+        last_edit = 0.0
+        while True:
+            self._apply(await self._queue.get())
+            # tahap yang datang dalam jendela interval digabung jadi satu edit
+            wait = self.interval - (time.monotonic() - last_edit)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._drain_queue()
+            text = self.fmt(self.stages, self.counts)
+            if text == self._shown:
+                continue
+            try:
+                await self.render(text)
+                self._shown = text
+                self.edits += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug("Edit progres gagal: %s", e)
+            last_edit = time.monotonic()
@@ -0,0 +1,175 @@
+# quota_alerts.py - Alert kuota menipis (opt-in): poller latar belakang yang adaptif, ber-jitter & dibatasi
+import time
+import random
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from models import Quota
+
+logger = logging.getLogger(__name__)
+
+FetchQuotas = Callable[[int], Awaitable[Optional[List[Quota]]]]
+Notify = Callable[[int, str], Awaitable[None]]
+
+
+def _percent(quota: Quota) -> Optional[float]:
+    if not isinstance(quota.remaining, (int, float)) or not isinstance(quota.total, (int, float)):
+        return None
+    if quota.total <= 0:
+        return None
+    return quota.remaining * 100.0 / quota.total
+
+
+class Subscription:
+    __slots__ = ("user_id", "chat_id", "threshold", "interval", "next_due",
+                 "digest", "samples", "armed")
+
+    def __init__(self, user_id: int, chat_id: int, threshold: float,
+                 interval: float, next_due: float):
+        self.user_id = user_id
+        self.chat_id = chat_id
+        self.threshold = threshold
+        self.interval = interval
+        self.next_due = next_due
+        self.digest: Optional[Tuple] = None
+        # {quota_code: (waktu, sisa)} untuk menghitung laju pemakaian
+        self.samples: Dict[str, Tuple[float, float]] = {}
+        # {quota_code: False} setelah alert dikirim; aktif lagi bila kuota naik di atas batas
+        self.armed: Dict[str, bool] = {}
+
+
+class QuotaAlertPoller:
+    """
+    Cek quota-details akun yang berlangganan alert dan kirim notifikasi
+    hanya saat sebuah kuota turun melewati batas (persen sisa).
+
+    - interval per akun adaptif: setengah dari perkiraan waktu sampai batas
+      (dari laju pemakaian terakhir), dibatasi [min_interval, max_interval];
+      hasil yang tidak berubah menggandakan interval;
+    - jadwal diberi jitter supaya cek tidak menumpuk di detik yang sama;
+    - `tick()` (dipanggil JobQueue) memproses akun yang jatuh tempo dengan
+      paling banyak `max_concurrency` cek bersamaan.
+    """
+
+    def __init__(self, fetch: FetchQuotas, notify: Notify,
+                 min_interval: float = 600, max_interval: float = 6 * 3600,
+                 start_interval: float = 1800, max_concurrency: int = 4,
+                 jitter: float = 0.2):
+        self.fetch = fetch
+        self.notify = notify
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.start_interval = start_interval
+        self.max_concurrency = max_concurrency
+        self.jitter = jitter
+        self.subscriptions: Dict[int, Subscription] = {}
+        self.stats = {"checks": 0, "unchanged": 0, "alerts": 0, "errors": 0}
+        self._running = False
+
+    # -------------------- subscriptions --------------------
+    def subscribe(self, user_id: int, chat_id: int, threshold: float) -> Subscription:
+        now = time.monotonic()
+        sub = Subscription(user_id, chat_id, threshold, self.start_interval,
+                           # cek pertama disebar acak, tidak langsung semua
+                           now + random.uniform(0, self.min_interval / 10))
+        self.subscriptions[user_id] = sub
+        return sub
+
+    def unsubscribe(self, user_id: int) -> bool:
+        return self.subscriptions.pop(user_id, None) is not None
+
+    def get(self, user_id: int) -> Optional[Subscription]:
+        return self.subscriptions.get(user_id)
+
+    # -------------------- polling --------------------
+    async def tick(self, context=None):
+        """Callback JobQueue (run_repeating). Tick yang tumpang tindih dilewati."""
+        if self._running:
+            return
+        self._running = True
+        try:
+            now = time.monotonic()
+            due = [s for s in self.subscriptions.values() if s.next_due <= now]
+            if not due:
+                return
+            sem = asyncio.Semaphore(self.max_concurrency)
+
+            async def run(sub: Subscription):
+                async with sem:
+                    await self._check(sub)
+
+            await asyncio.gather(*(run(s) for s in due))
+        finally:
+            self._running = False
+
+    def _schedule(self, sub: Subscription, interval: float):
+        sub.interval = max(self.min_interval, min(self.max_interval, interval))
+        spread = sub.interval * self.jitter
+        sub.next_due = time.monotonic() + sub.interval + random.uniform(-spread, spread)
+
+    async def _check(self, sub: Subscription):
+        self.stats["checks"] += 1
+        try:
+            quotas = await self.fetch(sub.user_id)
+        except Exception as e:
+            logger.warning("Cek kuota alert user %s gagal: %s", sub.user_id, e)
+            quotas = None
+        if quotas is None:
+            self.stats["errors"] += 1
+            self._schedule(sub, sub.interval * 2)
+            return
+
+        digest = tuple((q.code, q.remaining) for q in quotas)
+        if digest == sub.digest:
+            # tidak ada pemakaian sejak cek terakhir: jarangkan
+            self.stats["unchanged"] += 1
+            self._schedule(sub, sub.interval * 2)
+            return
+        sub.digest = digest
+
+        alerts, next_interval = self._evaluate(sub, quotas)
+        self._schedule(sub, next_interval)
+        if alerts and sub.user_id in self.subscriptions:
+            self.stats["alerts"] += 1
+            text = "⚠️ Kuota hampir habis:\n\n" + "\n".join(alerts)
+            try:
+                await self.notify(sub.chat_id, text)
+            except Exception as e:
+                logger.warning("Gagal kirim alert kuota ke %s: %s", sub.chat_id, e)
+
+    def _evaluate(self, sub: Subscription, quotas: Sequence[Quota]) -> Tuple[List[str], float]:
+        now = time.monotonic()
+        alerts: List[str] = []
+        next_interval = sub.interval * 1.5
+        for q in quotas:
+            pct = _percent(q)
+            if pct is None:
+                continue
+            key = q.code or q.name
+            prev = sub.samples.get(key)
+            sub.samples[key] = (now, q.remaining)
+
+            if pct <= sub.threshold:
+                if sub.armed.get(key, True):
+                    # quota_view (dan pager) tidak ikut dimuat saat startup
+                    from quota_view import format_amount
+                    alerts.append(f"• {q.name}: sisa {pct:.0f}% "
+                                  f"({format_amount(q.remaining, q.kind)} / "
+                                  f"{format_amount(q.total, q.kind)})")
+                sub.armed[key] = False
+                continue
+            sub.armed[key] = True
+
+            if prev is None or now <= prev[0]:
+                continue
+            burn = (prev[1] - q.remaining) / q.total / (now - prev[0])  # fraksi per detik
+            if burn > 0:
+                to_threshold = (pct - sub.threshold) / 100.0 / burn
+                next_interval = min(next_interval, to_threshold / 2)
+        # kuota yang sudah tidak ada (habis masa aktif) tidak perlu diingat
+        live = {q.code or q.name for q in quotas}
+        for key in [k for k in sub.samples if k not in live]:
+            sub.samples.pop(key, None)
+            sub.armed.pop(key, None)
+        return alerts, next_interval
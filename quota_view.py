@@ -0,0 +1,111 @@
+# quota_view.py - Kuota dinormalisasi sekali jadi record ringkas (satuan terbaca) + cache tampilan per akun
+import hashlib
+from typing import List, Optional, Sequence, Tuple
+
+from models import Quota
+from pager import Page, PageSet, paginate_lines
+from state import BoundedStore
+
+_MB = 1024 * 1024
+_GB = 1024 * _MB
+
+HEADER = "📊 **Kuota Aktif:**\n\n"
+REFRESH_ROW = ("🔄 Perbarui", "menu_kuota")
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def format_amount(value, kind: str = "") -> str:
+    """
+    Angka mentah upstream -> teks terbaca: DATA dalam byte (GB/MB), VOICE
+    dalam detik (menit), TEXT dalam jumlah SMS. Bila jenis tidak dikirim,
+    nilai >= 1 MB dianggap byte (kuota nelpon/SMS tidak pernah sebesar itu).
+    """
+    if not _is_number(value):
+        return str(value)
+    kind = (kind or "").upper()
+    if kind == "DATA" or (not kind and value >= _MB):
+        if value >= _GB:
+            return f"{value / _GB:.2f} GB"
+        return f"{value / _MB:.0f} MB" if value >= _MB else f"{value / 1024:.0f} KB"
+    if kind == "VOICE":
+        return f"{value // 60:,} menit"
+    if kind == "TEXT":
+        return f"{value:,} SMS"
+    return f"{value:,}"
+
+
+class QuotaRecord:
+    """Satu baris kuota yang sudah diformat; dibangun sekali per hasil fetch."""
+
+    __slots__ = ("code", "name", "remaining", "total", "percent", "amount")
+
+    def __init__(self, quota: Quota):
+        self.code = quota.code
+        self.name = quota.name
+        self.remaining = quota.remaining
+        self.total = quota.total
+        self.percent: Optional[int] = None
+        if _is_number(quota.remaining) and _is_number(quota.total) and quota.total > 0:
+            self.percent = round(quota.remaining * 100 / quota.total)
+        amount = (f"{format_amount(quota.remaining, quota.kind)} / "
+                  f"{format_amount(quota.total, quota.kind)}")
+        if self.percent is not None:
+            amount += f" ({self.percent}%)"
+        self.amount = amount
+
+    def __repr__(self):
+        return f"QuotaRecord({self.name!r}, {self.amount})"
+
+
+def normalize(quotas: Sequence[Quota]) -> List[QuotaRecord]:
+    return [QuotaRecord(q) for q in quotas]
+
+
+def digest(records: Sequence[QuotaRecord]) -> str:
+    """Hash isi tampilan: sama selama nama & angka kuota tidak berubah."""
+    h = hashlib.blake2b(digest_size=12)
+    for r in records:
+        h.update(f"{r.code}\x1f{r.name}\x1f{r.remaining}\x1f{r.total}\x1e".encode())
+    return h.hexdigest()
+
+
+def render_pages(records: Sequence[QuotaRecord], per_page: int) -> List[Page]:
+    lines = [f"{idx}. {r.name}\n   ➡️ {r.amount}" for idx, r in enumerate(records, start=1)]
+    pages = paginate_lines(HEADER, lines, per_page)
+    for page in pages:
+        page.rows = (REFRESH_ROW,)
+    return pages
+
+
+class QuotaViews:
+    """
+    Tampilan kuota terakhir per (user, msisdn): hash isi + PageSet yang sudah
+    dirender. Fetch berikutnya dengan hash yang sama memakai PageSet yang sama
+    (gen & tombol navigasi tidak berubah), sehingga pesan yang sedang
+    menampilkannya tidak perlu diedit.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.store = BoundedStore("quota_views", max_entries, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.store)
+
+    def lookup(self, user_id: int, msisdn: str, content: str) -> Optional[PageSet]:
+        cached: Optional[Tuple[str, PageSet]] = self.store.get((user_id, msisdn))
+        if cached is not None and cached[0] == content:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        return None
+
+    def remember(self, user_id: int, msisdn: str, content: str, pageset: PageSet):
+        self.store[(user_id, msisdn)] = (content, pageset)
+
+    def sweep(self) -> int:
+        return self.store.sweep()
@@ -0,0 +1,101 @@
+# retry.py - Retry per hop (encrypt / MyXL / decrypt) dengan backoff ber-jitter dan deadline per request
+import time
+import random
+import logging
+from typing import Any, Callable, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# status HTTP yang dianggap gangguan sementara
+TRANSIENT_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class DeadlineExceeded(TimeoutError):
+    """Sisa waktu request habis sebelum hop sempat (di)jalankan lagi."""
+
+
+class Deadline:
+    __slots__ = ("expires_at",)
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+
+class RetryPolicy:
+    """
+    `attempts` = total percobaan per hop (termasuk yang pertama).
+    Jeda antar percobaan memakai full jitter: acak di [0, min(max_delay, base_delay * 2^n)].
+    `deadline` = batas waktu seluruh request (semua hop + retry).
+    """
+
+    __slots__ = ("attempts", "base_delay", "max_delay", "deadline")
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.25,
+                 max_delay: float = 2.0, deadline: float = 45.0):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+NO_RETRY = RetryPolicy(attempts=1)
+
+
+def is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    return getattr(exc, "status_code", None) in TRANSIENT_STATUS
+
+
+def call_with_retry(
+    hop: str,
+    fn: Callable[[float], Any],
+    policy: RetryPolicy,
+    deadline: Deadline,
+    timeout: float,
+    retry_result: Optional[Callable[[Any], bool]] = None,
+) -> Any:
+    """
+    Jalankan `fn(timeout_hop)`; ulangi hanya bila gagal sementara (exception
+    `is_transient` atau `retry_result(hasil)` True) dan masih ada waktu.
+    Timeout tiap percobaan dipotong ke sisa deadline. Bila retry habis,
+    exception terakhir dilempar / hasil terakhir dikembalikan.
+    """
+    attempt = 0
+    while True:
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"{hop}: deadline habis")
+        try:
+            result = fn(min(timeout, remaining))
+        except Exception as e:
+            if not is_transient(e) or not _may_retry(hop, attempt, policy, deadline, e):
+                raise
+        else:
+            if retry_result is None or not retry_result(result):
+                return result
+            cause = f"HTTP {result.status_code}" if hasattr(result, "status_code") else result
+            if not _may_retry(hop, attempt, policy, deadline, cause):
+                return result
+        attempt += 1
+
+
+def _may_retry(hop: str, attempt: int, policy: RetryPolicy, deadline: Deadline, cause) -> bool:
+    if attempt + 1 >= policy.attempts:
+        return False
+    delay = policy.backoff(attempt)
+    # jangan tidur melewati deadline; sisakan waktu untuk percobaan berikutnya
+    if delay >= deadline.remaining():
+        return False
+    logger.warning("retry %s (%d/%d) in %.2fs: %s", hop, attempt + 2,
+                   policy.attempts, delay, cause)
+    time.sleep(delay)
+    return True
@@ -0,0 +1,97 @@
+# sampler.py - Sampling profiler ringan (semua thread) + snapshot tracemalloc, untuk diagnosis live
+import os
+import sys
+import time
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+
+def _frame_label(code) -> str:
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class SamplingProfiler:
+    """
+    Mengambil stack semua thread setiap `interval` detik lewat
+    sys._current_frames() (tanpa sys.setprofile, jadi overhead hanya saat
+    sampling). Hasil dalam format collapsed stack
+    ("thread;file:func;file:func N") yang bisa langsung dibuka di
+    speedscope / flamegraph.pl.
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self.running = False
+
+    def _sample(self, counts: Counter, own_id: int, names: Dict[int, str]):
+        for tid, frame in sys._current_frames().items():
+            if tid == own_id:
+                continue
+            parts: List[str] = []
+            depth = 0
+            while frame is not None and depth < self.max_depth:
+                parts.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+                depth += 1
+            parts.append(names.get(tid, f"thread-{tid}"))
+            counts[";".join(reversed(parts))] += 1
+
+    def run(self, seconds: float, with_memory: bool = False,
+            top_allocations: int = 15) -> Tuple[str, Optional[str], int]:
+        """
+        Blocking selama `seconds` (jalankan di thread terpisah).
+        Return (collapsed_stacks, laporan_tracemalloc | None, jumlah_sampel).
+        """
+        with self._lock:
+            if self.running:
+                raise RuntimeError("Profiler sedang berjalan")
+            self.running = True
+
+        started_tracemalloc = False
+        try:
+            if with_memory and not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+                started_tracemalloc = True
+
+            counts: Counter = Counter()
+            own_id = threading.get_ident()
+            deadline = time.monotonic() + seconds
+            samples = 0
+            names: Dict[int, str] = {}
+            while time.monotonic() < deadline:
+                if samples % 200 == 0:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                self._sample(counts, own_id, names)
+                samples += 1
+                time.sleep(self.interval)
+
+            collapsed = "\n".join(f"{stack} {n}" for stack, n in counts.most_common())
+            memory = None
+            if with_memory:
+                memory = self._memory_report(top_allocations)
+            return collapsed, memory, samples
+        finally:
+            if started_tracemalloc:
+                tracemalloc.stop()
+            self.running = False
+
+    @staticmethod
+    def _memory_report(limit: int) -> str:
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        stats = snapshot.statistics("lineno")
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"traced current={current / 1024:.0f} KiB peak={peak / 1024:.0f} KiB",
+                 f"top {limit} alokasi (per baris):"]
+        for i, stat in enumerate(stats[:limit], start=1):
+            frame = stat.traceback[0]
+            lines.append(f"{i:2d}. {os.path.basename(frame.filename)}:{frame.lineno} "
+                         f"{stat.size / 1024:.1f} KiB ({stat.count} blok)")
+        return "\n".join(lines)
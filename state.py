@@ -0,0 +1,223 @@
+# state.py - State in-memory yang dibatasi (kapasitas + TTL) dan laporan pemakaian memori
+import os
+import sys
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+
+class UserSession:
+    """
+    Record sesi per user Telegram (__slots__, jauh lebih kecil dari dict).
+    Tetap bisa dipakai seperti dict (`s["tokens"]`, `s.get(...)`, `s.update(...)`)
+    supaya handler lama tidak perlu diubah.
+
+    `clients` (MyXLClient per nomor tertaut) hanya hidup di memori dan tidak
+    ikut `to_dict`; setelah restart client dibuat ulang dari token.
+    """
+
+    __slots__ = ("state", "is_logged_in", "phone_number", "tokens", "waiting_for",
+                 "accounts", "pending_phone", "clients")
+    PERSISTED = __slots__[:-1]
+
+    def __init__(self, state: str = "idle", is_logged_in: bool = False,
+                 phone_number: Optional[str] = None, tokens: Optional[dict] = None,
+                 waiting_for: Optional[str] = None, accounts: Optional[dict] = None,
+                 pending_phone: Optional[str] = None):
+        self.state = state
+        self.is_logged_in = is_logged_in
+        self.phone_number = phone_number
+        self.tokens = tokens
+        self.waiting_for = waiting_for
+        self.accounts = accounts if accounts is not None else {}
+        self.pending_phone = pending_phone
+        self.clients: Dict[str, Any] = {}
+
+    # -------------------- akses gaya dict --------------------
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__ and getattr(self, key) is not None
+
+    def get(self, key: str, default=None):
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def setdefault(self, key: str, default=None):
+        if self.get(key) is None:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key: str, default=None):
+        value = self.get(key, default)
+        if key in self.__slots__:
+            setattr(self, key, None)
+        return value
+
+    def update(self, values: Dict[str, Any]):
+        for key, value in values.items():
+            self[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self.PERSISTED}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "UserSession":
+        return cls(**{k: v for k, v in data.items() if k in cls.PERSISTED})
+
+    def __repr__(self):
+        return f"UserSession({self.phone_number!r}, logged_in={self.is_logged_in})"
+
+
+class BoundedStore:
+    """
+    Mapping dengan batas jumlah entry (LRU: entry yang paling lama tidak
+    diakses dibuang dulu) dan sweep berkala. Setiap akses (`get`,
+    `[]`, set) memperbarui waktu akses. `expire(value, idle_detik)` menentukan
+    entry mana yang dibuang saat sweep (default: idle > `ttl`); callback boleh
+    juga merapikan isi entry tanpa membuangnya.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl: Optional[float] = None,
+                 expire: Optional[Callable[[Any, float], bool]] = None,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.expire = expire
+        self.on_evict = on_evict
+        self.evicted = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(list(self._data))
+
+    def __getitem__(self, key: Hashable):
+        value = self._data[key][1]
+        self._touch(key, value)
+        return value
+
+    def get(self, key: Hashable, default=None):
+        if key not in self._data:
+            return default
+        return self[key]
+
+    def __setitem__(self, key: Hashable, value):
+        self._touch(key, value)
+        while len(self._data) > self.max_entries:
+            old_key, (_, old_value) = self._data.popitem(last=False)
+            self._evicted(old_key, old_value)
+
+    def pop(self, key: Hashable, default=None):
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def values(self):
+        return [v for _, v in self._data.values()]
+
+    def items(self):
+        return [(k, v) for k, (_, v) in self._data.items()]
+
+    def _touch(self, key: Hashable, value):
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+
+    def _evicted(self, key: Hashable, value):
+        self.evicted += 1
+        if self.on_evict:
+            self.on_evict(key, value)
+
+    def sweep(self) -> int:
+        """Buang entry kedaluwarsa; return jumlah yang dibuang."""
+        now = time.monotonic()
+        removed = 0
+        for key, (touched, value) in list(self._data.items()):
+            idle = now - touched
+            if self.expire is not None:
+                dead = self.expire(value, idle)
+            else:
+                dead = self.ttl is not None and idle > self.ttl
+            if dead:
+                del self._data[key]
+                self._evicted(key, value)
+                removed += 1
+        return removed
+
+
+# -------------------- memory accounting --------------------
+def approx_size(obj, sample: int = 200, _seen: Optional[set] = None) -> int:
+    """
+    Perkiraan ukuran (byte) objek beserta isinya. Container besar diukur
+    dari sampel `sample` elemen lalu diekstrapolasi supaya laporan murah.
+    """
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, BoundedStore):
+        items = list(obj._data.items())
+        return size + _sized(items, len(items), sample, seen)
+    if isinstance(obj, dict):
+        items = list(obj.items())
+        return size + _sized(items, len(items), sample, seen)
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        items = list(obj)
+        return size + _sized(items, len(items), sample, seen)
+    slots = getattr(type(obj), "__slots__", None)
+    if slots:
+        return size + sum(approx_size(getattr(obj, s, None), sample, seen)
+                          for s in slots if s != "__weakref__")
+    if hasattr(obj, "__dict__") and not isinstance(obj, type):
+        return size + approx_size(vars(obj), sample, seen)
+    return size
+
+
+def _sized(items: list, total: int, sample: int, seen: set) -> int:
+    if not items:
+        return 0
+    picked = items if total <= sample else items[::max(1, total // sample)][:sample]
+    measured = sum(approx_size(i, sample, seen) for i in picked)
+    return int(measured * total / len(picked))
+
+
+def rss_bytes() -> int:
+    """Resident memory proses saat ini (Linux), atau puncak RSS bila /proc tidak ada."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource  # tidak ada di Windows
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def memory_report(structures: Dict[str, Any]) -> Dict[str, Any]:
+    """{"rss_kb": .., "<nama>": {"entries": n, "kb": ..}} untuk log metrik & /mem."""
+    report: Dict[str, Any] = {"rss_kb": rss_bytes() // 1024}
+    for name, obj in structures.items():
+        try:
+            entries = len(obj)
+        except TypeError:
+            entries = None
+        report[name] = {"entries": entries, "kb": round(approx_size(obj) / 1024, 1)}
+    return report
@@ -0,0 +1,47 @@
+# conftest.py - Modul bot berada di root repo (layout datar): tambahkan ke sys.path
+import os
+import sys
+import asyncio
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from loop_monitor import LoopWatchdog  # noqa: E402
+
+
+class WatchedLoop:
+    """Jalankan handler async di event loop baru yang diawasi LoopWatchdog strict mode."""
+
+    def __init__(self, watchdog: LoopWatchdog):
+        self.watchdog = watchdog
+
+    def run(self, handler, *args, **kwargs):
+        self.watchdog.register(getattr(handler, "__name__", repr(handler)))
+
+        async def main():
+            self.watchdog.start()
+            try:
+                result = await handler(*args, **kwargs)
+                # beri thread pengawas kesempatan melihat blokir terakhir
+                await asyncio.sleep(self.watchdog.interval * 2)
+                return result
+            finally:
+                await self.watchdog.stop()
+
+        return asyncio.run(main())
+
+
+@pytest.fixture
+def loop_watchdog():
+    """
+    Handler yang dijalankan lewat `loop_watchdog.run(handler, ...)` gagal di
+    teardown bila memblokir event loop > LOOP_STRICT_MS (default 100 ms).
+    """
+    strict_ms = float(os.getenv("LOOP_STRICT_MS") or 100)
+    watched = WatchedLoop(LoopWatchdog(interval=0.01, threshold_ms=strict_ms,
+                                       strict_ms=strict_ms))
+    yield watched
+    watched.watchdog.assert_no_blocking()
@@ -0,0 +1,39 @@
+import asyncio
+from types import SimpleNamespace
+
+from admission import AdmissionControl
+
+
+async def _reject(update, estimate):
+    pass
+
+
+def test_user_lock_waits_for_running_update_of_same_user():
+    order = []
+
+    async def scenario():
+        admission = AdmissionControl(classify=lambda u: False, reject=_reject, slots=2)
+        await admission.initialize()
+        started = asyncio.Event()
+
+        async def handler():
+            started.set()
+            await asyncio.sleep(0.05)
+            order.append("handler")
+
+        async def poller(user_id):
+            async with admission.user_lock(user_id):
+                order.append(f"poller{user_id}")
+
+        update = SimpleNamespace(update_id=1, effective_user=SimpleNamespace(id=7))
+        running = asyncio.ensure_future(admission.do_process_update(update, handler()))
+        await started.wait()
+        # user lain tidak ikut menunggu
+        await poller(8)
+        await poller(7)
+        await running
+        return admission
+
+    admission = asyncio.run(scenario())
+    assert order == ["poller8", "handler", "poller7"]
+    assert admission._user_locks == {}
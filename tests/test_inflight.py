@@ -0,0 +1,116 @@
+import asyncio
+
+from inflight import SingleFlight
+
+
+def test_concurrent_duplicates_share_one_call():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def scenario():
+        flight = SingleFlight(result_ttl=60)
+        return await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert [value for value, _ in results] == ["ok"] * 5
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+
+
+def test_late_duplicate_answered_from_ttl_cache():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        return len(calls)
+
+    async def scenario():
+        flight = SingleFlight(result_ttl=60)
+        first = await flight.do("k", work)
+        late = await flight.do("k", work)
+        # hasil yang tidak lolos cache_if tidak disimpan
+        other = await flight.do("x", work, cache_if=lambda v: False)
+        again = await flight.do("x", work, cache_if=lambda v: False)
+        return first, late, other, again
+
+    first, late, other, again = asyncio.run(scenario())
+    assert first == (1, False)
+    assert late == (1, True)
+    assert other == (2, False)
+    assert again == (3, False)
+
+
+def test_late_duplicate_after_ttl_runs_again():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        return len(calls)
+
+    async def scenario():
+        flight = SingleFlight(result_ttl=0.01)
+        await flight.do("k", work)
+        await asyncio.sleep(0.05)
+        return await flight.do("k", work)
+
+    assert asyncio.run(scenario()) == (2, False)
+
+
+def test_cancelling_first_caller_keeps_shielded_waiters_working():
+    async def scenario():
+        flight = SingleFlight(result_ttl=60)
+        started = asyncio.Event()
+
+        async def work():
+            started.set()
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def shielded(key):
+            # pola pemanggil: pekerjaan dijalankan di task sendiri dan di-shield
+            return await asyncio.shield(asyncio.ensure_future(flight.do(key, work)))
+
+        first = asyncio.ensure_future(shielded("k"))
+        await started.wait()
+        second = asyncio.ensure_future(shielded("k"))
+        await asyncio.sleep(0)
+        first.cancel()
+        value, shared = await second
+        try:
+            await first
+        except asyncio.CancelledError:
+            pass
+        # pekerjaan tetap selesai & di-cache walau pemanggil pertama dibatalkan
+        cached = await flight.do("k", work)
+        return value, shared, first.cancelled(), cached
+
+    value, shared, first_cancelled, cached = asyncio.run(scenario())
+    assert first_cancelled
+    assert (value, shared) == ("done", True)
+    assert cached == ("done", True)
+
+
+def test_cancelled_work_cancels_waiters_but_not_the_flight():
+    async def scenario():
+        flight = SingleFlight(result_ttl=60)
+        started = asyncio.Event()
+
+        async def work():
+            started.set()
+            await asyncio.sleep(1)
+
+        first = asyncio.ensure_future(flight.do("k", work))
+        await started.wait()
+        second = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        results = await asyncio.gather(first, second, return_exceptions=True)
+        return results, len(flight)
+
+    results, pending = asyncio.run(scenario())
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+    assert pending == 0
@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import pytest
+
+from loop_monitor import BlockingHandlerError, LoopWatchdog
+
+
+async def handler_that_awaits():
+    await asyncio.to_thread(time.sleep, 0.3)
+    return "ok"
+
+
+async def handler_that_blocks():
+    time.sleep(0.3)
+    return "ok"
+
+
+def test_non_blocking_handler_passes(loop_watchdog):
+    assert loop_watchdog.run(handler_that_awaits) == "ok"
+
+
+def test_blocking_handler_is_recorded_and_fails_assert():
+    watchdog = LoopWatchdog(interval=0.01, threshold_ms=100, strict_ms=100)
+    watchdog.register("handler_that_blocks")
+
+    async def main():
+        watchdog.start()
+        try:
+            marker = watchdog.enter()
+            result = await handler_that_blocks()
+            await asyncio.sleep(0.05)
+            return result, watchdog.exit(marker, "handler_that_blocks")
+        finally:
+            await watchdog.stop()
+
+    result, found = asyncio.run(main())
+    # exit() hanya mencatat: hasil handler tidak berubah
+    assert result == "ok"
+    assert [v["handler"] for v in found] == ["handler_that_blocks"]
+    with pytest.raises(BlockingHandlerError):
+        watchdog.assert_no_blocking()
+
+
+class _Message:
+    def __init__(self):
+        self.sent = []
+
+    async def reply_text(self, text, **kwargs):
+        self.sent.append(text)
+        return self
+
+
+class _Update:
+    def __init__(self):
+        self.message = _Message()
+        self.callback_query = None
+        self.effective_user = type("User", (), {"id": 1})()
+
+
+def test_bot_help_handler_does_not_block(loop_watchdog, tmp_path, monkeypatch):
+    pytest.importorskip("telegram")
+    monkeypatch.setenv("ACTIVITY_DIR", str(tmp_path / "activity"))
+    import main
+
+    bot = main.MyXLTelegramBot("123:ABC", "key")
+    update = _Update()
+    loop_watchdog.run(bot.help_command, update, None)
+    assert update.message.sent
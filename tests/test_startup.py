@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+# main.py butuh dependensi bot terpasang (requirements.txt)
+for _module in ("telegram", "httpx", "requests", "dotenv"):
+    pytest.importorskip(_module)
+
+LAZY_MODULES = ("sampler", "tg_request", "cassette", "pager", "quota_view", "Crypto")
+
+
+def _run(tmp_path, *args):
+    env = {**os.environ, "ACTIVITY_DIR": str(tmp_path / "activity"),
+           "CATALOG_SNAPSHOT_PATH": "", "BOT_STATE_FILE": str(tmp_path / "state.json")}
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env,
+                          capture_output=True, text=True, timeout=120)
+
+
+def test_import_time_within_budget(tmp_path):
+    proc = _run(tmp_path, "main.py", "--check-startup")
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+
+
+def test_rarely_used_modules_not_imported(tmp_path):
+    code = ("import sys, main; "
+            f"print('LOADED:' + ','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))")
+    proc = _run(tmp_path, "-c", code)
+    assert proc.returncode == 0, proc.stderr
+    loaded = [line for line in proc.stdout.splitlines() if line.startswith("LOADED:")]
+    assert loaded == ["LOADED:"]
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+import api_request
+
+
+def _fake_refresh(session, refresh_token, timeout=30):
+    n = int(refresh_token[1:]) + 1
+    return {"id_token": f"i{n}", "refresh_token": f"r{n}", "access_token": "a"}
+
+
+def test_get_new_token_save_flag(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(api_request, "_refresh_tokens", _fake_refresh)
+    api_request.get_new_token("r0", save=False)
+    assert not (tmp_path / "tokens.json").exists()
+    api_request.get_new_token("r0")
+    assert api_request.load_tokens()["id_token"] == "i1"
+
+
+def test_bot_refresh_keeps_tokens_in_session(tmp_path, monkeypatch):
+    pytest.importorskip("telegram")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("ACTIVITY_DIR", str(tmp_path / "activity"))
+    monkeypatch.setattr(api_request, "_refresh_tokens", _fake_refresh)
+    import main
+    from state import UserSession
+
+    bot = main.MyXLTelegramBot("123:ABC", "key")
+    tokens = {"id_token": "i0", "refresh_token": "r0"}
+    session = UserSession(is_logged_in=True, phone_number="62811", tokens=tokens,
+                          accounts={"62811": {"tokens": tokens}})
+    client = bot._client(session)
+
+    async def refresh_twice():
+        # refresh per user berurutan (lock admission), client tetap sama
+        return [await bot._refresh(session), await bot._refresh(session)]
+
+    assert all(c is client for c in asyncio.run(refresh_twice()))
+    assert client.tokens["id_token"] == "i2"
+    assert session["tokens"] is client.tokens
+    assert session["accounts"]["62811"]["tokens"] is client.tokens
+    assert "clients" not in session.to_dict()
+    assert not (tmp_path / "tokens.json").exists()
@@ -0,0 +1,118 @@
+# tg_request.py - Koneksi Bot API: pool terpisah (getUpdates / pesan keluar), keep-alive, HTTP/2 & metrik antre pool
+import time
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+import httpx
+from telegram.request import HTTPXRequest
+
+
+class PoolStats:
+    """Waktu tunggu koneksi dari pool per request (ring buffer untuk persentil)."""
+
+    def __init__(self, name: str, pool_size: int, window: int = 1024):
+        self.name = name
+        self.pool_size = pool_size
+        self.requests = 0
+        self.pool_timeouts = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.wait_max_ms = 0.0
+        self._waits: "deque[float]" = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def started(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finished(self, wait_ms: Optional[float], pool_timeout: bool = False):
+        with self._lock:
+            self.in_flight -= 1
+            if pool_timeout:
+                self.pool_timeouts += 1
+            if wait_ms is not None:
+                self._waits.append(wait_ms)
+                self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            report = {"pool": self.pool_size, "requests": self.requests,
+                      "in_flight": self.in_flight, "peak": self.peak_in_flight,
+                      "pool_timeouts": self.pool_timeouts,
+                      "wait_max_ms": round(self.wait_max_ms, 1)}
+        for label, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            value = waits[min(len(waits) - 1, int(len(waits) * q))] if waits else 0.0
+            report[f"wait_{label}_ms"] = round(value, 1)
+        return report
+
+
+class _TimedTransport(httpx.AsyncBaseTransport):
+    """
+    Membungkus transport httpx: waktu antre pool = jarak dari request masuk
+    transport sampai event trace httpcore pertama (connect TCP untuk koneksi
+    baru, atau kirim header untuk koneksi keep-alive).
+    """
+
+    def __init__(self, inner: httpx.AsyncHTTPTransport, stats: PoolStats):
+        self.inner = inner
+        self.stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        t0 = time.perf_counter()
+        acquired = []
+
+        async def trace(event: str, info: dict):
+            if not acquired:
+                acquired.append(time.perf_counter())
+
+        request.extensions = {**request.extensions, "trace": trace}
+        self.stats.started()
+        try:
+            response = await self.inner.handle_async_request(request)
+        except httpx.PoolTimeout:
+            self.stats.finished((time.perf_counter() - t0) * 1000, pool_timeout=True)
+            raise
+        except Exception:
+            self.stats.finished(None)
+            raise
+        wait = (acquired[0] - t0) * 1000 if acquired else None
+        self.stats.finished(wait)
+        return response
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+class TunedRequest(HTTPXRequest):
+    """
+    HTTPXRequest dengan keep-alive yang bisa diatur (bawaan httpx 5 detik,
+    sehingga tiap burst pesan membuka koneksi TLS baru) dan metrik antre pool.
+    `http_version="2"` butuh `pip install "python-telegram-bot[http2]"`.
+    Request lewat proxy tidak ikut terukur (httpx memakai transport proxy sendiri).
+    """
+
+    __slots__ = ("stats", "_keepalive_expiry", "_socket_options")
+
+    def __init__(self, name: str, connection_pool_size: int, keepalive_expiry: float = 60,
+                 socket_options=None, **kwargs):
+        self.stats = PoolStats(name, connection_pool_size)
+        self._keepalive_expiry = keepalive_expiry
+        self._socket_options = socket_options
+        super().__init__(connection_pool_size=connection_pool_size,
+                         socket_options=socket_options, **kwargs)
+
+    def _build_client(self) -> httpx.AsyncClient:
+        # transport dibuat ulang setiap client dibangun (initialize setelah shutdown)
+        kwargs = dict(self._client_kwargs)
+        pool = self.stats.pool_size
+        limits = httpx.Limits(max_connections=pool, max_keepalive_connections=pool,
+                              keepalive_expiry=self._keepalive_expiry)
+        inner = httpx.AsyncHTTPTransport(http1=kwargs.pop("http1"), http2=kwargs.pop("http2"),
+                                         limits=limits,
+                                         socket_options=self._socket_options)
+        kwargs.update(limits=limits, transport=_TimedTransport(inner, self.stats))
+        return httpx.AsyncClient(**kwargs)
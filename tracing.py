@@ -0,0 +1,137 @@
+# tracing.py - Trace id per update bot + span ringan, ring buffer & export Chrome/Perfetto JSON
+import os
+import time
+import uuid
+import logging
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+_current_trace: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar(
+    "current_trace", default=None)
+
+
+def _now_us() -> int:
+    return time.perf_counter_ns() // 1000
+
+
+class Span:
+    __slots__ = ("name", "start_us", "dur_us", "tid", "attrs")
+
+    def __init__(self, name: str, start_us: int, tid: int, attrs: Dict):
+        self.name = name
+        self.start_us = start_us
+        self.dur_us = 0
+        self.tid = tid
+        self.attrs = attrs
+
+
+class Trace:
+    __slots__ = ("trace_id", "name", "start_us", "dur_us", "attrs", "spans")
+
+    def __init__(self, name: str, attrs: Dict):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.start_us = _now_us()
+        self.dur_us = 0
+        self.attrs = attrs
+        self.spans: List[Span] = []
+
+    @property
+    def dur_ms(self) -> float:
+        return self.dur_us / 1000
+
+
+class TraceBuffer:
+    """Ring buffer trace yang sudah selesai; trace lambat disimpan di buffer terpisah."""
+
+    def __init__(self, size: int = 200, slow_ms: float = 2000, max_spans: int = 200):
+        self.recent: deque = deque(maxlen=size)
+        self.slow: deque = deque(maxlen=size)
+        self.slow_ms = slow_ms
+        self.max_spans = max_spans
+
+    def add(self, trace: Trace):
+        self.recent.append(trace)
+        if trace.dur_ms >= self.slow_ms:
+            self.slow.append(trace)
+
+
+buffer = TraceBuffer()
+
+
+def configure(size: int, slow_ms: float):
+    global buffer
+    buffer = TraceBuffer(size=size, slow_ms=slow_ms)
+
+
+def current_trace_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.trace_id if trace else None
+
+
+@contextmanager
+def start_trace(name: str, **attrs):
+    """Mulai trace baru (satu per update bot). Context ikut ke asyncio.to_thread."""
+    trace = Trace(name, attrs)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        trace.dur_us = _now_us() - trace.start_us
+        _current_trace.reset(token)
+        buffer.add(trace)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Catat satu hop di trace aktif; no-op murah bila tidak ada trace."""
+    trace = _current_trace.get()
+    if trace is None or len(trace.spans) >= buffer.max_spans:
+        yield None
+        return
+    s = Span(name, _now_us(), threading.get_native_id(), attrs)
+    try:
+        yield s
+    except BaseException as e:
+        s.attrs["error"] = type(e).__name__
+        raise
+    finally:
+        s.dur_us = _now_us() - s.start_us
+        trace.spans.append(s)
+
+
+class TraceIdFilter(logging.Filter):
+    """Tambahkan trace_id ke LogRecord bila ada trace aktif."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        trace = _current_trace.get()
+        if trace is not None:
+            record.trace_id = trace.trace_id
+        return True
+
+
+def export_chrome(traces: Iterable[Trace]) -> Dict:
+    """Format Chrome trace event (bisa dibuka di ui.perfetto.dev / chrome://tracing)."""
+    pid = os.getpid()
+    events = []
+    # satu track (tid) per trace, diberi nama lewat event metadata
+    for tid, trace in enumerate(traces, start=1):
+        events.append({
+            "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+            "args": {"name": f"{trace.name} {trace.trace_id}"},
+        })
+        events.append({
+            "name": trace.name, "cat": "update", "ph": "X", "pid": pid,
+            "tid": tid, "ts": trace.start_us, "dur": trace.dur_us,
+            "args": {"trace_id": trace.trace_id, **trace.attrs},
+        })
+        for s in trace.spans:
+            events.append({
+                "name": s.name, "cat": "span", "ph": "X", "pid": pid,
+                "tid": tid, "ts": s.start_us, "dur": s.dur_us,
+                "args": {"trace_id": trace.trace_id, "thread": s.tid, **s.attrs},
+            })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
@@ -0,0 +1,80 @@
+# transport.py - Lapisan HTTP yang bisa diganti: live (requests.Session), rekam ke cassette, atau replay tanpa jaringan
+#
+# Semua request ke MyXL, CIAM dan xdata lewat `transport.current()`. Mode dipilih
+# sekali saat start (env MYXL_TRANSPORT atau argumen CLI):
+#
+#   MYXL_TRANSPORT=record:runs/login.jsonl.gz     # jalankan live, simpan setiap pertukaran
+#   MYXL_TRANSPORT=replay:runs/login.jsonl.gz     # tanpa jaringan, latensi asli
+#   MYXL_TRANSPORT=replay:runs/login.jsonl.gz@0   # tanpa jaringan, tanpa jeda (CI)
+#   MYXL_TRANSPORT=replay:runs/login.jsonl.gz@0.5 # latensi x0.5
+#
+# Cassette = JSON lines (gzip bila nama berakhiran .gz). Token, API key, password
+# dan header Authorization diganti "<redacted>" sebelum ditulis. Implementasinya di
+# cassette.py, diimpor hanya saat mode rekam/replay dipilih (start normal tidak memuatnya).
+import os
+import logging
+from typing import TYPE_CHECKING, Tuple
+
+import requests
+
+if TYPE_CHECKING:
+    import cassette
+
+logger = logging.getLogger(__name__)
+
+# -------------------- pemilihan transport --------------------
+# satu Session (connection pool) untuk semua akun
+_live = requests.Session()
+_current = _live
+
+
+def current():
+    """Session yang sedang aktif (live / rekam / replay)."""
+    return _current
+
+
+def install(session):
+    global _current
+    _current = session
+    return session
+
+
+def replaying() -> bool:
+    return getattr(_current, "offline", False)
+
+
+def record(path: str) -> "cassette.RecordingSession":
+    from cassette import RecordingSession
+    return install(RecordingSession(path, _live))
+
+
+def replay(path: str, time_scale: float = 1.0, strict: bool = False) -> "cassette.ReplaySession":
+    from cassette import ReplaySession
+    return install(ReplaySession(path, time_scale, strict))
+
+
+def parse_spec(spec: str) -> Tuple[str, str, float]:
+    """`record:<file>` / `replay:<file>[@<skala>]` -> (mode, file, skala)."""
+    mode, sep, rest = spec.partition(":")
+    mode = mode.strip().lower()
+    if not sep or mode not in ("record", "replay", "live") or (mode != "live" and not rest):
+        raise ValueError(f"Format transport tidak dikenal: {spec!r}")
+    scale = 1.0
+    if mode == "replay" and "@" in rest:
+        rest, _, raw = rest.rpartition("@")
+        scale = float(raw)
+    return mode, rest, scale
+
+
+def install_from_env(var: str = "MYXL_TRANSPORT"):
+    spec = os.getenv(var, "").strip()
+    if not spec or spec == "live":
+        return current()
+    mode, path, scale = parse_spec(spec)
+    if mode == "record":
+        logger.info("Transport: merekam ke %s", path)
+        return record(path)
+    if mode == "replay":
+        logger.info("Transport: replay dari %s (skala waktu %s)", path, scale)
+        return replay(path, scale)
+    return install(_live)
@@ -1,15 +1,23 @@
-import os
 import json
 import sys
+import subprocess
 from datetime import datetime
 from api_request import get_otp, submit_otp, save_tokens, get_package, purchase_package
 
 def clear_screen():
-    print("clearing screen...")
-    os.system('cls' if os.name == 'nt' else 'clear')
+    # escape ANSI langsung, tanpa spawn proses `clear`; dilewati bila output bukan terminal.
+    # Konsol Windows belum tentu mendukung escape VT, jadi tetap pakai `cls`.
+    if not sys.stdout.isatty():
+        return
+    if sys.platform == "win32":
+        subprocess.call("cls", shell=True)
+    else:
+        sys.stdout.write("\033[2J\033[H")
+        sys.stdout.flush()
 
 def pause():
-    input("\nTekan Enter untuk lanjut...")
+    if sys.stdin.isatty():
+        input("\nTekan Enter untuk lanjut...")
     
 def show_banner():
     print("--------------------------")
@@ -127,14 +135,10 @@ def show_package_details(api_key, tokens, package_option_code):
         print("Failed to load package details.")
         pause()
         return False
-    name2 = package.get("package_detail_variant", "").get("name","") #For Xtra Combo
-    price = package["package_option"]["price"]
-    detail = package["package_option"]["tnc"]
+    price = package.price
+    detail = package.tnc
     detail = detail.replace("<p>", "").replace("</p>", "").replace("<strong>", "").replace("</strong>", "").replace("<br>", "").replace("<br />", "").strip()
-    name3 = package.get("package_option", {}).get("name","") #Vidio
-    name1 = package.get("package_family", {}).get("name","") #Unlimited Turbo
-    
-    title = f"{name1} {name2} {name3}".strip()
+    title = package.title #Unlimited Turbo For Xtra Combo Vidio
     
 
     print(f"Nama: {title}")
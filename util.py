@@ -1,8 +1,13 @@
 import os, json
 import sys
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from api_request import *
 from ui import *
+import transport
 
 def load_token(api_key: str):
     if os.path.exists("tokens.json"):
@@ -16,16 +21,20 @@ def load_token(api_key: str):
         id_token = tokens.get("id_token")
         access_token = tokens.get("access_token")
         
-        profile = get_profile(api_key, access_token, id_token)
-        if not profile:
+        # profile & balance tidak saling bergantung: ambil bersamaan
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            profile_future = pool.submit(get_profile, api_key, access_token, id_token)
+            balance_future = pool.submit(get_balance, api_key, id_token)
+            profile = profile_future.result()
+            balance = balance_future.result()
+        if not profile or not balance:
             print("Failed to fetch profile. Please check your tokens.")
             sys.exit(1)
         
-        phone_number = profile.get("profile").get("msisdn")
+        phone_number = profile.msisdn
         
-        balance = get_balance(api_key, id_token)
-        balance_remaining = balance.get("remaining")
-        balance_expired_at = balance.get("expired_at")
+        balance_remaining = balance.remaining
+        balance_expired_at = balance.expired_at
         
         return {
             "tokens": tokens,
@@ -71,7 +80,7 @@ def verify_api_key(api_key: str, *, timeout: float = 10.0) -> bool:
     """
     try:
         url = f"https://xdata.fuyuki.pw/api/verify?key={api_key}"
-        resp = requests.get(url, timeout=timeout)
+        resp = transport.current().get(url, timeout=timeout)
         if resp.status_code == 200:
             json_resp = resp.json()
             print(f"API key is valid.\nId: {json_resp.get('user_id')}\nOwner: @{json_resp.get('username')}")
@@ -84,6 +93,59 @@ def verify_api_key(api_key: str, *, timeout: float = 10.0) -> bool:
         return False
 
 
+API_KEY_CACHE_FILE = ".api_key_cache.json"
+
+def _api_key_hash(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+def _read_api_key_cache(api_key: str, path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("key_sha256") != _api_key_hash(api_key):
+        return {}
+    return cache
+
+def _write_api_key_cache(api_key: str, valid: bool, path: str):
+    try:
+        with open(path, "w", encoding="utf8") as f:
+            # hanya hash key yang disimpan, bukan key-nya
+            json.dump({
+                "key_sha256": _api_key_hash(api_key),
+                "valid": valid,
+                "verified_at": time.time(),
+            }, f)
+    except OSError as e:
+        print(f"Failed to write API key cache: {e}")
+
+def verify_api_key_cached(api_key: str, *, ttl: float = 86400,
+                          path: str = API_KEY_CACHE_FILE,
+                          revalidate: bool = True) -> bool:
+    """
+    Like verify_api_key, but trusts a locally cached positive result younger
+    than `ttl` seconds so start-up does not wait on the network. The cached
+    result is then re-verified in a background thread; a key that turns out
+    invalid is recorded so the next start verifies synchronously again.
+    """
+    cache = _read_api_key_cache(api_key, path)
+    age = time.time() - cache.get("verified_at", 0)
+    if cache.get("valid") and 0 <= age < ttl:
+        if revalidate:
+            def run():
+                valid = verify_api_key(api_key)
+                _write_api_key_cache(api_key, valid, path)
+                if not valid:
+                    print("API key no longer valid; next start will verify again.")
+            threading.Thread(target=run, name="api-key-revalidate", daemon=True).start()
+        return True
+
+    valid = verify_api_key(api_key)
+    _write_api_key_cache(api_key, valid, path)
+    return valid
+
+
 def ensure_api_key() -> str:
     """
     Load api.key if present; otherwise prompt the user.